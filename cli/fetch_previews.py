@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Fetch previews for pending search_queries rows (oie_search.pipelines.fetch).
+
+Rows are fetched concurrently under per-platform rate limits and marked
+'done' / 'error' as they finish, so re-running resumes where an interrupted
+run stopped (--retry-errors also re-fetches failed rows). Set API_CACHE_PATH to reuse
+API responses across runs (oie_search.apis.cache); hit rates and quota saved
+are logged at the end.
+
+Usage:
+  python cli/fetch_previews.py --backend postgres --platforms youtube,reddit
+  python cli/fetch_previews.py --backend mongo --limit 200 --max-results 100 --retry-errors
+"""
+import argparse
+import os
+
+from oie_search.apis import reddit, youtube
+from oie_search.apis.cache import get_cache
+from oie_search.db import get_backend
+from oie_search.pipelines.fetch import FETCHERS, run_fetch
+from oie_search.utils.logging import setup_logger
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Fetch previews for pending search queries")
+    ap.add_argument("--backend", default=os.getenv("QUERY_BACKEND", "postgres"))
+    ap.add_argument("--platforms", default=",".join(FETCHERS), help="Comma-separated platforms to fetch")
+    ap.add_argument("--limit", type=int, default=None, help="Max query rows this run")
+    ap.add_argument("--max-results", type=int, default=50, help="Max results per query string")
+    ap.add_argument("--retry-errors", action="store_true", help="Also re-fetch rows whose last fetch failed")
+    ap.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO"))
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    log = setup_logger(level=args.log_level)
+    platforms = [p.strip() for p in args.platforms.split(",") if p.strip()]
+    with get_backend(args.backend) as db:
+        counts = run_fetch(db, platforms=platforms, limit=args.limit, max_results=args.max_results,
+                           retry_errors=args.retry_errors, log=log)
+    log.info(f"Fetch: {counts}")
+    log.info(f"YouTube quota: {youtube.quota_stats.as_dict()}; Reddit rate limit: {reddit.rate_limit.as_dict()}")
+    cache = get_cache()
+    if cache:
+        log.info(f"API cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
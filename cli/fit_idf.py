@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Fit the corpus-wide IDF model used by semantic scoring.
+
+Learns vocabulary + IDF from the seeds table/collection and a random sample of
+previews, then saves it as a small directory (vocab.txt, idf.npy, meta.json;
+see oie_search.idf_model). Point scoring at it with IDF_MODEL_PATH (env) or
+[scoring] IDF_MODEL_PATH in OpenIE_Task_1_Data_Collection.ini.
+
+Usage:
+  python cli/fit_idf.py --backend postgres --previews-sample 20000 --out models/idf
+"""
+import argparse
+import os
+
+from oie_search.db import get_backend
+from oie_search.digestors import normalize_preview
+from oie_search.idf_model import IdfModel
+from oie_search.scoring import seed_text, preview_text
+from oie_search.utils.logging import setup_logger
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Fit corpus IDF model")
+    ap.add_argument("--backend", default=os.getenv("QUERY_BACKEND", "postgres"))
+    ap.add_argument("--seeds-limit", type=int, default=10000)
+    ap.add_argument("--previews-sample", type=int, default=20000)
+    ap.add_argument("--max-features", type=int, default=50000)
+    ap.add_argument("--min-df", type=int, default=2)
+    ap.add_argument("--out", default=os.getenv("IDF_MODEL_PATH", "models/idf"))
+    ap.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO"))
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    log = setup_logger(level=args.log_level)
+    db = get_backend(args.backend)
+
+    texts = [seed_text(seed) for seed in db.list_seeds(limit=args.seeds_limit)]
+    n_seeds = len(texts)
+    for rec in db.sample_previews(limit=args.previews_sample):
+        pv = normalize_preview((rec.get("platform") or "unknown").lower(), rec.get("raw") or rec)
+        texts.append(preview_text(pv))
+    log.info(f"Fitting IDF on {n_seeds} seeds + {len(texts) - n_seeds} previews")
+
+    model = IdfModel.fit(texts, max_features=args.max_features, min_df=args.min_df)
+    model.save(args.out)
+    log.info(f"Saved IDF model {model.version} ({len(model.vocabulary)} terms) → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
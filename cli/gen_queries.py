@@ -8,7 +8,7 @@
 import argparse, os
 from oie_search.utils.logging import setup_logger
 from oie_search.config import get_app
-from oie_search.pipelines.generate_queries import generate_queries_for_seed
+from oie_search.pipelines.generate_queries import refresh_generated_queries
 from oie_search.db import get_backend  # assume you expose a factory
 
 def parse_args():
@@ -17,6 +17,8 @@ def parse_args():
     ap.add_argument("--platforms", default=get_app("PLATFORMS","youtube,reddit"))
     ap.add_argument("--limit", type=int, default=None)
     ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--force", action="store_true",
+                    help="Regenerate every seed, even if its stored queries match its content hash and generator version")
     ap.add_argument("--log-level", default="INFO")
     return ap.parse_args()
 
@@ -26,13 +28,10 @@ def main():
     platforms = [p.strip() for p in args.platforms.split(",") if p.strip()]
     db = get_backend(args.backend)
 
-    count = 0
-    for seed in db.list_seeds(limit=args.limit):
-        rows = generate_queries_for_seed(seed, platforms=platforms)
-        count += len(rows)
-        if not args.dry_run:
-            db.save_generated_queries(rows)
-    log.info(f"Seeds processed: {min(args.limit or 10**9, db.last_seed_count)}; queries generated: {count}; dry_run={args.dry_run}")
+    counts = refresh_generated_queries(db, platforms=platforms, limit=args.limit, force=args.force,
+                                       dry_run=args.dry_run)
+    log.info(f"Seeds processed: {db.last_seed_count}; regenerated: {counts['regenerated']}; "
+             f"unchanged: {counts['unchanged']}; queries generated: {counts['queries']}; dry_run={args.dry_run}")
 
 if __name__ == "__main__":
     main()
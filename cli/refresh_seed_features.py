@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Refresh the derived seed-features store (oie_search.pipelines.seed_features).
+
+Only seeds whose text (content hash) or IDF model version changed since the
+last run are recomputed, so this is cheap to run after every seed import.
+
+Usage:
+  python cli/refresh_seed_features.py --backend postgres
+  python cli/refresh_seed_features.py --backend mongo --force
+"""
+import argparse
+import os
+
+from oie_search.db import get_backend
+from oie_search.idf_model import load_default_idf_model
+from oie_search.pipelines.seed_features import refresh_seed_features
+from oie_search.utils.logging import setup_logger
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("Refresh stored seed features")
+    ap.add_argument("--backend", default=os.getenv("QUERY_BACKEND", "postgres"))
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--batch-size", type=int, default=200)
+    ap.add_argument("--force", action="store_true", help="Recompute every seed, ignoring stored hashes")
+    ap.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO"))
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    log = setup_logger(level=args.log_level)
+    db = get_backend(args.backend)
+    model = load_default_idf_model()
+    if model is None:
+        log.warning("No IDF model configured (IDF_MODEL_PATH); storing features without seed vectors.")
+    counts = refresh_seed_features(db, model=model, limit=args.limit, batch_size=args.batch_size, force=args.force)
+    log.info(f"Seed features: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,11 +19,9 @@ Usage:
 import argparse, csv, os, random, math
 from typing import List, Dict, Any
 
-# --- PG
-import psycopg2
 from psycopg2.extras import RealDictCursor
-# --- Mongo
-import pymongo
+
+from oie_search.db.pool import get_mongo_client, get_pg_pool
 
 
 def parse_args():
@@ -36,9 +34,8 @@ def parse_args():
 
 
 def _pg_fetch_scored(n: int) -> List[Dict[str, Any]]:
-    dsn = os.getenv("POSTGRES_DSN", "host=localhost dbname=oie user=postgres password=postgres")
     table = os.getenv("PREVIEWS_TABLE", "previews")
-    with psycopg2.connect(dsn) as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+    with get_pg_pool().connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
         # Pull a bigger pool for stratified sampling (e.g., 10× n)
         pool = n * 10
         cur.execute(f"""
@@ -52,10 +49,7 @@ def _pg_fetch_scored(n: int) -> List[Dict[str, Any]]:
 
 
 def _mongo_fetch_scored(n: int) -> List[Dict[str, Any]]:
-    uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-    dbname = os.getenv("MONGO_DB", "oie")
-    client = pymongo.MongoClient(uri)
-    db = client[dbname]
+    db = get_mongo_client()[os.getenv("MONGO_DB", "oie")]
     # Pull a bigger pool
     pool = n * 10
     cursor = db["previews"].aggregate([
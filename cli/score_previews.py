@@ -4,21 +4,21 @@ Score previews CLI
 
 This version wires:
   - normalize_preview(platform, raw) from oie_search.digestors
-  - score_preview(seed, preview) from oie_search.scoring
+  - score_many(seed, previews) from oie_search.scoring
 and supports both Postgres and Mongo backends via oie_search.db.get_backend().
 
 It:
   • pulls unscored previews in batches
   • builds/recovers a minimal seed dict (from the record, or via backend if available)
   • normalizes each raw preview to a common schema
-  • scores each preview (0–100) and writes score/decision/signals back
+  • scores each batch per seed in one vectorized call (0–100) and writes score/decision/signals back
   • optionally writes a per-seed leaderboard CSV (top-K kept/considered)
 
 Assumptions:
   - backend.list_unscored_previews(batch_size, limit) yields lists of preview records
   - backend.save_preview_scores(rows) accepts rows with {id/_id, score, decision, signals}
   - Preview records contain at least: platform, and either a "raw" blob or already-flat fields.
-  - If seed text is not embedded in the record, we try backend.get_seed(seed_id) when available.
+  - If seed text is not embedded in the record, we look seeds up with one backend.get_seeds(ids) call per batch.
 
 Environment / args:
   --backend (defaults to $QUERY_BACKEND or "postgres")
@@ -26,6 +26,14 @@ Environment / args:
   --limit
   --log-level
   --dump-csv (optional path)
+  --seed-cache-mb (size bound of the in-process seed feature cache)
+  --cascade (skip the semantic step for previews that cannot reach "consider")
+  --workers N (score seed-grouped chunks on a process pool of N workers)
+  --after-id (resume the keyset scan after a given preview id; --order id only)
+  --order id|seed (seed = cluster batches by seed_id)
+  --pipeline (overlap fetch / score / write with bounded queues; --queue-size)
+  --dedup-index PATH (near-duplicates of already scored previews inherit their score)
+  --raw-mode full|ref|drop (raw payload kept with leaderboard previews; default $PREVIEW_RAW_MODE or ref)
 """
 
 import argparse
@@ -33,11 +41,17 @@ import csv
 import logging
 import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, Optional
 
 from oie_search.db import get_backend
-from oie_search.digestors import normalize_preview
-from oie_search.scoring import score_preview, KEEP_MIN, TOPK_PER_SEED
+from oie_search.idf_model import load_default_idf_model
+from oie_search.pipelines.dedup import DedupIndex, DedupStats, seed_key, split_batch
+from oie_search.pipelines.preview_scoring import init_worker, normalize_records, score_batch
+from oie_search.pipelines.staged import run_pipelined
+from oie_search.preview_record import PREVIEW_RAW_MODE, RAW_MODES, compact_preview
+from oie_search.scoring import CascadeStats, KEEP_MIN, TOPK_PER_SEED
+from oie_search.seed_cache import SeedFeatureCache
 
 
 # ------------------------------ CLI Args ------------------------------------ #
@@ -49,7 +63,34 @@ def parse_args():
     ap.add_argument("--limit", type=int, default=None)
     ap.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO"))
     ap.add_argument("--dump-csv", default=None, help="Optional: path to write a per-seed leaderboard CSV")
-    return ap.parse_args()
+    ap.add_argument("--seed-cache-mb", type=int, default=int(os.getenv("SEED_CACHE_MB", "256")),
+                    help="Size bound of the in-process seed feature cache (MB)")
+    ap.add_argument("--cascade", action="store_true",
+                    help="Cheap signals first; skip the semantic step when a preview cannot reach 'consider'")
+    ap.add_argument("--workers", type=int, default=int(os.getenv("SCORE_WORKERS", "1")),
+                    help="Score on a process pool of N workers (1 = in-process)")
+    ap.add_argument("--chunk-size", type=int, default=500,
+                    help="Max previews of one seed per scoring task")
+    ap.add_argument("--after-id", default=None,
+                    help="Resume the unscored scan after this preview id (see the 'last saved id' log line; "
+                         "--order id only, a seed-ordered run simply restarts and skips scored previews)")
+    ap.add_argument("--order", choices=["id", "seed"], default=os.getenv("SCORE_ORDER", "id"),
+                    help="Scan order: 'seed' clusters previews by seed_id so batches cover few seeds")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="Prefetch batches and write scores on background threads while scoring")
+    ap.add_argument("--queue-size", type=int, default=int(os.getenv("PIPELINE_QUEUE_SIZE", "4")),
+                    help="Max batches buffered between pipeline stages (backpressure bound)")
+    ap.add_argument("--dedup-index", default=os.getenv("DEDUP_INDEX_PATH"),
+                    help="SQLite dedup index: previews duplicating an already scored one (same canonical "
+                         "URL or near-identical title/snippet, same seed) inherit its score")
+    ap.add_argument("--raw-mode", choices=RAW_MODES, default=PREVIEW_RAW_MODE,
+                    help="Raw payload kept with leaderboard previews: full, ref (preview id only; "
+                         "the raw stays in the previews table) or drop")
+    args = ap.parse_args()
+    if args.after_id is not None and args.order == "seed":
+        ap.error("--after-id only applies to --order id; with --order seed, re-run without it "
+                 "(previews scored already are skipped)")
+    return args
 
 
 # ---------------------------- Helper functions ------------------------------ #
@@ -95,30 +136,60 @@ def _extract_seed_from_record(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return None
 
 
-def _fetch_seed_from_backend(db, seed_id) -> Optional[Dict[str, Any]]:
+def _fetch_seeds_from_backend(db, seed_ids) -> Dict[Any, Dict[str, Any]]:
     """
-    Best-effort: only call if backend exposes get_seed.
+    Best-effort bulk lookup: one backend.get_seeds(ids) call per batch
+    (empty for backends without it, or on error).
     """
-    if not seed_id:
-        return None
-    get_seed = getattr(db, "get_seed", None)
-    if callable(get_seed):
-        try:
-            return get_seed(seed_id)
-        except Exception:
-            return None
-    return None
+    ids = [sid for sid in seed_ids if sid]
+    get_seeds = getattr(db, "get_seeds", None)
+    if not ids or not callable(get_seeds):
+        return {}
+    try:
+        return get_seeds(ids)
+    except Exception:
+        return {}
+
+
+def _resolve_seed(rec: Dict[str, Any], fetched: Dict[Any, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Resolve/construct the seed dict for a preview record: embedded seed first,
+    then the batch's backend lookup, then a minimal seed built from flattened fields.
+    """
+    seed = _extract_seed_from_record(rec)
+    if seed is None:
+        seed = fetched.get(rec.get("seed_id"))
+
+    # As a final fallback, create a minimal seed to keep the pipeline flowing.
+    # (Heuristics in score_many can still work with title-only.)
+    if seed is None:
+        seed = {
+            "seed_id": rec.get("seed_id"),
+            "title": rec.get("seed_title") or "",    # may be None
+            "description": rec.get("seed_description") or "",
+            "transcript": rec.get("seed_transcript") or "",
+            "ocr": rec.get("seed_ocr") or "",
+            "body": rec.get("seed_body") or "",
+        }
+    return seed
 
 
-def _normalize_from_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+def _stored_seed_features(db, seeds: Dict[Any, Dict[str, Any]], memo: Dict[Any, Any]) -> Dict[Any, Any]:
     """
-    Normalize a single preview record:
-      - use rec["raw"] if present, else treat rec as already-flat
-      - platform = rec["platform"] or "unknown"
+    Stored seed-feature rows for the seeds of a batch: one backend call for
+    seeds not looked up yet in this run (misses are memoized as None).
+    Empty for backends without the store.
     """
-    platform = (rec.get("platform") or "unknown").lower()
-    raw = rec.get("raw") or rec
-    return normalize_preview(platform, raw)
+    get_stored = getattr(db, "get_seed_features", None)
+    ids = [sid for sid in seeds if not isinstance(sid, tuple) and sid not in memo]
+    if callable(get_stored) and ids:
+        try:
+            found = get_stored(ids)
+        except Exception:
+            found = {}
+        for sid in ids:
+            memo[sid] = found.get(sid)
+    return {sid: memo[sid] for sid in seeds if memo.get(sid) is not None}
 
 
 # --------------------------------- Main ------------------------------------- #
@@ -128,55 +199,147 @@ def main():
     log = _setup_logger(args.log_level)
     db = get_backend(args.backend)
 
+    seed_cache = SeedFeatureCache(max_bytes=args.seed_cache_mb * 1024 * 1024)
+    idf_model = load_default_idf_model()
+    stored_memo = {}
+    cascade_stats = CascadeStats()
+    executor = None
+    if args.workers > 1:
+        # each worker keeps its own seed cache and IDF model
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                       initargs=(args.seed_cache_mb * 1024 * 1024,))
+    dedup = DedupIndex(args.dedup_index) if args.dedup_index else None
+    dedup_stats = DedupStats()
     total_scored = 0
     per_seed = defaultdict(list)  # seed_id -> list[(score, normalized_preview)]
 
-    # Iterate batches from backend
-    for batch in db.list_unscored_previews(batch_size=args.batch_size, limit=args.limit):
+    def score(batch):
+        nonlocal total_scored
         out_rows = []
 
-        for rec in batch:
-            # Resolve/construct seed dict
-            seed = _extract_seed_from_record(rec)
-            if seed is None:
-                seed = _fetch_seed_from_backend(db, rec.get("seed_id"))
-
-            # As a final fallback, create a minimal seed to keep the pipeline flowing.
-            # (Heuristics in score_preview can still work with title-only.)
-            if seed is None:
-                seed = {
-                    "seed_id": rec.get("seed_id"),
-                    "title": rec.get("seed_title") or "",    # may be None
-                    "description": rec.get("seed_description") or "",
-                    "transcript": rec.get("seed_transcript") or "",
-                    "ocr": rec.get("seed_ocr") or "",
-                    "body": rec.get("seed_body") or "",
-                }
-
-            # Normalize preview and score
-            normalized = _normalize_from_record(rec)
-            scored = score_preview(seed, normalized)  # -> {"score": float, "decision": str, "signals": {...}}
-
+        # Resolve seeds once per batch (one bulk lookup for seeds not embedded
+        # in the records); records are scored in seed-grouped chunks
+        fetched = _fetch_seeds_from_backend(db, {
+            rec.get("seed_id") for rec in batch if _extract_seed_from_record(rec) is None
+        })
+        seeds = {}
+        seed_keys = []
+        for pos, rec in enumerate(batch):
+            # records without a seed_id carry their own (embedded) seed
+            key = rec.get("seed_id") if rec.get("seed_id") is not None else ("record", pos)
+            if key not in seeds:
+                seeds[key] = _resolve_seed(rec, fetched)
+            seed_keys.append(key)
+
+        # Duplicates of already scored previews (index or earlier in this batch) are not rescored
+        # (keyed by seed content and IDF version, so edited seeds / a new model rescore).
+        # The batch is normalized once here and the same previews are scored.
+        inherited, followers, to_index = {}, {}, {}
+        fresh = list(range(len(batch)))
+        normalized_batch = None
+        if dedup is not None:
+            normalized_batch = normalize_records(batch).to_dicts()
+            idf_version = idf_model.version if idf_model is not None else None
+            dedup_keys = {key: seed_key(key, seed, idf_version) for key, seed in seeds.items()
+                          if not isinstance(key, tuple)}
+            fresh, inherited, followers, to_index = split_batch(
+                dedup, [dedup_keys.get(key) for key in seed_keys], normalized_batch, stats=dedup_stats,
+            )
+
+        scored_fresh = score_batch(
+            [batch[pos] for pos in fresh], [seed_keys[pos] for pos in fresh], seeds,
+            stored=_stored_seed_features(db, seeds, stored_memo),
+            cache=seed_cache, model=idf_model,
+            cascade=args.cascade, stats=cascade_stats,
+            executor=executor, chunk_size=args.chunk_size,
+            keep_previews=bool(args.dump_csv),
+            normalized=[normalized_batch[pos] for pos in fresh] if normalized_batch is not None else None,
+        )
+        scored_batch = dict(zip(fresh, scored_fresh))
+        if to_index:
+            dedup.add_many([(*to_index[pos], _preview_record_id(batch[pos]), scored_batch[pos][0])
+                            for pos in fresh if pos in to_index])
+
+        for pos, rec in enumerate(batch):
+            if pos in scored_batch:
+                scored, normalized = scored_batch[pos]
+                duplicate_of = None
+            elif pos in inherited:
+                scored, normalized = inherited[pos], None
+                duplicate_of = scored["preview_id"]
+            else:
+                scored, normalized = scored_batch[followers[pos]][0], None
+                duplicate_of = _preview_record_id(batch[followers[pos]])
+            signals = scored.get("signals", {})
+            if duplicate_of is not None and str(duplicate_of) != str(_preview_record_id(rec)):
+                signals = {**signals, "duplicate_of": str(duplicate_of)}
             out_rows.append({
                 "id": _preview_record_id(rec),
                 "score": float(scored["score"]),
                 "decision": scored["decision"],
-                "signals": scored.get("signals", {}),
+                "signals": signals,
             })
             total_scored += 1
 
-            # collect for leaderboard if meets min
-            if args.dump_csv and float(scored["score"]) >= KEEP_MIN:
-                per_seed[seed.get("seed_id")].append((float(scored["score"]), normalized))
+            # collect for leaderboard if meets min (duplicates are listed once, under the scored copy)
+            if args.dump_csv and normalized is not None and float(scored["score"]) >= KEEP_MIN:
+                per_seed[seeds[seed_keys[pos]].get("seed_id")].append(
+                    (float(scored["score"]), compact_preview(normalized, args.raw_mode, raw_ref=_preview_record_id(rec)))
+                )
+        return out_rows
+
+    last_saved_id = None
 
+    def write(out_rows):
+        nonlocal last_saved_id
         # Persist this batch of scores
         if out_rows:
+            db.save_preview_scores(out_rows)
+            last_saved_id = out_rows[-1]["id"]
+            if args.order == "id":
+                log.debug(f"Saved {len(out_rows)} scores; last saved id {last_saved_id}")
+            else:
+                log.debug(f"Saved {len(out_rows)} scores")
+
+    def on_write_error(out_rows, e):
+        log.error(f"Failed to save a batch of {len(out_rows)} scores: {e}")
+
+    after_id = args.after_id
+    if after_id is not None and after_id.isdigit():
+        after_id = int(after_id)
+    batches = db.list_unscored_previews(batch_size=args.batch_size, limit=args.limit,
+                                        after_id=after_id, order=args.order)
+    if args.pipeline:
+        # fetch / score / write overlap; pending writes are flushed on exit
+        queue_metrics = run_pipelined(batches, score, write, queue_size=args.queue_size,
+                                      on_write_error=on_write_error)
+    else:
+        queue_metrics = None
+        for batch in batches:
+            out_rows = score(batch)
             try:
-                db.save_preview_scores(out_rows)
+                write(out_rows)
             except Exception as e:
-                log.error(f"Failed to save a batch of {len(out_rows)} scores: {e}")
-
-    log.info(f"Scored {total_scored} previews.")
+                on_write_error(out_rows, e)
+
+    if executor is not None:
+        executor.shutdown()
+
+    if args.order == "id":
+        log.info(f"Scored {total_scored} previews; last saved id {last_saved_id}.")
+    else:
+        log.info(f"Scored {total_scored} previews.")
+    if executor is None:
+        log.info(f"Seed cache: {seed_cache.stats()}")
+    if args.cascade:
+        log.info(f"Cascade: {cascade_stats.as_dict()}")
+    if queue_metrics:
+        log.info(f"Pipeline queues: {queue_metrics}")
+    if dedup is not None:
+        log.info(f"Dedup: {dedup_stats.as_dict()}")
+        dedup.close()
+    log.info(f"Connection pools: {db.metrics()}")
+    db.close()
 
     # Optional: write per-seed leaderboard CSV
     if args.dump_csv:
@@ -208,3 +371,7 @@ if __name__ == "__main__":
 # python cli/score_previews.py --backend postgres --batch-size 200 --limit 5000
 # # or for Mongo:
 # python cli/score_previews.py --backend mongo --batch-size 200 --limit 5000
+# # pipelined, with a process pool for scoring:
+# python cli/score_previews.py --backend postgres --pipeline --workers 4 --queue-size 4
+# # reuse scores of near-duplicates across runs:
+# python cli/score_previews.py --backend postgres --dedup-index data/dedup.sqlite
@@ -0,0 +1,91 @@
+"""
+Benchmark: per-document Mongo writes vs. the chunked unordered bulk path.
+
+Against a local mongod ($MONGO_URI, default mongodb://localhost:27017) in a
+scratch database, times
+  queries  insert_one per doc      vs. mongo_bulk_write([InsertOne ...])
+  scores   update_one per preview  vs. MongoBackend.save_preview_scores
+The second bulk insert run re-inserts the same docs to show duplicate-key
+tolerance (everything reported as skipped). The scratch database is dropped.
+
+Usage:
+  python scripts/bench_mongo_writes.py --seeds 500 --previews 5000 --chunk-size 1000
+"""
+
+import argparse
+import os
+import random
+import time
+
+import pymongo
+
+from oie_search.db import MongoBackend, mongo_bulk_write
+
+PLATFORMS = ["youtube", "reddit", "x", "tiktok", "spotify", "apple_podcasts",
+             "instagram", "facebook", "bluesky", "threads"]
+
+
+def query_docs(n_seeds):
+    return [
+        {"seed_id": sid, "platform": p, "query_text": f"seed {sid} {p}",
+         "precise": [f"seed {sid}"], "broad": [p], "hashtag_phrase": f"#seed{sid}"}
+        for sid in range(n_seeds) for p in PLATFORMS
+    ]
+
+def score_rows(n, rng):
+    return [
+        {"_id": i, "score": round(rng.uniform(0, 100), 3),
+         "decision": rng.choice(["keep", "consider", "reject"]), "signals": {"semantic": rng.random()}}
+        for i in range(n)
+    ]
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+def main():
+    ap = argparse.ArgumentParser("Benchmark Mongo bulk writes")
+    ap.add_argument("--seeds", type=int, default=500)
+    ap.add_argument("--previews", type=int, default=5000)
+    ap.add_argument("--chunk-size", type=int, default=1000)
+    ap.add_argument("--db", default="oie_bench_writes")
+    args = ap.parse_args()
+
+    client = pymongo.MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    client.drop_database(args.db)
+    db = client[args.db]
+    backend = MongoBackend.__new__(MongoBackend)
+    backend.db = db
+    rng = random.Random(0)
+    try:
+        for name in ("queries_single", "queries_bulk"):
+            db[name].create_index([("seed_id", 1), ("platform", 1), ("query_text", 1)], unique=True)
+
+        t_single, _ = timed(lambda: [db["queries_single"].insert_one(d) for d in query_docs(args.seeds)])
+        t_bulk, c_bulk = timed(lambda: mongo_bulk_write(
+            db["queries_bulk"], [pymongo.InsertOne(d) for d in query_docs(args.seeds)], args.chunk_size))
+        t_dup, c_dup = timed(lambda: mongo_bulk_write(
+            db["queries_bulk"], [pymongo.InsertOne(d) for d in query_docs(args.seeds)], args.chunk_size))
+        print(f"queries ({args.seeds * len(PLATFORMS)} docs)")
+        print(f"  insert_one  {t_single:8.3f}s")
+        print(f"  bulk        {t_bulk:8.3f}s  (x{t_single / t_bulk:.1f})  {c_bulk}")
+        print(f"  bulk rerun  {t_dup:8.3f}s  {c_dup}")
+
+        rows = score_rows(args.previews, rng)
+        db["previews"].insert_many([{"_id": r["_id"]} for r in rows])
+        t_single, _ = timed(lambda: [
+            db["previews"].update_one({"_id": r["_id"]}, {"$set": {"score": r["score"], "decision": r["decision"],
+                                                                    "signals": r["signals"]}})
+            for r in rows
+        ])
+        t_bulk, c_bulk = timed(lambda: backend.save_preview_scores(rows))
+        print(f"scores ({args.previews} previews)")
+        print(f"  update_one  {t_single:8.3f}s")
+        print(f"  bulk        {t_bulk:8.3f}s  (x{t_single / t_bulk:.1f})  {c_bulk}")
+    finally:
+        client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    main()
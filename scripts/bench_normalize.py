@@ -0,0 +1,76 @@
+"""
+Benchmark: per-record normalize_preview vs. columnar normalize_many.
+
+Builds --n synthetic YouTube and Reddit payloads (timestamps drawn from a pool
+of --distinct-dates values, as in real result pages where many items share
+upload times) and reports records/sec for
+  normalize       [normalize_preview(p, raw) ...]   vs. normalize_many(p, raws)
+  normalize+score the same, followed by score_many(seed, ...) on the output
+No database or API access needed.
+
+Usage:
+  python scripts/bench_normalize.py --n 50000 --distinct-dates 2000
+"""
+
+import argparse
+import random
+import time
+
+from oie_search.digestors import _parse_epoch, _parse_published, normalize_many, normalize_preview
+from oie_search.scoring import score_many
+
+SEED = {
+    "seed_id": 1,
+    "title": "How neurons fire: action potentials explained",
+    "description": "A visual explainer of action potentials, synapses and neurotransmitters.",
+    "important_phrases": ["action potential", "neurons fire", "synapse"],
+    "metadata": {"hashtags": ["neuro", "science"]},
+}
+
+
+def youtube_items(n, dates, rng):
+    return [{
+        "id": f"v{i:010d}", "durationSec": rng.randint(30, 3600),
+        "snippet": {"title": f"Neurons {i}: action potentials #neuro", "channelTitle": f"ch{i % 500}",
+                    "description": "Why neurons fire, synapse by synapse. #science " * rng.randint(1, 6),
+                    "publishedAt": rng.choice(dates)},
+        "statistics": {"viewCount": str(rng.randint(0, 10**6)), "likeCount": str(rng.randint(0, 10**4))},
+    } for i in range(n)]
+
+def reddit_items(n, epochs, rng):
+    return [{"data": {
+        "title": f"Question {i} about neurons firing #neuro", "selftext": "How does a synapse work? " * rng.randint(0, 5),
+        "permalink": f"/r/neuro/comments/{i}/q/", "author": f"u{i % 900}", "created_utc": rng.choice(epochs),
+        "num_comments": rng.randint(0, 300), "score": rng.randint(0, 5000),
+    }} for i in range(n)]
+
+def rate(fn, n, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        _parse_published.cache_clear()
+        _parse_epoch.cache_clear()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return n / best
+
+def main():
+    ap = argparse.ArgumentParser("Benchmark batch normalization")
+    ap.add_argument("--n", type=int, default=50000)
+    ap.add_argument("--distinct-dates", type=int, default=2000)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    epochs = [1.7e9 + rng.randint(0, 10**7) for _ in range(args.distinct_dates)]
+    dates = [time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(e)) for e in epochs]
+    for platform, raws in (("youtube", youtube_items(args.n, dates, rng)), ("reddit", reddit_items(args.n, epochs, rng))):
+        per = rate(lambda: [normalize_preview(platform, r) for r in raws], args.n)
+        col = rate(lambda: normalize_many(platform, raws), args.n)
+        print(f"{platform:8s} normalize        per-record {per:10.0f} rec/s   columnar {col:10.0f} rec/s   ({col / per:.2f}x)")
+        per = rate(lambda: score_many(SEED, [normalize_preview(platform, r) for r in raws]), args.n, repeat=1)
+        col = rate(lambda: score_many(SEED, normalize_many(platform, raws)), args.n, repeat=1)
+        print(f"{platform:8s} normalize+score  per-record {per:10.0f} rec/s   columnar {col:10.0f} rec/s   ({col / per:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
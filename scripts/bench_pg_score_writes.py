@@ -0,0 +1,85 @@
+"""
+Benchmark: per-row UPDATEs vs. PostgresBackend.save_preview_scores (bulk).
+
+Creates a scratch table shaped like `previews` (id, score, decision, signals),
+fills it with unscored rows, then times writing the same scored batches with
+  legacy  one autocommit UPDATE per row, signals as str()
+  bulk    save_preview_scores: temp table + one UPDATE ... FROM per batch
+The scratch table is dropped at the end. Needs $POSTGRES_DSN.
+
+Usage:
+  python scripts/bench_pg_score_writes.py --rows 2000 --batch-size 200
+"""
+
+import argparse
+import random
+import time
+
+from oie_search.db import PostgresBackend
+
+TABLE = "bench_preview_scores"
+
+
+def make_rows(n, rng):
+    return [
+        {
+            "id": i,
+            "score": round(rng.uniform(0, 100), 3),
+            "decision": rng.choice(["keep", "consider", "reject"]),
+            "signals": {"semantic": rng.random(), "lexical": rng.random(), "media": 1.0, "idf_model": "pair"},
+        }
+        for i in range(1, n + 1)
+    ]
+
+def reset_table(db, n):
+    with db.pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {TABLE};")
+        cur.execute(f"""CREATE TABLE {TABLE} (
+            id BIGINT PRIMARY KEY, score DOUBLE PRECISION, decision TEXT, signals JSONB);""")
+        cur.execute(f"INSERT INTO {TABLE} (id) SELECT generate_series(1, %s);", (n,))
+
+def legacy_save(db, rows):
+    with db.pool.connection() as conn, conn.cursor() as cur:
+        for r in rows:
+            cur.execute(
+                f"UPDATE {TABLE} SET score=%s, decision=%s, signals=%s::jsonb WHERE id=%s;",
+                (r["score"], r["decision"], str(r["signals"]).replace("'", '"'), r["id"]),
+            )
+
+def timed(db, save, rows, batch_size):
+    t0 = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        save(rows[i:i + batch_size])
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser("Benchmark preview score write-back")
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--batch-size", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    db = PostgresBackend()
+    db.previews_table = TABLE
+    rows = make_rows(args.rows, random.Random(args.seed))
+    try:
+        reset_table(db, args.rows)
+        legacy = timed(db, lambda b: legacy_save(db, b), rows, args.batch_size)
+        reset_table(db, args.rows)
+        bulk = timed(db, db.save_preview_scores, rows, args.batch_size)
+        with db.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT count(*) FROM {TABLE} WHERE signals ? 'semantic';")
+            written = cur.fetchone()[0]
+    finally:
+        with db.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {TABLE};")
+
+    n_batches = -(-args.rows // args.batch_size)
+    print(f"rows={args.rows} batch_size={args.batch_size} batches={n_batches}")
+    print(f"legacy  {legacy:8.3f}s  {legacy / n_batches * 1000:8.1f} ms/batch")
+    print(f"bulk    {bulk:8.3f}s  {bulk / n_batches * 1000:8.1f} ms/batch  (x{legacy / bulk:.1f})")
+    print(f"rows with JSONB signals after bulk write: {written}")
+
+
+if __name__ == "__main__":
+    main()
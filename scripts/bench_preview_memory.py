@@ -0,0 +1,73 @@
+"""
+Benchmark: memory held per normalized preview, dict vs. PreviewRecord.
+
+Builds --n synthetic YouTube items shaped like apis.youtube.iter_videos output
+(search snippet + videos.list snippet / statistics / contentDetails),
+normalizes each one and keeps the result, as score_previews does for the
+leaderboard. Retained memory (tracemalloc) is reported per preview and
+projected to 1M previews for
+  dict         normalize_preview output (raw kept)
+  record/full  PreviewRecord with the raw payload
+  record/ref   PreviewRecord with only a raw_ref id
+  record/drop  PreviewRecord without raw
+
+Usage:
+  python scripts/bench_preview_memory.py --n 100000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from oie_search.digestors import normalize_preview
+from oie_search.preview_record import compact_preview
+
+
+def youtube_item(i):
+    vid = f"v{i:010d}"
+    title = f"Explainer {i}: how neurons fire #neuro #science"
+    desc = f"In this video {i} we look at action potentials, synapses and why neurons fire. " * 4
+    snippet = {"publishedAt": "2025-10-01T12:00:00Z", "channelId": f"UC{i:022d}", "title": title,
+               "description": desc, "channelTitle": f"Channel {i % 5000}",
+               "thumbnails": {k: {"url": f"https://i.ytimg.com/vi/{vid}/{k}.jpg", "width": 120, "height": 90}
+                              for k in ("default", "medium", "high")},
+               "liveBroadcastContent": "none", "tags": ["neuro", "science", "brain"]}
+    return {
+        "id": vid, "kind": "youtube#searchResult", "etag": f"etag{i}", "snippet": snippet,
+        "statistics": {"viewCount": str(1000 + i), "likeCount": str(i % 900), "commentCount": str(i % 70)},
+        "contentDetails": {"duration": "PT4M13S", "dimension": "2d", "definition": "hd", "caption": "false"},
+        "durationSec": 253,
+    }
+
+def measure(n, convert):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    kept = [convert(i, normalize_preview("youtube", youtube_item(i))) for i in range(n)]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    assert len(kept) == n
+    del kept
+    return used / n
+
+def main():
+    ap = argparse.ArgumentParser("Benchmark normalized preview memory")
+    ap.add_argument("--n", type=int, default=100000)
+    args = ap.parse_args()
+
+    variants = [
+        ("dict", lambda i, pv: pv),
+        ("record/full", lambda i, pv: compact_preview(pv, "full")),
+        ("record/ref", lambda i, pv: compact_preview(pv, "ref", raw_ref=i)),
+        ("record/drop", lambda i, pv: compact_preview(pv, "drop")),
+    ]
+    base = None
+    for name, convert in variants:
+        per = measure(args.n, convert)
+        base = base or per
+        print(f"{name:12s} {per:8.0f} B/preview  {per * 1e6 / 2**30:6.2f} GiB per 1M  ({per / base:.0%} of dict)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: scoring throughput vs. process-pool size (pipelines.preview_scoring).
+
+Builds a synthetic batch (seeds with long transcripts, previews spread across
+seeds), then scores it with score_batch in-process and on pools of N workers.
+No database or API access needed.
+
+Usage:
+  python scripts/bench_score_workers.py --seeds 40 --previews-per-seed 500 --workers 1,2,4,8
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from oie_search.pipelines.preview_scoring import init_worker, score_batch
+from oie_search.seed_cache import SeedFeatureCache
+
+WORDS = ("adhd autism audhd diagnosis self-diagnosis masking sensory dopamine norepinephrine "
+         "genetics dreadds circuit eeg fmri biomarker clinician coping executive function "
+         "planner routine community identity ethics trial podcast interview review news "
+         "explainer tutorial brain neuro therapy stimulant screening assessment").split()
+
+
+def _text(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+def make_batch(n_seeds, per_seed, transcript_words, rng):
+    seeds = {
+        sid: {
+            "seed_id": sid,
+            "title": _text(rng, 8),
+            "description": _text(rng, 40),
+            "transcript": _text(rng, transcript_words),
+            "important_phrases": [_text(rng, 2) for _ in range(6)],
+            "metadata": {"hashtags": rng.sample(WORDS, 3)},
+        }
+        for sid in range(n_seeds)
+    }
+    batch = []
+    for _ in range(n_seeds * per_seed):
+        sid = rng.randrange(n_seeds)
+        batch.append({
+            "id": len(batch), "seed_id": sid, "platform": "youtube",
+            "url": f"https://www.youtube.com/watch?v={len(batch)}",
+            "title": _text(rng, 10), "snippet": _text(rng, 60),
+            "hashtags": rng.sample(WORDS, 2), "date": "2025-10-01T00:00:00Z",
+            "engagement": {"views": rng.randint(0, 50_000), "likes": rng.randint(0, 2_000), "comments": None},
+        })
+    return batch, [r["seed_id"] for r in batch], seeds
+
+def main():
+    ap = argparse.ArgumentParser("Benchmark scoring workers")
+    ap.add_argument("--seeds", type=int, default=40)
+    ap.add_argument("--previews-per-seed", type=int, default=500)
+    ap.add_argument("--transcript-words", type=int, default=5000)
+    ap.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 8}")
+    ap.add_argument("--chunk-size", type=int, default=250)
+    args = ap.parse_args()
+
+    batch, seed_keys, seeds = make_batch(args.seeds, args.previews_per_seed, args.transcript_words, random.Random(7))
+    print(f"{len(batch)} previews across {len(seeds)} seeds")
+    print("workers\tseconds\tpreviews/s\tspeedup")
+    base = None
+    for n in sorted({int(x) for x in args.workers.split(",") if x.strip()}):
+        if n <= 1:
+            t0 = time.perf_counter()
+            score_batch(batch, seed_keys, seeds, cache=SeedFeatureCache(), chunk_size=args.chunk_size, keep_previews=False)
+            dt = time.perf_counter() - t0
+        else:
+            with ProcessPoolExecutor(max_workers=n, initializer=init_worker, initargs=(256 * 1024 * 1024,)) as ex:
+                # warm up: start every worker and import the scoring stack with a small real batch
+                warm = min(len(batch), n * 4)
+                score_batch(batch[:warm], seed_keys[:warm], seeds, executor=ex, chunk_size=1, keep_previews=False)
+                t0 = time.perf_counter()
+                score_batch(batch, seed_keys, seeds, executor=ex, chunk_size=args.chunk_size, keep_previews=False)
+                dt = time.perf_counter() - t0
+        base = base or dt
+        print(f"{n}\t{dt:.2f}\t{len(batch) / dt:,.0f}\t{base / dt:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
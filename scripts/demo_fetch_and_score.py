@@ -6,7 +6,7 @@ import os
 from oie_search.apis.youtube import search_videos
 from oie_search.apis.reddit import search_posts
 from oie_search.digestors import normalize_preview
-from oie_search.scoring import score_preview
+from oie_search.scoring import score_many
 
 SEED = {
     "seed_id": 101,
@@ -29,8 +29,7 @@ def main():
         previews.append(normalize_preview("reddit", it))
 
     scored = []
-    for p in previews:
-        s = score_preview(SEED, p)
+    for p, s in zip(previews, score_many(SEED, previews)):
         scored.append((s["score"], s["decision"], p["platform"], p["title"], p["url"]))
 
     scored.sort(reverse=True, key=lambda x: x[0])
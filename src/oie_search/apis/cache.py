@@ -0,0 +1,154 @@
+"""
+Optional on-disk response cache for the API clients (SQLite, one file).
+
+Enabled by setting API_CACHE_PATH; get_cache() then returns a process-wide
+ResponseCache, otherwise None and the clients always hit the network.
+
+Entries live in namespaces with their own TTL (API_CACHE_TTL_<NAMESPACE>,
+seconds; dots become underscores):
+
+  youtube.search   search.list pages           (default 24h)
+  youtube.video    videos.list item per id     (default 6h, so stats refresh
+                                                independently of searches)
+  reddit.search    search listing pages        (default 1h)
+
+Keys are the endpoint plus normalized params (sorted, credentials dropped).
+The file is bounded by API_CACHE_MAX_MB: expired entries go first, then the
+oldest. stats() reports hits / misses and the API cost avoided per namespace.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_TTLS = {
+    "youtube.search": 24 * 3600,
+    "youtube.video": 6 * 3600,
+    "reddit.search": 3600,
+}
+DEFAULT_MAX_BYTES = int(float(os.getenv("API_CACHE_MAX_MB", "512")) * 1024 * 1024)
+SECRET_PARAMS = frozenset({"key", "access_token"})
+
+
+def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None,
+             drop: Iterable[str] = SECRET_PARAMS) -> str:
+    """Stable key for endpoint + params (order-insensitive; credentials excluded)."""
+    clean = {k: v for k, v in (params or {}).items() if k not in drop and v is not None}
+    blob = endpoint + "?" + json.dumps(clean, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+def ttl_for(namespace: str) -> float:
+    env = "API_CACHE_TTL_" + namespace.upper().replace(".", "_")
+    return float(os.getenv(env, DEFAULT_TTLS.get(namespace, 3600)))
+
+
+class ResponseCache:
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                 namespace TEXT NOT NULL,
+                 key TEXT NOT NULL,
+                 value TEXT NOT NULL,
+                 size INTEGER NOT NULL,
+                 stored_at REAL NOT NULL,
+                 expires_at REAL NOT NULL,
+                 PRIMARY KEY (namespace, key))"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_stored ON responses(stored_at)")
+        self._conn.commit()
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _ns(self, namespace: str) -> Dict[str, float]:
+        return self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "saved_units": 0})
+
+    def get(self, namespace: str, key: str, units: float = 0) -> Optional[Any]:
+        """Cached value or None. A hit records `units` of API cost as saved."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE namespace=? AND key=?", (namespace, key)
+            ).fetchone()
+            ns = self._ns(namespace)
+            if row is None or row[1] <= self._clock():
+                ns["misses"] += 1
+                return None
+            ns["hits"] += 1
+            ns["saved_units"] += units
+            return json.loads(row[0])
+
+    def record_saved(self, namespace: str, units: float) -> None:
+        with self._lock:
+            self._ns(namespace)["saved_units"] += units
+
+    def put(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        blob = json.dumps(value, separators=(",", ":"))
+        now = self._clock()
+        expires = now + (ttl_for(namespace) if ttl is None else ttl)
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE namespace=? AND key=?", (namespace, key)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (namespace, key, value, size, stored_at, expires_at) VALUES (?,?,?,?,?,?)",
+                (namespace, key, blob, len(blob), now, expires),
+            )
+            self._bytes += len(blob) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        # expired entries first, then oldest, down to 90% of the bound
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = self.max_bytes * 0.9
+        if self._bytes <= target:
+            return
+        freed = 0
+        doomed = []
+        for ns, key, size in self._conn.execute("SELECT namespace, key, size FROM responses ORDER BY stored_at"):
+            doomed.append((ns, key))
+            freed += size
+            if self._bytes - freed <= target:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE namespace=? AND key=?", doomed)
+        self._bytes -= freed
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out = {}
+            for ns, s in self._stats.items():
+                total = s["hits"] + s["misses"]
+                out[ns] = {**s, "hit_rate": round(s["hits"] / total, 3) if total else 0.0}
+            return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Process-wide cache at $API_CACHE_PATH, or None when caching is off."""
+    global _cache
+    path = os.getenv("API_CACHE_PATH")
+    if not path:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.path != path:
+            _cache = ResponseCache(path)
+        return _cache
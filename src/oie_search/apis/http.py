@@ -0,0 +1,96 @@
+"""
+Shared HTTP plumbing for the API clients.
+
+  get_session(name)   process-wide requests.Session per API (keep-alive,
+                      connection pool of HTTP_POOL_SIZE per host)
+  request(...)        session.request with split (connect, read) timeouts and
+                      retries with jittered exponential backoff on connection
+                      errors, timeouts, 429/5xx and API-specific retryable
+                      responses (e.g. YouTube rate-limit 403s)
+
+Environment:
+  HTTP_CONNECT_TIMEOUT (5s), HTTP_READ_TIMEOUT (30s), HTTP_RETRIES (4),
+  HTTP_BACKOFF_BASE (0.5s), HTTP_BACKOFF_MAX (30s), HTTP_POOL_SIZE (32)
+"""
+
+from __future__ import annotations
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "4"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def make_session(pool_size: int = HTTP_POOL_SIZE, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    s = requests.Session()
+    # retries are handled in request() so they can honour Retry-After and API error bodies
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    if headers:
+        s.headers.update(headers)
+    return s
+
+def get_session(name: str, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Shared keep-alive session for one API (created on first use)."""
+    with _lock:
+        s = _sessions.get(name)
+        if s is None:
+            s = _sessions[name] = make_session(headers=headers)
+        return s
+
+def backoff_delay(attempt: int, base: float = HTTP_BACKOFF_BASE, cap: float = HTTP_BACKOFF_MAX,
+                  retry_after: Optional[str] = None) -> float:
+    """Full-jitter exponential backoff; a numeric Retry-After header is used as a floor."""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after:
+        try:
+            delay = max(delay, min(cap, float(retry_after)))
+        except ValueError:
+            pass
+    return delay
+
+def request(
+    session: requests.Session,
+    method: str,
+    url: str,
+    retries: int = HTTP_RETRIES,
+    timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    is_retryable: Optional[Callable[[requests.Response], bool]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    **kwargs,
+) -> requests.Response:
+    """
+    session.request(method, url, **kwargs), retried up to `retries` times on
+    connection errors, timeouts, RETRY_STATUSES or is_retryable(response).
+    Non-retryable HTTP errors (and the last failed attempt) are raised.
+    """
+    for attempt in range(retries + 1):
+        try:
+            r = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+            sleep(backoff_delay(attempt))
+            continue
+        if attempt < retries and (r.status_code in RETRY_STATUSES or (is_retryable and is_retryable(r))):
+            sleep(backoff_delay(attempt, retry_after=r.headers.get("Retry-After")))
+            continue
+        r.raise_for_status()
+        return r
+    raise AssertionError("unreachable")
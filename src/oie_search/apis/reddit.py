@@ -11,15 +11,29 @@ Two strategies supported:
 
 Functions:
   search_posts(query: str, sort="relevance", limit=25, oauth=False) -> List[dict]
+  iter_posts(query, sort="relevance", max_results=100, oauth=False, stop=None, acquire=None)
+    -> Iterator[dict] — follows the `after` cursor, streaming children
+  pages_without(is_keeper, n) — stop predicate for iter_posts
+  rate_limit.as_dict() -> {"remaining", "used", "reset_in"} from the latest
+    X-Ratelimit-* response headers, for callers pacing themselves
+
+Requests share one keep-alive session (apis/http.py). The OAuth token is
+cached process-wide and refreshed shortly before expires_in runs out. With
+API_CACHE_PATH set, listing pages are served from the on-disk response cache
+(apis/cache.py) until the reddit.search TTL runs out.
 """
 
 from __future__ import annotations
 import os
+import threading
 import time
 import requests
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from requests.auth import HTTPBasicAuth
 
+from . import http
+from .cache import get_cache, make_key
+
 PUBLIC_SEARCH_URL = "https://www.reddit.com/search.json"
 OAUTH_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
 OAUTH_SEARCH_URL = "https://oauth.reddit.com/search"
@@ -30,41 +44,186 @@ REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USERNAME = os.getenv("REDDIT_USERNAME")
 REDDIT_PASSWORD = os.getenv("REDDIT_PASSWORD")
 
+# refresh this many seconds before the token's expires_in runs out
+TOKEN_REFRESH_MARGIN = float(os.getenv("REDDIT_TOKEN_REFRESH_MARGIN", "60"))
+
+
+def _session() -> requests.Session:
+    return http.get_session("reddit", headers={"User-Agent": REDDIT_USER_AGENT})
+
 def _ensure_user_agent(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     headers = headers or {}
     headers.setdefault("User-Agent", REDDIT_USER_AGENT)
     return headers
 
-def _oauth_token() -> str:
+
+class RateLimitState:
+    """Latest X-Ratelimit-* headers seen, shared by all threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.remaining: Optional[float] = None
+        self.used: Optional[int] = None
+        self.reset_at: Optional[float] = None   # time.time() when the window resets
+
+    def update(self, headers) -> None:
+        remaining = headers.get("X-Ratelimit-Remaining")
+        reset = headers.get("X-Ratelimit-Reset")
+        used = headers.get("X-Ratelimit-Used")
+        if remaining is None and reset is None:
+            return
+        with self._lock:
+            try:
+                if remaining is not None:
+                    self.remaining = float(remaining)
+                if reset is not None:
+                    self.reset_at = time.time() + float(reset)
+                if used is not None:
+                    self.used = int(float(used))
+            except ValueError:
+                pass
+
+    def as_dict(self) -> Dict[str, Any]:
+        """{"remaining", "used", "reset_in" (seconds)}; None until a response carried the headers."""
+        with self._lock:
+            reset_in = None if self.reset_at is None else max(0.0, self.reset_at - time.time())
+            return {"remaining": self.remaining, "used": self.used, "reset_in": reset_in}
+
+
+rate_limit = RateLimitState()
+
+
+class TokenCache:
+    """
+    Thread-safe OAuth token cache: one token shared by every caller, refreshed
+    `margin` seconds before its expires_in elapses (or after invalidate()).
+    """
+
+    def __init__(self, fetch, margin: float = TOKEN_REFRESH_MARGIN, clock=time.monotonic):
+        self._fetch = fetch          # () -> (access_token, expires_in seconds)
+        self._margin = margin
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self.fetches = 0
+
+    def get(self) -> str:
+        with self._lock:
+            if self._token is None or self._clock() >= self._expires_at - self._margin:
+                token, expires_in = self._fetch()
+                self.fetches += 1
+                self._token = token
+                self._expires_at = self._clock() + float(expires_in)
+            return self._token
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+
+
+def _fetch_oauth_token():
     if not all([REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USERNAME, REDDIT_PASSWORD]):
         raise RuntimeError("OAuth requested but Reddit credentials are missing.")
     auth = HTTPBasicAuth(REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET)
     data = {"grant_type": "password", "username": REDDIT_USERNAME, "password": REDDIT_PASSWORD}
-    headers = _ensure_user_agent()
-    r = requests.post(OAUTH_TOKEN_URL, data=data, headers=headers, auth=auth, timeout=30)
-    r.raise_for_status()
-    return r.json()["access_token"]
+    r = http.request(_session(), "POST", OAUTH_TOKEN_URL, data=data, auth=auth)
+    payload = r.json()
+    return payload["access_token"], payload.get("expires_in", 3600)
+
+
+_token_cache = TokenCache(_fetch_oauth_token)
+
+
+def _oauth_token() -> str:
+    return _token_cache.get()
 
-def _public_search(query: str, sort: str, limit: int) -> List[Dict[str, Any]]:
+def _page(r: requests.Response) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    rate_limit.update(r.headers)
+    data = r.json().get("data", {})
+    children = [ch for ch in data.get("children", []) if isinstance(ch, dict)]
+    return children, data.get("after")
+
+def _cached(search):
+    # listing pages go through the optional response cache (keyed by endpoint + params, never the token)
+    def wrapper(query: str, sort: str, limit: int, after: Optional[str] = None):
+        cache = get_cache()
+        if not cache:
+            return search(query, sort, limit, after)
+        key = make_key(search.__name__, {"q": query, "sort": sort, "limit": min(limit, 100), "after": after})
+        hit = cache.get("reddit.search", key, units=1)
+        if hit is not None:
+            return hit["children"], hit["after"]
+        children, nxt = search(query, sort, limit, after)
+        cache.put("reddit.search", key, {"children": children, "after": nxt})
+        return children, nxt
+    return wrapper
+
+@_cached
+def _public_search(query: str, sort: str, limit: int, after: Optional[str] = None):
     params = {"q": query, "sort": sort, "limit": min(limit, 100), "t": "all", "restrict_sr": "false"}
-    headers = _ensure_user_agent()
-    r = requests.get(PUBLIC_SEARCH_URL, params=params, headers=headers, timeout=30)
-    r.raise_for_status()
-    payload = r.json()
-    children = payload.get("data", {}).get("children", [])
-    return [ch for ch in children if isinstance(ch, dict)]
+    if after:
+        params["after"] = after
+    r = http.request(_session(), "GET", PUBLIC_SEARCH_URL, params=params, headers=_ensure_user_agent())
+    return _page(r)
 
-def _oauth_search(query: str, sort: str, limit: int) -> List[Dict[str, Any]]:
-    token = _oauth_token()
-    headers = _ensure_user_agent({"Authorization": f"bearer {token}"})
+@_cached
+def _oauth_search(query: str, sort: str, limit: int, after: Optional[str] = None):
     params = {"q": query, "sort": sort, "limit": min(limit, 100), "t": "all", "restrict_sr": "false"}
-    r = requests.get(OAUTH_SEARCH_URL, params=params, headers=headers, timeout=30)
-    r.raise_for_status()
-    payload = r.json()
-    children = payload.get("data", {}).get("children", [])
-    return [ch for ch in children if isinstance(ch, dict)]
+    if after:
+        params["after"] = after
+    for attempt in range(2):
+        token = _oauth_token()
+        headers = _ensure_user_agent({"Authorization": f"bearer {token}"})
+        try:
+            r = http.request(_session(), "GET", OAUTH_SEARCH_URL, params=params, headers=headers)
+        except requests.HTTPError as e:
+            # token revoked/expired early: drop it and retry once with a fresh one
+            if attempt == 0 and e.response is not None and e.response.status_code == 401:
+                _token_cache.invalidate(token)
+                continue
+            raise
+        return _page(r)
+
+def iter_posts(
+    query: str,
+    sort: str = "relevance",
+    max_results: int = 100,
+    oauth: bool = False,
+    stop: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
+    acquire: Optional[Callable[[], Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield search children page by page (up to 100 per request), following the
+    `after` cursor until max_results, an empty page or no cursor. After each
+    page has been consumed, stop(page_children) may return True to end early.
+    acquire() (e.g. a rate limiter's) is called before each page request.
+    """
+    search = _oauth_search if oauth else _public_search
+    remaining, after = max_results, None
+    while remaining > 0:
+        if acquire is not None:
+            acquire()
+        children, after = search(query, sort, remaining, after)
+        children = children[:remaining]
+        if not children:
+            return
+        yield from children
+        remaining -= len(children)
+        if not after or (stop is not None and stop(children)):
+            return
+
+def pages_without(is_keeper: Callable[[Dict[str, Any]], bool], n: int) -> Callable[[List[Dict[str, Any]]], bool]:
+    """iter_posts stop predicate: True after `n` consecutive pages with no child passing is_keeper."""
+    misses = 0
+
+    def stop(page: List[Dict[str, Any]]) -> bool:
+        nonlocal misses
+        misses = 0 if any(is_keeper(ch) for ch in page) else misses + 1
+        return misses >= n
+
+    return stop
 
 def search_posts(query: str, sort: str = "relevance", limit: int = 25, oauth: bool = False) -> List[Dict[str, Any]]:
-    if oauth:
-        return _oauth_search(query, sort, limit)
-    return _public_search(query, sort, limit)
+    return list(iter_posts(query, sort, max_results=limit, oauth=oauth))
@@ -9,17 +9,29 @@ Optional:
 Functions:
   search_videos(query: str, published_after: str|None, max_results: int|None)
     -> List[dict] (combined snippet + statistics + durationSec)
+  iter_videos(queries, published_after, max_results, stats=None, acquire=None)
+    -> Iterator[dict] — paged search over several queries, deduplicated ids,
+       enriched in full 50-id videos.list batches
+  quota_stats — quota units / calls spent by this process (QuotaStats)
 
 Notes:
 - We perform a second call to videos.list to enrich statistics & duration.
+- Both calls share one keep-alive session and retry transient errors and
+  rate-limit responses with jittered backoff (apis/http.py).
+- With API_CACHE_PATH set, search pages and per-video videos.list items are
+  served from the on-disk cache (apis/cache.py) until their TTLs run out.
 - 'published_after' should be RFC3339 (e.g., "2025-10-01T00:00:00Z") or None.
 """
 
 from __future__ import annotations
 import os
+import threading
 import time
 import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+
+from . import http
+from .cache import get_cache, make_key
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 YOUTUBE_MAX_RESULTS = int(os.getenv("YOUTUBE_MAX_RESULTS", "25"))
@@ -27,11 +39,65 @@ YOUTUBE_MAX_RESULTS = int(os.getenv("YOUTUBE_MAX_RESULTS", "25"))
 SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
 VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
 
+MAX_PAGE_SIZE = 50          # search.list maxResults / ids per videos.list call
+SEARCH_QUOTA_UNITS = 100    # per search.list call
+VIDEOS_QUOTA_UNITS = 1      # per videos.list call
+
+
+class QuotaStats:
+    """Thread-safe API call / quota-unit counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.units = 0
+        self.duplicates = 0
+
+    def add(self, endpoint: str, units: int) -> None:
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            self.units += units
+
+    def add_duplicate(self) -> None:
+        with self._lock:
+            self.duplicates += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": dict(self.calls), "quota_units": self.units, "duplicate_ids": self.duplicates}
+
+
+quota_stats = QuotaStats()
+
+# 403s with these reasons are short-window rate limits and worth retrying;
+# "quotaExceeded" (daily quota) is not and is raised right away
+RETRYABLE_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+def _is_rate_limited(r: requests.Response) -> bool:
+    if r.status_code != 403:
+        return False
+    try:
+        errors = r.json().get("error", {}).get("errors", [])
+    except ValueError:
+        return False
+    return any(e.get("reason") in RETRYABLE_REASONS for e in errors)
+
 def _get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    r = requests.get(url, params=params, timeout=30)
-    r.raise_for_status()
+    r = http.request(http.get_session("youtube"), "GET", url, params=params, is_retryable=_is_rate_limited)
     return r.json()
 
+def _cached_get(url: str, params: Dict[str, Any], stats: QuotaStats) -> Dict[str, Any]:
+    # search.list page through the optional response cache; only real calls spend quota
+    cache = get_cache()
+    key = make_key(url, params) if cache else None
+    data = cache.get("youtube.search", key, units=SEARCH_QUOTA_UNITS) if cache else None
+    if data is None:
+        data = _get(url, params)
+        stats.add("search", SEARCH_QUOTA_UNITS)
+        if cache:
+            cache.put("youtube.search", key, data)
+    return data
+
 def _iso8601_duration_to_seconds(s: Optional[str]) -> Optional[int]:
     # Very small parser; for full coverage use isodate.parse_duration
     if not s or not s.startswith("P"):
@@ -52,62 +118,141 @@ def _iso8601_duration_to_seconds(s: Optional[str]) -> Optional[int]:
                 seconds = int(num or 0); num = ""
     return hours * 3600 + minutes * 60 + seconds
 
-def search_videos(
+def _merge(it: Dict[str, Any], srec: Dict[str, Any]) -> Dict[str, Any]:
+    vid = it["id"]["videoId"]
+    snip = it.get("snippet", {})
+    merged_snip = srec.get("snippet", {}) or snip
+    stat = srec.get("statistics", {}) or {}
+    content = srec.get("contentDetails", {}) or {}
+    duration_sec = _iso8601_duration_to_seconds(content.get("duration"))
+    return {
+        "id": vid,
+        "videoId": vid,
+        "title": merged_snip.get("title"),
+        "description": merged_snip.get("description"),
+        "channelTitle": merged_snip.get("channelTitle"),
+        "publishedAt": merged_snip.get("publishedAt"),
+        "snippet": merged_snip,
+        "statistics": stat,
+        "contentDetails": content,
+        "durationSec": duration_sec
+    }
+
+def iter_search_items(
     query: str,
     published_after: Optional[str] = None,
     max_results: Optional[int] = None,
     order: str = "relevance",
-) -> List[Dict[str, Any]]:
+    stats: Optional[QuotaStats] = None,
+    acquire: Optional[Callable[[], Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    search.list items for one query, following nextPageToken up to max_results.
+    acquire() (e.g. a rate limiter's) is called before each page request.
+    """
     if not YOUTUBE_API_KEY:
         raise RuntimeError("Missing YOUTUBE_API_KEY in environment.")
-    max_results = max_results or YOUTUBE_MAX_RESULTS
-
+    stats = stats or quota_stats
+    remaining = max_results or YOUTUBE_MAX_RESULTS
     params = {
         "key": YOUTUBE_API_KEY,
         "part": "snippet",
         "type": "video",
-        "maxResults": min(max_results, 50),
         "q": query,
         "order": order,
     }
     if published_after:
         params["publishedAfter"] = published_after
 
-    data = _get(SEARCH_URL, params)
-    items = data.get("items", [])
-
-    # Batch fetch statistics + duration
-    video_ids = [it["id"]["videoId"] for it in items if "id" in it and "videoId" in it["id"]]
-    if not video_ids:
-        return []
-    stats_data = _get(VIDEOS_URL, {
-        "key": YOUTUBE_API_KEY,
-        "part": "statistics,contentDetails,snippet",
-        "id": ",".join(video_ids),
-        "maxResults": len(video_ids)
-    })
-    stats_by_id = {x["id"]: x for x in stats_data.get("items", [])}
+    page_token = None
+    while remaining > 0:
+        page = {**params, "maxResults": min(remaining, MAX_PAGE_SIZE)}
+        if page_token:
+            page["pageToken"] = page_token
+        if acquire is not None:
+            acquire()
+        data = _cached_get(SEARCH_URL, page, stats)
+        items = [it for it in data.get("items", []) if "id" in it and "videoId" in it["id"]]
+        for it in items[:remaining]:
+            yield it
+        remaining -= len(items)
+        page_token = data.get("nextPageToken")
+        if not page_token or not items:
+            return
 
-    merged = []
+def _enrich(items: List[Dict[str, Any]], stats: QuotaStats,
+            acquire: Optional[Callable[[], Any]] = None) -> List[Dict[str, Any]]:
+    # one videos.list call for up to 50 search items; ids cached on their own are skipped
+    cache = get_cache()
+    stats_by_id: Dict[str, Dict[str, Any]] = {}
+    missing = []
     for it in items:
         vid = it["id"]["videoId"]
-        snip = it.get("snippet", {})
-        srec = stats_by_id.get(vid, {})
-        merged_snip = srec.get("snippet", {}) or snip
-        stat = srec.get("statistics", {}) or {}
-        content = srec.get("contentDetails", {}) or {}
-        duration_sec = _iso8601_duration_to_seconds(content.get("duration"))
-        merged.append({
-            "id": vid,
-            "videoId": vid,
-            "title": merged_snip.get("title"),
-            "description": merged_snip.get("description"),
-            "channelTitle": merged_snip.get("channelTitle"),
-            "publishedAt": merged_snip.get("publishedAt"),
-            "snippet": merged_snip,
-            "statistics": stat,
-            "contentDetails": content,
-            "durationSec": duration_sec
+        hit = cache.get("youtube.video", vid) if cache else None
+        if hit is None:
+            missing.append(vid)
+        else:
+            stats_by_id[vid] = hit
+    if cache and not missing:
+        cache.record_saved("youtube.video", VIDEOS_QUOTA_UNITS)
+    if missing:
+        if acquire is not None:
+            acquire()
+        stats_data = _get(VIDEOS_URL, {
+            "key": YOUTUBE_API_KEY,
+            "part": "statistics,contentDetails,snippet",
+            "id": ",".join(missing),
+            "maxResults": len(missing)
         })
+        stats.add("videos", VIDEOS_QUOTA_UNITS)
+        for x in stats_data.get("items", []):
+            stats_by_id[x["id"]] = x
+            if cache:
+                cache.put("youtube.video", x["id"], x)
+    return [_merge(it, stats_by_id.get(it["id"]["videoId"], {})) for it in items]
 
-    return merged
+def iter_videos(
+    queries: Iterable[str],
+    published_after: Optional[str] = None,
+    max_results: Optional[int] = None,
+    order: str = "relevance",
+    stats: Optional[QuotaStats] = None,
+    acquire: Optional[Callable[[], Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream enriched videos for several queries (e.g. one seed's precise, broad
+    and hashtag queries), up to max_results search hits per query. Ids are
+    deduplicated across queries and enriched in full 50-id videos.list
+    batches, so each video is yielded once, tagged with the first query that
+    found it. Quota spent is recorded in `stats` (default: module quota_stats);
+    acquire() is called before every search.list page and videos.list call.
+    """
+    stats = stats or quota_stats
+    seen = set()
+    pending: List[Dict[str, Any]] = []
+    for query in queries:
+        for it in iter_search_items(query, published_after, max_results, order, stats, acquire):
+            vid = it["id"]["videoId"]
+            if vid in seen:
+                stats.add_duplicate()
+                continue
+            seen.add(vid)
+            pending.append({**it, "query": query})
+            if len(pending) == MAX_PAGE_SIZE:
+                for rec, it_ in zip(_enrich(pending, stats, acquire), pending):
+                    yield {**rec, "query": it_["query"]}
+                pending = []
+    if pending:
+        for rec, it_ in zip(_enrich(pending, stats, acquire), pending):
+            yield {**rec, "query": it_["query"]}
+
+def search_videos(
+    query: str,
+    published_after: Optional[str] = None,
+    max_results: Optional[int] = None,
+    order: str = "relevance",
+) -> List[Dict[str, Any]]:
+    return [
+        {k: v for k, v in rec.items() if k != "query"}
+        for rec in iter_videos([query], published_after, max_results, order)
+    ]
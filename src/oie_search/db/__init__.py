@@ -4,16 +4,32 @@ Database backend abstraction for OpenIE Task 1 Data Collection.
 This module provides a unified interface for Postgres and MongoDB backends.
 Each backend implements:
     - list_seeds(limit)
-    - save_generated_queries(rows)
-    - list_unscored_previews(batch_size, limit)
+    - get_query_state(seed_ids), save_generated_queries(rows)
+    - list_unscored_previews(batch_size, limit, after_id, order)
+    - get_seeds(seed_ids)
     - save_preview_scores(rows)
+    - sample_previews(limit)
+    - get_seed_features(seed_ids), save_seed_features(rows)
+    - list_pending_queries(platforms, limit), mark_query_status(query_id, status), save_previews(rows)
+
+Backends share process-wide connection pools (db.pool) and are safe to use
+from several threads; use them as context managers (or call close()) to
+release the pool reference:
+
+    with get_backend("postgres") as db:
+        ...
 """
 
 import os
+from datetime import datetime, timezone
 from typing import Iterable, Dict, Any, List, Generator
-import psycopg2
 import pymongo
-from psycopg2.extras import RealDictCursor
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from psycopg2.extras import RealDictCursor, Json, execute_values
+
+from .pool import (get_mongo_client, get_pg_pool, pool_metrics, release_mongo_client,
+                   release_pg_pool)
 
 # ---------------------------------------------------------------------
 # Base interface
@@ -21,101 +37,394 @@ from psycopg2.extras import RealDictCursor
 class BaseBackend:
     """Defines the minimal interface expected by CLI scripts."""
 
+    last_seed_count = 0     # seeds yielded by the latest list_seeds() call
+
     def list_seeds(self, limit: int = 100) -> Generator[Dict[str, Any], None, None]:
         raise NotImplementedError
 
+    def get_query_state(self, seed_ids: Iterable[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+        """seed_id -> [{platform, content_hash, generator_version}] of the stored generated query sets."""
+        raise NotImplementedError
+
     def save_generated_queries(self, rows: Iterable[Dict[str, Any]]):
+        """Upsert generated query sets on (seed_id, platform), replacing queries, hash and version."""
         raise NotImplementedError
 
     def list_unscored_previews(
-        self, batch_size: int = 100, limit: int = 1000
+        self, batch_size: int = 100, limit: int = 1000, after_id=None, order: str = "id"
     ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Batches of unscored previews in id order (starting after `after_id` if
+        given), or clustered by seed_id with order="seed".
+        """
+        raise NotImplementedError
+
+    def get_seeds(self, seed_ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Seeds keyed by seed_id, fetched in one query."""
         raise NotImplementedError
 
     def save_preview_scores(self, rows: Iterable[Dict[str, Any]]):
         raise NotImplementedError
 
+    def sample_previews(self, limit: int = 10000) -> Generator[Dict[str, Any], None, None]:
+        """Random sample of preview records (scored or not), e.g. for fitting the IDF model."""
+        raise NotImplementedError
+
+    def get_seed_features(self, seed_ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Stored seed-feature rows (see pipelines.seed_features) keyed by seed_id."""
+        raise NotImplementedError
+
+    def save_seed_features(self, rows: Iterable[Dict[str, Any]]):
+        """Upsert seed-feature rows by seed_id."""
+        raise NotImplementedError
+
+    def list_pending_queries(self, platforms: Iterable[str] = None, limit: int = None,
+                             retry_errors: bool = False) -> List[Dict[str, Any]]:
+        """search_queries rows not fetched yet (and, with retry_errors, rows whose fetch failed)."""
+        raise NotImplementedError
+
+    def mark_query_status(self, query_id: Any, status: str, error: str = None):
+        """Record the fetch status ('done' | 'error') of one search_queries row."""
+        raise NotImplementedError
+
+    def save_previews(self, rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert fetched previews; rows whose (platform, url) already exists are skipped."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release this backend's reference to the shared connection pool."""
+
+    def metrics(self) -> Dict[str, Any]:
+        """Connection acquire-time / saturation stats (see db.pool)."""
+        return pool_metrics()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
 
 # ---------------------------------------------------------------------
 # Postgres implementation
 # ---------------------------------------------------------------------
+def upsert_generated_queries(cur, table: str, rows: List[Dict[str, Any]]):
+    """
+    Upsert generated query sets (query_refresh.build_query_rows) on
+    (seed_id, platform): changed seeds get their queries, content hash and
+    generator version replaced, and are queued for fetching again. The
+    conflict target is the partial unique index uq_generated_queries_seed_platform
+    (schema_postgres.sql), which leaves hand-written query_text rows alone.
+    """
+    if not rows:
+        return
+    execute_values(
+        cur,
+        f"""INSERT INTO {table}
+        (seed_id, platform, precise, broad, hashtag_phrase, content_hash, generator_version)
+        VALUES %s
+        ON CONFLICT (seed_id, platform) WHERE generator_version IS NOT NULL DO UPDATE SET
+          precise=EXCLUDED.precise, broad=EXCLUDED.broad, hashtag_phrase=EXCLUDED.hashtag_phrase,
+          content_hash=EXCLUDED.content_hash, generator_version=EXCLUDED.generator_version,
+          fetch_status=NULL;""",
+        [(r["seed_id"], r["platform"], r["precise"], r["broad"], r["hashtag_phrase"],
+          r["content_hash"], r["generator_version"]) for r in rows],
+    )
+
+
 class PostgresBackend(BaseBackend):
     def __init__(self):
-        dsn = os.getenv("POSTGRES_DSN", "host=localhost dbname=oie user=postgres password=postgres")
-        self.conn = psycopg2.connect(dsn)
-        self.conn.autocommit = True
+        # connections are checked out per call from the process-wide pool
+        self.pool = get_pg_pool(os.getenv("POSTGRES_DSN"), acquire=True)
         self.seeds_table = os.getenv("SEEDS_TABLE", "seeds_table")
         self.queries_table = os.getenv("SEARCH_QUERIES_TABLE", "search_queries")
         self.previews_table = os.getenv("PREVIEWS_TABLE", "previews")
+        self.seed_features_table = os.getenv("SEED_FEATURES_TABLE", "seed_features")
+
+    def close(self):
+        if self.pool is not None:
+            release_pg_pool(self.pool)
+            self.pool = None
 
     def list_seeds(self, limit: int = 100):
         q = f"SELECT * FROM {self.seeds_table} ORDER BY seed_id ASC LIMIT %s"
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(q, (limit,))
+            rows = cur.fetchall()
+        self.last_seed_count = len(rows)
+        for row in rows:
+            yield dict(row)
+
+    def get_query_state(self, seed_ids: Iterable[Any]):
+        ids = list(seed_ids)
+        if not ids:
+            return {}
+        q = (f"SELECT seed_id, platform, content_hash, generator_version FROM {self.queries_table} "
+             "WHERE seed_id = ANY(%s) AND generator_version IS NOT NULL")
+        state: Dict[Any, List[Dict[str, Any]]] = {}
+        with self.pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(q, (ids,))
             for row in cur.fetchall():
-                yield dict(row)
+                state.setdefault(row["seed_id"], []).append(dict(row))
+        return state
 
     def save_generated_queries(self, rows: Iterable[Dict[str, Any]]):
-        with self.conn.cursor() as cur:
-            for r in rows:
-                cur.execute(
-                    f"""INSERT INTO {self.queries_table}
-                    (seed_id, platform, precise, broad, hashtag_phrase)
-                    VALUES (%s,%s,%s,%s,%s)
-                    ON CONFLICT DO NOTHING;""",
-                    (r["seed_id"], r["platform"], r["precise"], r["broad"], r["hashtag_phrase"]),
-                )
-
-    def list_unscored_previews(self, batch_size: int = 100, limit: int = 1000):
-        q = f"""
-            SELECT * FROM {self.previews_table}
-            WHERE score IS NULL
-            ORDER BY id ASC
-            LIMIT %s
+        rows = list(rows)
+        if not rows:
+            return
+        with self.pool.connection(autocommit=False) as conn, conn.cursor() as cur:
+            upsert_generated_queries(cur, self.queries_table, rows)
+
+    def list_unscored_previews(self, batch_size: int = 100, limit: int = 1000, after_id=None,
+                               order: str = "id"):
         """
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(q, (limit,))
-            batch = []
-            for row in cur.fetchall():
-                batch.append(dict(row))
-                if len(batch) >= batch_size:
-                    yield batch
-                    batch = []
-            if batch:
-                yield batch
+        Keyset scan over unscored previews: one LIMIT batch_size query per
+        batch, resuming after the last key seen, so memory stays at one batch
+        and the first batch arrives after a single short query.
+        order="id" scans in id order; pass after_id (e.g. the last id logged
+        before a crash) to resume. order="seed" clusters rows by seed_id
+        (then id), so each seed's previews arrive in as few batches as
+        possible; a restart simply skips rows that were scored already.
+        limit=None scans the whole table.
+        """
+        if order not in ("id", "seed"):
+            raise ValueError(f"Unknown order: {order}")
+        if order == "seed" and after_id is not None:
+            raise ValueError("after_id only applies to order='id'")
+        if order == "id":
+            sort_key, keyset, key_of = "id", "id > %s", (lambda row: (row["id"],))
+        else:
+            sort_key = "COALESCE(seed_id, -1), id"
+            keyset = "(COALESCE(seed_id, -1), id) > (%s, %s)"
+            key_of = lambda row: (-1 if row["seed_id"] is None else row["seed_id"], row["id"])
+        after = (after_id,) if after_id is not None else None
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            n = batch_size if remaining is None else min(batch_size, remaining)
+            where = "score IS NULL" + (f" AND {keyset}" if after else "")
+            q = f"SELECT * FROM {self.previews_table} WHERE {where} ORDER BY {sort_key} LIMIT %s"
+            with self.pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(q, (*(after or ()), n))
+                batch = [dict(row) for row in cur.fetchall()]
+            if not batch:
+                return
+            yield batch
+            after = key_of(batch[-1])
+            if remaining is not None:
+                remaining -= len(batch)
+            if len(batch) < n:
+                return
+
+    def get_seeds(self, seed_ids: Iterable[Any]):
+        ids = list(seed_ids)
+        if not ids:
+            return {}
+        q = f"SELECT * FROM {self.seeds_table} WHERE seed_id = ANY(%s)"
+        with self.pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(q, (ids,))
+            return {row["seed_id"]: dict(row) for row in cur.fetchall()}
 
     def save_preview_scores(self, rows: Iterable[Dict[str, Any]]):
-        with self.conn.cursor() as cur:
-            for r in rows:
-                cur.execute(
-                    f"""UPDATE {self.previews_table}
-                    SET score=%s, decision=%s, signals=%s
-                    WHERE id=%s;""",
-                    (r["score"], r["decision"], str(r.get("signals", {})), r["id"]),
-                )
+        """
+        Bulk write-back: load the batch into a temp table (typed like the
+        previews columns) and apply it with one UPDATE ... FROM, all in a
+        single transaction. signals are stored as JSON.
+        """
+        values = [(r["id"], r["score"], r["decision"], Json(r.get("signals", {}))) for r in rows]
+        if not values:
+            return
+        with self.pool.connection(autocommit=False) as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""CREATE TEMP TABLE _preview_scores ON COMMIT DROP AS
+                SELECT id, score, decision, signals FROM {self.previews_table} WITH NO DATA;"""
+            )
+            execute_values(
+                cur,
+                "INSERT INTO _preview_scores (id, score, decision, signals) VALUES %s",
+                values,
+                page_size=1000,
+            )
+            cur.execute(
+                f"""UPDATE {self.previews_table} AS p
+                SET score=t.score, decision=t.decision, signals=t.signals
+                FROM _preview_scores AS t
+                WHERE p.id = t.id;"""
+            )
+
+    def sample_previews(self, limit: int = 10000):
+        q = f"SELECT * FROM {self.previews_table} ORDER BY RANDOM() LIMIT %s"
+        with self.pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(q, (limit,))
+            rows = cur.fetchall()
+        for row in rows:
+            yield dict(row)
+
+    def list_pending_queries(self, platforms: Iterable[str] = None, limit: int = None,
+                             retry_errors: bool = False):
+        statuses = ["pending", "error"] if retry_errors else ["pending"]
+        q = f"SELECT * FROM {self.queries_table} WHERE (fetch_status IS NULL OR fetch_status = ANY(%s))"
+        params: List[Any] = [statuses]
+        if platforms:
+            q += " AND platform = ANY(%s)"
+            params.append(list(platforms))
+        q += " ORDER BY seed_id, platform"
+        if limit:
+            q += " LIMIT %s"
+            params.append(limit)
+        with self.pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(q, params)
+            return [dict(row) for row in cur.fetchall()]
+
+    def mark_query_status(self, query_id: Any, status: str, error: str = None):
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"UPDATE {self.queries_table} SET fetch_status=%s, fetch_error=%s, fetched_at=now() WHERE query_id=%s;",
+                (status, error, query_id),
+            )
+
+    def save_previews(self, rows: Iterable[Dict[str, Any]]):
+        values = [
+            (r.get("seed_id"), r["platform"], r["url"], r.get("title"), r.get("snippet"), r.get("author"),
+             r.get("published_at"), Json(r.get("raw") or {}))
+            for r in rows
+        ]
+        if not values:
+            return {"inserted": 0, "skipped": 0}
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            inserted = execute_values(
+                cur,
+                f"""INSERT INTO {self.previews_table}
+                (seed_id, platform, url, title, snippet, author, published_at, raw_meta)
+                VALUES %s
+                ON CONFLICT (platform, url) DO NOTHING
+                RETURNING 1;""",
+                values,
+                fetch=True,
+            )
+        return {"inserted": len(inserted), "skipped": len(values) - len(inserted)}
+
+    def get_seed_features(self, seed_ids: Iterable[Any]):
+        ids = list(seed_ids)
+        if not ids:
+            return {}
+        q = f"SELECT * FROM {self.seed_features_table} WHERE seed_id = ANY(%s)"
+        with self.pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(q, (ids,))
+            return {row["seed_id"]: dict(row) for row in cur.fetchall()}
+
+    def save_seed_features(self, rows: Iterable[Dict[str, Any]]):
+        values = [
+            (r["seed_id"], r["content_hash"], r.get("idf_version"), r.get("generator_version"), Json(r.get("vector")),
+             Json(r.get("phrases", [])), Json(r.get("top_terms", [])), Json(r.get("hashtags", [])))
+            for r in rows
+        ]
+        if not values:
+            return
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            execute_values(
+                cur,
+                f"""INSERT INTO {self.seed_features_table}
+                (seed_id, content_hash, idf_version, generator_version, vector, phrases, top_terms, hashtags)
+                VALUES %s
+                ON CONFLICT (seed_id) DO UPDATE SET
+                  content_hash=EXCLUDED.content_hash, idf_version=EXCLUDED.idf_version,
+                  generator_version=EXCLUDED.generator_version,
+                  vector=EXCLUDED.vector, phrases=EXCLUDED.phrases, top_terms=EXCLUDED.top_terms,
+                  hashtags=EXCLUDED.hashtags, updated_at=now();""",
+                values,
+            )
 
 
 # ---------------------------------------------------------------------
 # MongoDB implementation
 # ---------------------------------------------------------------------
+MONGO_BULK_CHUNK = int(os.getenv("MONGO_BULK_CHUNK", "1000"))
+DUPLICATE_KEY = 11000
+
+
+def mongo_bulk_write(coll, ops: List[Any], chunk_size: int = MONGO_BULK_CHUNK) -> Dict[str, int]:
+    """
+    Unordered bulk_write in chunks of `chunk_size` ops. Duplicate-key errors
+    (e.g. the unique search_queries index) are tolerated; any other write error
+    is raised. Returns counts of inserted (incl. upserted), updated (matched)
+    and skipped (duplicates, or updates that matched nothing) documents.
+    """
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    for i in range(0, len(ops), chunk_size):
+        chunk = ops[i:i + chunk_size]
+        try:
+            details = coll.bulk_write(chunk, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            if details.get("writeConcernErrors") or any(
+                err.get("code") != DUPLICATE_KEY for err in details.get("writeErrors", [])
+            ):
+                raise
+        inserted = details.get("nInserted", 0) + details.get("nUpserted", 0)
+        updated = details.get("nMatched", 0)
+        counts["inserted"] += inserted
+        counts["updated"] += updated
+        counts["skipped"] += len(chunk) - inserted - updated
+    return counts
+
+
+def generated_query_filter(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ReplaceOne filter of a generated query set: its (seed_id, platform) among
+    docs with a generator_version (the partial unique index
+    uq_generated_queries_seed_platform in mongo_init.js), so hand-written
+    query_text docs are never replaced.
+    """
+    return {"seed_id": row["seed_id"], "platform": row["platform"], "generator_version": {"$exists": True}}
+
+
 class MongoBackend(BaseBackend):
     def __init__(self):
-        uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-        dbname = os.getenv("MONGO_DB", "oie")
-        client = pymongo.MongoClient(uri)
-        self.db = client[dbname]
+        # one MongoClient (and its connection pool) per process, shared by all backends
+        self.client = get_mongo_client(os.getenv("MONGO_URI"), acquire=True)
+        self.db = self.client[os.getenv("MONGO_DB", "oie")]
+
+    def close(self):
+        if self.client is not None:
+            release_mongo_client(self.client)
+            self.client = None
 
     def list_seeds(self, limit: int = 100):
-        for doc in self.db["seeds"].find().limit(limit):
+        self.last_seed_count = 0
+        for doc in self.db["seeds"].find().limit(limit or 0):
+            self.last_seed_count += 1
             yield doc
 
+    def get_query_state(self, seed_ids: Iterable[Any]):
+        ids = list(seed_ids)
+        if not ids:
+            return {}
+        projection = {"seed_id": 1, "platform": 1, "content_hash": 1, "generator_version": 1}
+        state: Dict[Any, List[Dict[str, Any]]] = {}
+        flt = {"seed_id": {"$in": ids}, "generator_version": {"$exists": True}}
+        for doc in self.db["search_queries"].find(flt, projection):
+            state.setdefault(doc["seed_id"], []).append(doc)
+        return state
+
     def save_generated_queries(self, rows: Iterable[Dict[str, Any]]):
-        if not rows:
-            return
-        self.db["search_queries"].insert_many(list(rows))
+        ops = [pymongo.ReplaceOne(generated_query_filter(r), dict(r), upsert=True) for r in rows]
+        return mongo_bulk_write(self.db["search_queries"], ops)
 
-    def list_unscored_previews(self, batch_size: int = 100, limit: int = 1000):
-        cursor = self.db["previews"].find({"score": {"$exists": False}}).limit(limit)
+    def list_unscored_previews(self, batch_size: int = 100, limit: int = 1000, after_id=None,
+                               order: str = "id"):
+        if order not in ("id", "seed"):
+            raise ValueError(f"Unknown order: {order}")
+        if order == "seed" and after_id is not None:
+            raise ValueError("after_id only applies to order='id'")
+        flt = {"score": {"$exists": False}}
+        if after_id is not None:
+            if isinstance(after_id, str) and ObjectId.is_valid(after_id):
+                after_id = ObjectId(after_id)
+            flt["_id"] = {"$gt": after_id}
+        sort = [("_id", 1)] if order == "id" else [("seed_id", 1), ("_id", 1)]
+        cursor = self.db["previews"].find(flt).sort(sort).limit(limit or 0).batch_size(batch_size)
         batch = []
         for doc in cursor:
             batch.append(doc)
@@ -126,11 +435,60 @@ class MongoBackend(BaseBackend):
             yield batch
 
     def save_preview_scores(self, rows: Iterable[Dict[str, Any]]):
-        for r in rows:
-            self.db["previews"].update_one(
-                {"_id": r["_id"]},
+        ops = [
+            pymongo.UpdateOne(
+                {"_id": r.get("_id", r.get("id"))},
                 {"$set": {"score": r["score"], "decision": r["decision"], "signals": r.get("signals", {})}},
             )
+            for r in rows
+        ]
+        return mongo_bulk_write(self.db["previews"], ops)
+
+    def get_seeds(self, seed_ids: Iterable[Any]):
+        ids = list(seed_ids)
+        if not ids:
+            return {}
+        # seeds may be keyed by an explicit seed_id or by _id (see mongo_runner)
+        docs = self.db["seeds"].find({"$or": [{"seed_id": {"$in": ids}}, {"_id": {"$in": ids}}]})
+        return {doc.get("seed_id", doc["_id"]): doc for doc in docs}
+
+    def sample_previews(self, limit: int = 10000):
+        for doc in self.db["previews"].aggregate([{"$sample": {"size": limit}}]):
+            yield doc
+
+    def list_pending_queries(self, platforms: Iterable[str] = None, limit: int = None,
+                             retry_errors: bool = False):
+        statuses = ["pending", "error"] if retry_errors else ["pending"]
+        flt: Dict[str, Any] = {"$or": [{"fetch_status": {"$exists": False}}, {"fetch_status": {"$in": statuses}}]}
+        if platforms:
+            flt["platform"] = {"$in": list(platforms)}
+        cursor = self.db["search_queries"].find(flt).sort([("seed_id", 1), ("platform", 1)]).limit(limit or 0)
+        return list(cursor)
+
+    def mark_query_status(self, query_id: Any, status: str, error: str = None):
+        self.db["search_queries"].update_one(
+            {"_id": query_id},
+            {"$set": {"fetch_status": status, "fetch_error": error, "fetched_at": datetime.now(timezone.utc)}},
+        )
+
+    def save_previews(self, rows: Iterable[Dict[str, Any]]):
+        # unique (platform, url) index: previews fetched before are skipped
+        counts = mongo_bulk_write(self.db["previews"], [pymongo.InsertOne(dict(r)) for r in rows])
+        return {"inserted": counts["inserted"], "skipped": counts["skipped"]}
+
+    def get_seed_features(self, seed_ids: Iterable[Any]):
+        ids = list(seed_ids)
+        if not ids:
+            return {}
+        return {doc["seed_id"]: doc for doc in self.db["seed_features"].find({"seed_id": {"$in": ids}})}
+
+    def save_seed_features(self, rows: Iterable[Dict[str, Any]]):
+        ops = [
+            pymongo.ReplaceOne({"seed_id": r["seed_id"]}, {**r, "updated_at": datetime.now(timezone.utc)}, upsert=True)
+            for r in rows
+        ]
+        if ops:
+            self.db["seed_features"].bulk_write(ops, ordered=False)
 
 
 # ---------------------------------------------------------------------
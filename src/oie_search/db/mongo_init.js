@@ -13,10 +13,27 @@ db.search_queries.createIndex(
   { seed_id: 1, platform: 1, query_text: 1 },
   { unique: true }
 );
+// one generated query set per (seed, platform): filter of the incremental ReplaceOne upsert
+// (db/mongo_runner.py). Partial on generator_version, so hand-written query_text docs
+// (seed_mongo.js) are unaffected and re-running this script on existing data succeeds.
+if (db.search_queries.getIndexes().some(ix => ix.name === "uq_queries_seed_platform")) {
+  db.search_queries.dropIndex("uq_queries_seed_platform");   // earlier, non-partial version
+}
+db.search_queries.createIndex(
+  { seed_id: 1, platform: 1 },
+  {
+    unique: true,
+    name: "uq_generated_queries_seed_platform",
+    partialFilterExpression: { generator_version: { $exists: true } },
+  }
+);
 
 // previews (optional)
 db.previews.createIndex({ platform: 1, url: 1 }, { unique: true });
 db.previews.createIndex({ seed_id: 1 });
 db.previews.createIndex({ score: -1 });
 
+// seed_features (derived, refreshed by cli/refresh_seed_features.py)
+db.seed_features.createIndex({ seed_id: 1 }, { unique: true });
+
 print(`Indexes ensured for MongoDB database '${dbname}'.`);
@@ -1,32 +1,73 @@
 import os
 from dotenv import load_dotenv
-from pymongo import MongoClient
-from typing import Dict, List
-from oie_search.query_generator import generate_queries_for_platform
-from oie_search.config import PLATFORMS_PRIORITY, DEFAULT_QCFG
+from pymongo import ReplaceOne
+from typing import Dict, List, Optional
+from oie_search.db import MONGO_BULK_CHUNK, generated_query_filter, mongo_bulk_write
+from oie_search.db.pool import get_mongo_client
+from oie_search.pipelines.query_refresh import build_query_rows, generator_version, is_current
+from oie_search.pipelines.seed_features import is_fresh, seed_key
+from oie_search.utils.hashing import seed_content_hash
 
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI")
 MONGO_DB = os.getenv("MONGO_DB", "oie")
 
-def generate_queries_mongo(seeds_collection="seeds", out_collection="search_queries", limit: int = 100) -> List[Dict]:
-    client = MongoClient(MONGO_URI)
-    db = client[MONGO_DB]
-    seeds = db[seeds_collection].find().limit(limit)
+def generate_queries_mongo(seeds_collection="seeds", out_collection="search_queries", limit: Optional[int] = 100,
+                           chunk_size: int = MONGO_BULK_CHUNK, counts: Optional[Dict[str, int]] = None,
+                           batch_size: int = 500, force: bool = False) -> List[Dict]:
+    """
+    Incremental generation over the first `limit` seeds (None = all), `batch_size`
+    seeds at a time: seeds whose stored queries already match their content hash
+    and generator version are skipped (force=True regenerates all); the rest are
+    upserted on (seed_id, platform) with unordered bulk writes of `chunk_size` ops.
+    Returns the docs written; checked / regenerated / unchanged seed counts and
+    inserted / updated / skipped write counts are added to `counts` if given.
+    """
+    db = get_mongo_client(MONGO_URI)[MONGO_DB]
     out_coll = db[out_collection]
-
+    version = generator_version()
+    counts = counts if counts is not None else {}
+    for k in ("checked", "regenerated", "unchanged"):
+        counts.setdefault(k, 0)
     results = []
-    for seed in seeds:
-        for platform in PLATFORMS_PRIORITY:
-            qset = generate_queries_for_platform(seed, platform, config={"include_author": DEFAULT_QCFG.include_author})
-            doc = {
-                "seed_id": seed["_id"],
-                "platform": platform,
-                "precise": qset["precise"],
-                "broad": qset["broad"],
-                "hashtag_phrase": qset["hashtag_phrase"]
-            }
-            out_coll.insert_one(doc)
-            results.append(doc)
+
+    def flush(seeds):
+        ids = [seed["_id"] for seed in seeds]
+        stored = {
+            doc["seed_id"]: doc
+            for doc in db["seed_features"].find({"seed_id": {"$in": [seed_key(s) for s in seeds]}})
+        }
+        existing = {}
+        if not force:
+            projection = {"seed_id": 1, "platform": 1, "content_hash": 1, "generator_version": 1}
+            for doc in out_coll.find({"seed_id": {"$in": ids}}, projection):
+                existing.setdefault(doc["seed_id"], []).append(doc)
+
+        docs = []
+        for seed in seeds:
+            h = seed_content_hash(seed)
+            counts["checked"] += 1
+            if is_current(existing.get(seed["_id"], []), h, version):
+                counts["unchanged"] += 1
+                continue
+            features = stored.get(seed_key(seed))
+            if not is_fresh(features, seed, content_hash=h):
+                features = None
+            docs.extend(build_query_rows(seed, seed["_id"], h, version, features=features))
+            counts["regenerated"] += 1
+
+        ops = [ReplaceOne(generated_query_filter(d), d, upsert=True) for d in docs]
+        for k, v in mongo_bulk_write(out_coll, ops, chunk_size).items():
+            counts[k] = counts.get(k, 0) + v
+        results.extend(docs)
+
+    batch = []
+    for seed in db[seeds_collection].find().sort("_id", 1).limit(limit or 0):
+        batch.append(seed)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
     return results
@@ -0,0 +1,217 @@
+"""
+Process-wide connection pools shared by the db backends and runners.
+
+  get_pg_pool(dsn)        one PgPool (psycopg2 ThreadedConnectionPool) per DSN
+  get_mongo_client(uri)   one MongoClient per URI (it pools internally)
+
+Both are reference counted: each backend from get_backend() holds a reference
+and backend.close() (or leaving `with get_backend(...) as db:`) releases it;
+the last release closes the pool. Anything still open is closed at exit.
+
+Acquire time and saturation are tracked per pool (PoolStats): how long callers
+waited for a connection, how many acquires found the pool exhausted, and the
+peak number of connections in use. pool_metrics() returns them all.
+"""
+
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import psycopg2
+import pymongo
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from pymongo import monitoring
+
+DEFAULT_DSN = "host=localhost dbname=oie user=postgres password=postgres"
+DEFAULT_MONGO_URI = "mongodb://localhost:27017"
+PG_POOL_MIN = int(os.getenv("PG_POOL_MIN", "1"))
+PG_POOL_MAX = int(os.getenv("PG_POOL_MAX", "10"))
+PG_POOL_TIMEOUT = float(os.getenv("PG_POOL_TIMEOUT", "30"))
+MONGO_POOL_MAX = int(os.getenv("MONGO_POOL_MAX", "100"))
+
+
+class PoolStats:
+    """Thread-safe acquire/release counters for one pool."""
+
+    def __init__(self, max_size: int):
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.acquires = 0
+        self.saturated = 0          # acquires that found every connection in use
+        self.wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def acquired(self, wait_s: float, saturated: bool) -> None:
+        with self._lock:
+            self.acquires += 1
+            self.saturated += saturated
+            self.wait_s += wait_s
+            self.max_wait_s = max(self.max_wait_s, wait_s)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def released(self) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "acquires": self.acquires,
+                "saturated": self.saturated,
+                "avg_wait_ms": round(self.wait_s / self.acquires * 1000, 3) if self.acquires else 0.0,
+                "max_wait_ms": round(self.max_wait_s * 1000, 3),
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+            }
+
+
+class PgPool:
+    """
+    ThreadedConnectionPool that blocks (up to `timeout` seconds) when all
+    `maxconn` connections are checked out, instead of raising PoolError.
+    """
+
+    def __init__(self, dsn: str, minconn: int = PG_POOL_MIN, maxconn: int = PG_POOL_MAX,
+                 timeout: float = PG_POOL_TIMEOUT):
+        self._pool = ThreadedConnectionPool(minconn, maxconn, dsn)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self.timeout = timeout
+        self.stats = PoolStats(maxconn)
+
+    @contextmanager
+    def connection(self, autocommit: bool = True):
+        """
+        Check out a connection for the duration of the block. With
+        autocommit=False the block is one transaction: committed on normal
+        exit, rolled back on error.
+        """
+        t0 = time.perf_counter()
+        saturated = not self._slots.acquire(blocking=False)
+        if saturated and not self._slots.acquire(timeout=self.timeout):
+            raise PoolError(f"no Postgres connection available after {self.timeout}s")
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        self.stats.acquired(time.perf_counter() - t0, saturated)
+        broken = False
+        try:
+            if conn.autocommit != autocommit:
+                conn.autocommit = autocommit
+            yield conn
+            if not autocommit:
+                conn.commit()
+        except BaseException:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            raise
+        finally:
+            self._pool.putconn(conn, close=broken or bool(conn.closed))
+            self._slots.release()
+            self.stats.released()
+
+    def close(self) -> None:
+        self._pool.closeall()
+
+
+class _MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Feeds MongoClient connection check-outs into PoolStats."""
+
+    def __init__(self, stats: PoolStats):
+        self.stats = stats
+
+    def connection_checked_out(self, event):
+        wait = event.duration or 0.0
+        # the driver only waits noticeably when every pooled connection is busy
+        self.stats.acquired(wait, self.stats.in_use >= self.stats.max_size)
+
+    def connection_checked_in(self, event):
+        self.stats.released()
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_created(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_check_out_started(self, event): pass
+    def connection_check_out_failed(self, event): pass
+
+
+_lock = threading.Lock()
+_pg_pools: Dict[str, list] = {}        # dsn -> [PgPool, refs]
+_mongo_clients: Dict[str, list] = {}   # uri -> [MongoClient, PoolStats, refs]
+
+
+def get_pg_pool(dsn: Optional[str] = None, acquire: bool = False) -> PgPool:
+    """Shared pool for `dsn` ($POSTGRES_DSN by default). acquire=True takes a reference (see release_pg_pool)."""
+    dsn = dsn or os.getenv("POSTGRES_DSN", DEFAULT_DSN)
+    with _lock:
+        entry = _pg_pools.get(dsn)
+        if entry is None:
+            entry = _pg_pools[dsn] = [PgPool(dsn), 0]
+        entry[1] += acquire
+        return entry[0]
+
+def release_pg_pool(pool: PgPool) -> None:
+    with _lock:
+        for dsn, entry in list(_pg_pools.items()):
+            if entry[0] is pool:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del _pg_pools[dsn]
+                    pool.close()
+                return
+
+def get_mongo_client(uri: Optional[str] = None, acquire: bool = False) -> pymongo.MongoClient:
+    """Shared MongoClient for `uri` ($MONGO_URI by default). acquire=True takes a reference."""
+    uri = uri or os.getenv("MONGO_URI", DEFAULT_MONGO_URI)
+    with _lock:
+        entry = _mongo_clients.get(uri)
+        if entry is None:
+            stats = PoolStats(MONGO_POOL_MAX)
+            client = pymongo.MongoClient(uri, maxPoolSize=MONGO_POOL_MAX,
+                                         event_listeners=[_MongoPoolListener(stats)])
+            entry = _mongo_clients[uri] = [client, stats, 0]
+        entry[2] += acquire
+        return entry[0]
+
+def release_mongo_client(client: pymongo.MongoClient) -> None:
+    with _lock:
+        for uri, entry in list(_mongo_clients.items()):
+            if entry[0] is client:
+                entry[2] -= 1
+                if entry[2] <= 0:
+                    del _mongo_clients[uri]
+                    client.close()
+                return
+
+def pool_metrics() -> Dict[str, Any]:
+    """Acquire-time / saturation stats of every open pool (DSNs and URIs are not included)."""
+    with _lock:
+        return {
+            "postgres": [entry[0].stats.as_dict() for entry in _pg_pools.values()],
+            "mongo": [entry[1].as_dict() for entry in _mongo_clients.values()],
+        }
+
+@atexit.register
+def close_all() -> None:
+    with _lock:
+        for entry in _pg_pools.values():
+            entry[0].close()
+        for entry in _mongo_clients.values():
+            entry[0].close()
+        _pg_pools.clear()
+        _mongo_clients.clear()
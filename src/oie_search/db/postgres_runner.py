@@ -1,41 +1,99 @@
-import os, json, uuid
+import os, json
 import psycopg2
 from dotenv import load_dotenv
-from typing import Dict, List
-from oie_search.query_generator import generate_queries_for_platform
-from oie_search.config import PLATFORMS_PRIORITY, DEFAULT_QCFG
+from typing import Dict, List, Optional
+from oie_search.db import upsert_generated_queries
+from oie_search.db.pool import get_pg_pool
+from oie_search.pipelines.query_refresh import build_query_rows, generator_version, is_current
+from oie_search.pipelines.seed_features import is_fresh
+from oie_search.utils.hashing import seed_content_hash
 
 load_dotenv()
 
 DSN = os.getenv("POSTGRES_DSN")
 SEEDS_TABLE = os.getenv("SEEDS_TABLE", "seeds_table")
 SEARCH_QUERIES_TABLE = os.getenv("SEARCH_QUERIES_TABLE", "search_queries")
+SEED_FEATURES_TABLE = os.getenv("SEED_FEATURES_TABLE", "seed_features")
 
-def generate_queries_postgres(limit: int = 100) -> List[Dict]:
-    conn = psycopg2.connect(DSN)
-    cur = conn.cursor()
-    cur.execute(f"SELECT id, data_json FROM {SEEDS_TABLE} ORDER BY id LIMIT %s;", (limit,))
-    rows = cur.fetchall()
+def _stored_features(conn, ids: List) -> Dict:
+    # precomputed phrases/top_terms from the seed_features store (empty if the table is missing)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT seed_id, content_hash, generator_version, phrases, top_terms FROM {SEED_FEATURES_TABLE} "
+                "WHERE seed_id = ANY(%s);",
+                (ids,),
+            )
+            return {
+                sid: {"content_hash": h, "generator_version": v, "phrases": ph, "top_terms": tt}
+                for sid, h, v, ph, tt in cur.fetchall()
+            }
+    except psycopg2.Error:
+        conn.rollback()
+        return {}
 
+def _existing_query_state(cur, ids: List) -> Dict:
+    # seed_id -> [{platform, content_hash, generator_version}] of the stored query sets
+    cur.execute(
+        f"SELECT seed_id, platform, content_hash, generator_version FROM {SEARCH_QUERIES_TABLE} WHERE seed_id = ANY(%s);",
+        (ids,),
+    )
+    state: Dict = {}
+    for sid, platform, h, version in cur.fetchall():
+        state.setdefault(sid, []).append({"platform": platform, "content_hash": h, "generator_version": version})
+    return state
+
+def generate_queries_postgres(limit: Optional[int] = 100, batch_size: int = 500, force: bool = False,
+                              counts: Optional[Dict[str, int]] = None) -> List[Dict]:
+    """
+    Incremental generation over the first `limit` seeds (None = all), scanned
+    in id order `batch_size` at a time: seeds whose stored queries already
+    match their content hash and generator version are skipped (force=True
+    regenerates all). Changed rows are upserted on (seed_id, platform)
+    (db.upsert_generated_queries). Returns the rows written; checked /
+    regenerated / unchanged seed counts are added to `counts` if given.
+    """
+    version = generator_version()
+    counts = counts if counts is not None else {}
+    for k in ("checked", "regenerated", "unchanged"):
+        counts.setdefault(k, 0)
+    pool = get_pg_pool(DSN)
     output = []
-    for rid, data_json in rows:
-        seed = data_json if isinstance(data_json, dict) else json.loads(data_json)
-        for platform in PLATFORMS_PRIORITY:
-            qset = generate_queries_for_platform(seed, platform, config={"include_author": DEFAULT_QCFG.include_author})
-            output.append({
-                "seed_id": rid,
-                "platform": platform,
-                "precise": qset["precise"],
-                "broad": qset["broad"],
-                "hashtag_phrase": qset["hashtag_phrase"]
-            })
+    last_id, remaining = None, limit
+    while remaining is None or remaining > 0:
+        n = batch_size if remaining is None else min(batch_size, remaining)
+        # one pooled connection, one transaction (committed on success) per batch
+        with pool.connection(autocommit=False) as conn, conn.cursor() as cur:
+            if last_id is None:
+                cur.execute(f"SELECT id, data_json FROM {SEEDS_TABLE} ORDER BY id LIMIT %s;", (n,))
+            else:
+                cur.execute(f"SELECT id, data_json FROM {SEEDS_TABLE} WHERE id > %s ORDER BY id LIMIT %s;", (last_id, n))
+            rows = cur.fetchall()
+            if not rows:
+                break
+            ids = [rid for rid, _ in rows]
+            stored = _stored_features(conn, ids)
+            existing = {} if force else _existing_query_state(cur, ids)
 
-    for item in output:
-        cur.execute(
-            f"INSERT INTO {SEARCH_QUERIES_TABLE}(id, seed_id, platform, precise, broad, hashtag_phrase) VALUES (%s,%s,%s,%s,%s,%s)",
-            (str(uuid.uuid4()), item["seed_id"], item["platform"], item["precise"], item["broad"], item["hashtag_phrase"])
-        )
-    conn.commit()
-    cur.close(); conn.close()
-    return output
+            batch_out = []
+            for rid, data_json in rows:
+                seed = data_json if isinstance(data_json, dict) else json.loads(data_json)
+                h = seed_content_hash(seed)
+                counts["checked"] += 1
+                if is_current(existing.get(rid, []), h, version):
+                    counts["unchanged"] += 1
+                    continue
+                features = stored.get(rid)
+                if not is_fresh(features, seed, content_hash=h):
+                    features = None
+                batch_out.extend(build_query_rows(seed, rid, h, version, features=features))
+                counts["regenerated"] += 1
 
+            upsert_generated_queries(cur, SEARCH_QUERIES_TABLE, batch_out)
+        output.extend(batch_out)
+        last_id = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < n:
+            break
+    return output
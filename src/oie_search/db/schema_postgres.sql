@@ -15,22 +15,55 @@ CREATE TABLE IF NOT EXISTS public.seeds_table (
 CREATE INDEX IF NOT EXISTS idx_seeds_topic ON public.seeds_table(seed_topic);
 
 -- 3.2 GENERATED SEARCH QUERIES
+-- Two kinds of rows share this table:
+--   generated query sets (db/postgres_runner.py, cli/gen_queries.py): one row per (seed_id, platform)
+--     with precise / broad / hashtag_phrase, content_hash and generator_version set, query_text NULL;
+--   hand-written queries (seed_postgres.sql): any number per (seed_id, platform), one query_text each.
 CREATE TABLE IF NOT EXISTS public.search_queries (
   query_id        BIGSERIAL PRIMARY KEY,
   seed_id         BIGINT REFERENCES public.seeds_table(seed_id) ON DELETE CASCADE,
   platform        TEXT NOT NULL,        -- 'youtube', 'reddit', 'x', 'spotify', ...
-  query_text      TEXT NOT NULL,
+  query_text      TEXT,                 -- hand-written query; NULL for generated sets
+  precise         TEXT,                 -- generated set (query_generator.generate_queries_for_platform)
+  broad           TEXT,
+  hashtag_phrase  TEXT,
   gen_meta        JSONB DEFAULT '{}'::jsonb,  -- store prompt/version/weights
   created_at      TIMESTAMPTZ DEFAULT now(),
   UNIQUE (seed_id, platform, query_text)
 );
 
+-- existing databases: generated-set columns; query_text is only set on hand-written rows
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS precise TEXT;
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS broad TEXT;
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS hashtag_phrase TEXT;
+ALTER TABLE public.search_queries ALTER COLUMN query_text DROP NOT NULL;
+-- incremental generation state (pipelines/query_refresh.py)
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS generator_version TEXT;
+-- fetch state (pipelines/fetch.py): NULL/'pending' until fetched, then 'done' or 'error'
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS fetch_status TEXT;
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS fetch_error TEXT;
+ALTER TABLE public.search_queries ADD COLUMN IF NOT EXISTS fetched_at TIMESTAMPTZ;
+
 CREATE INDEX IF NOT EXISTS idx_queries_seed ON public.search_queries(seed_id);
+-- one generated set per (seed, platform): conflict target of the incremental upsert
+-- (db.upsert_generated_queries: ON CONFLICT (seed_id, platform) WHERE generator_version IS NOT NULL).
+-- Partial, so hand-written query_text rows are unaffected and re-running this file on existing
+-- data succeeds. Rows from generators older than content_hash / generator_version are not
+-- covered and never updated; remove them with
+--   DELETE FROM public.search_queries WHERE query_text IS NULL AND generator_version IS NULL;
+-- (on a busy table, build it as CREATE UNIQUE INDEX CONCURRENTLY outside a transaction)
+DROP INDEX IF EXISTS public.uq_queries_seed_platform;   -- earlier, non-partial version
+CREATE UNIQUE INDEX IF NOT EXISTS uq_generated_queries_seed_platform
+  ON public.search_queries(seed_id, platform) WHERE generator_version IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_queries_platform ON public.search_queries(platform);
 
 -- 3.3 (Optional) PREVIEWS table if you store previews in Postgres
+-- db.PostgresBackend addresses previews by `id` (keyset scans, score write-back). Tables
+-- created from an older version of this file have `preview_id` instead; rename it first:
+--   ALTER TABLE public.previews RENAME COLUMN preview_id TO id;
 CREATE TABLE IF NOT EXISTS public.previews (
-  preview_id      BIGSERIAL PRIMARY KEY,
+  id              BIGSERIAL PRIMARY KEY,
   seed_id         BIGINT REFERENCES public.seeds_table(seed_id) ON DELETE SET NULL,
   platform        TEXT NOT NULL,
   url             TEXT NOT NULL,
@@ -40,10 +73,36 @@ CREATE TABLE IF NOT EXISTS public.previews (
   published_at    TIMESTAMPTZ,
   raw_meta        JSONB DEFAULT '{}'::jsonb,
   score           DOUBLE PRECISION,     -- heuristic score (scoring.py)
+  decision        TEXT,                 -- 'keep' | 'consider' | 'reject'
+  signals         JSONB,                -- per-signal breakdown from scoring
   created_at      TIMESTAMPTZ DEFAULT now(),
   UNIQUE (platform, url)
 );
 
+-- existing databases: score write-back columns (db.PostgresBackend.save_preview_scores)
+ALTER TABLE public.previews ADD COLUMN IF NOT EXISTS decision TEXT;
+ALTER TABLE public.previews ADD COLUMN IF NOT EXISTS signals JSONB;
+
 CREATE INDEX IF NOT EXISTS idx_previews_platform ON public.previews(platform);
 CREATE INDEX IF NOT EXISTS idx_previews_seed ON public.previews(seed_id);
 CREATE INDEX IF NOT EXISTS idx_previews_score ON public.previews(score);
+-- keyset scan of unscored previews (list_unscored_previews)
+CREATE INDEX IF NOT EXISTS idx_previews_unscored ON public.previews(id) WHERE score IS NULL;
+CREATE INDEX IF NOT EXISTS idx_previews_unscored_seed
+  ON public.previews((COALESCE(seed_id, -1)), id) WHERE score IS NULL;
+
+-- 3.4 DERIVED SEED FEATURES (refreshed by cli/refresh_seed_features.py)
+CREATE TABLE IF NOT EXISTS public.seed_features (
+  seed_id         BIGINT PRIMARY KEY REFERENCES public.seeds_table(seed_id) ON DELETE CASCADE,
+  content_hash    TEXT NOT NULL,        -- sha1 of seed text fields (utils/hashing.py)
+  idf_version     TEXT,                 -- IdfModel.version the vector was built with
+  generator_version TEXT,               -- query_refresh.generator_version() of phrases / top_terms
+  vector          JSONB,                -- {"dim","indices","data"} IDF-weighted, l2-normalized
+  phrases         JSONB DEFAULT '[]'::jsonb,
+  top_terms       JSONB DEFAULT '[]'::jsonb,
+  hashtags        JSONB DEFAULT '[]'::jsonb,
+  updated_at      TIMESTAMPTZ DEFAULT now()
+);
+
+-- existing databases: rows without a generator_version are recomputed on the next refresh
+ALTER TABLE public.seed_features ADD COLUMN IF NOT EXISTS generator_version TEXT;
@@ -22,13 +22,23 @@ Common normalized preview schema (dict):
   },
   "raw": dict            # original raw object, for debugging/auditing
 }
+
+normalize_many(platform, raws) produces the same fields for a whole batch as a
+columnar PreviewBatch (date_epoch / engagement counts as float arrays), which
+score_many consumes directly.
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union
+import math
 import re
 from datetime import datetime, timezone
 
+import numpy as np
+
 HASHTAG_RE = re.compile(r"(?:^|[\s\(\)\[\]\{\}.,!?;:'\"/\\-])#([A-Za-z0-9_]{2,50})")
 
 def _iso(dt: Optional[datetime]) -> Optional[str]:
@@ -39,19 +49,9 @@ def _iso(dt: Optional[datetime]) -> Optional[str]:
     return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
 def _extract_hashtags(*texts: Optional[str]) -> List[str]:
-    tags = []
-    for t in texts:
-        if not t:
-            continue
-        tags.extend([m.lower() for m in HASHTAG_RE.findall(t)])
-    # dedupe preserving order
-    seen = set()
-    out = []
-    for x in tags:
-        if x not in seen:
-            seen.add(x)
-            out.append(x)
-    return out[:30]
+    # texts without '#' skip the regex; dict.fromkeys dedupes preserving order
+    tags = [m.lower() for t in texts if t and "#" in t for m in HASHTAG_RE.findall(t)]
+    return list(dict.fromkeys(tags))[:30]
 
 def _coalesce(*vals, default=None):
     for v in vals:
@@ -59,16 +59,38 @@ def _coalesce(*vals, default=None):
             return v
     return default
 
+_COUNT_KEYS = ("views", "likes", "comments")
+
+def engagement_count(v: Any) -> float:
+    # engagement count as a float, NaN when missing or not numeric (e.g. "1.2K"), like scoring._engagement_value
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return math.nan
+
 # --------------------------- Platform Normalizers -----------------------------
 
-def _normalize_youtube(raw: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Accepts the combined item shape produced by oie_search.apis.youtube.search_videos
-    which already merges search 'snippet' + 'statistics' + duration.
-    """
+# Field tuple shared by the per-record (dict) and the columnar (PreviewBatch) paths:
+# (url, title, snippet, author, date, date_epoch, hashtags, views, likes, comments, has_video, duration_sec)
+
+@lru_cache(maxsize=65536)
+def _parse_published(published_at: str) -> Tuple[Optional[str], float]:
+    """ISO string → (normalized ISO UTC, epoch seconds); unparseable strings pass through with NaN."""
+    try:
+        dt = datetime.fromisoformat(published_at.replace("Z","+00:00"))
+    except Exception:
+        return published_at, math.nan
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return _iso(dt), dt.timestamp()
+
+@lru_cache(maxsize=65536)
+def _parse_epoch(created_utc: float) -> Tuple[Optional[str], float]:
+    return _iso(datetime.fromtimestamp(created_utc, tz=timezone.utc)), float(created_utc)
+
+def _youtube_fields(raw: Dict[str, Any]) -> tuple:
     snippet = raw.get("snippet", {}) or {}
     stats = raw.get("statistics", {}) or {}
-    content = raw.get("contentDetails", {}) or {}
 
     video_id = _coalesce(raw.get("id"), raw.get("videoId"))
     url = f"https://www.youtube.com/watch?v={video_id}" if video_id else None
@@ -77,71 +99,84 @@ def _normalize_youtube(raw: Dict[str, Any]) -> Dict[str, Any]:
     author = _coalesce(raw.get("channelTitle"), snippet.get("channelTitle"))
     # Prefer publishedAt if present
     published_at = _coalesce(raw.get("publishedAt"), snippet.get("publishedAt"))
-    date = None
-    if published_at:
-        try:
-            date = _iso(datetime.fromisoformat(published_at.replace("Z","+00:00")))
-        except Exception:
-            date = published_at
-
-    # duration in ISO 8601 (PT#M#S). Keep seconds if provided by API client.
-    duration_sec = raw.get("durationSec")
-
-    hashtags = _extract_hashtags(title, desc)
-    engagement = {
-        "views": int(stats["viewCount"]) if "viewCount" in stats else None,
-        "likes": int(stats["likeCount"]) if "likeCount" in stats else None,
-        "comments": int(stats["commentCount"]) if "commentCount" in stats else None,
-    }
+    date, epoch = _parse_published(published_at) if published_at else (None, math.nan)
 
-    return {
-        "platform": "youtube",
-        "url": url,
-        "title": title,
-        "snippet": (desc or "")[:400],
-        "author": author,
-        "date": date,
-        "hashtags": hashtags,
-        "engagement": engagement,
-        "media": {"has_video": True, "duration_sec": duration_sec},
-        "raw": raw,
-    }
+    return (
+        url, title, (desc or "")[:400], author, date, epoch,
+        _extract_hashtags(title, desc),
+        int(stats["viewCount"]) if "viewCount" in stats else None,
+        int(stats["likeCount"]) if "likeCount" in stats else None,
+        int(stats["commentCount"]) if "commentCount" in stats else None,
+        # duration in ISO 8601 (PT#M#S). Keep seconds if provided by API client.
+        True, raw.get("durationSec"),
+    )
 
-def _normalize_reddit(raw: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Accepts Reddit items from either the public search.json or OAuth API (similar fields).
-    """
+def _reddit_fields(raw: Dict[str, Any]) -> tuple:
     data = raw.get("data", raw)  # support both 'child' and flattened dict
     url = _coalesce(data.get("url_overridden_by_dest"), f"https://www.reddit.com{data.get('permalink')}")
     title = data.get("title")
     selftext = data.get("selftext") or ""
-    author = data.get("author")
     created_utc = data.get("created_utc")
-    date = _iso(datetime.fromtimestamp(created_utc, tz=timezone.utc)) if created_utc else None
+    date, epoch = _parse_epoch(created_utc) if created_utc else (None, math.nan)
     num_comments = data.get("num_comments")
     score = data.get("score")  # upvotes minus downvotes (approx)
-    # Heuristic: likes ~ score if no better field is present
-    engagement = {
-        "views": None,  # not provided by API
-        "likes": int(score) if isinstance(score, (int, float)) else None,
-        "comments": int(num_comments) if isinstance(num_comments, (int, float)) else None,
-    }
-    snippet = _coalesce(selftext[:400], title)
-    hashtags = _extract_hashtags(title, selftext)
+    return (
+        url, title, _coalesce(selftext[:400], title), data.get("author"), date, epoch,
+        _extract_hashtags(title, selftext),
+        None,  # views: not provided by API
+        # Heuristic: likes ~ score if no better field is present
+        int(score) if isinstance(score, (int, float)) else None,
+        int(num_comments) if isinstance(num_comments, (int, float)) else None,
+        "media" in data or "is_video" in data and data.get("is_video"), None,
+    )
+
+def _generic_fields(raw: Dict[str, Any]) -> tuple:
+    # Generic passthrough with best-effort fields
+    title = raw.get("title") if isinstance(raw, dict) else None
+    body = raw.get("description") or raw.get("body") or raw.get("text") if isinstance(raw, dict) else None
+    url = raw.get("url") if isinstance(raw, dict) else None
+    author = raw.get("author") if isinstance(raw, dict) else None
+    return (url, title, (body or "")[:400], author, None, math.nan, _extract_hashtags(title, body),
+            None, None, None, None, None)
 
+def _as_dict(platform: str, f: tuple, raw: Dict[str, Any]) -> Dict[str, Any]:
+    url, title, snippet, author, date, _, hashtags, views, likes, comments, has_video, duration_sec = f
+    # reddit items carry no duration
+    media = {"has_video": has_video} if platform == "reddit" else {"has_video": has_video, "duration_sec": duration_sec}
     return {
-        "platform": "reddit",
+        "platform": platform,
         "url": url,
         "title": title,
         "snippet": snippet,
         "author": author,
         "date": date,
         "hashtags": hashtags,
-        "engagement": engagement,
-        "media": {"has_video": "media" in data or "is_video" in data and data.get("is_video")},
+        "engagement": {"views": views, "likes": likes, "comments": comments},
+        "media": media,
         "raw": raw,
     }
 
+def _normalize_youtube(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Accepts the combined item shape produced by oie_search.apis.youtube.search_videos
+    which already merges search 'snippet' + 'statistics' + duration.
+    """
+    return _as_dict("youtube", _youtube_fields(raw), raw)
+
+def _normalize_reddit(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Accepts Reddit items from either the public search.json or OAuth API (similar fields).
+    """
+    return _as_dict("reddit", _reddit_fields(raw), raw)
+
+def _fields_for(platform: str):
+    p = (platform or "").lower()
+    if p in ("youtube", "yt"):
+        return "youtube", _youtube_fields
+    if p == "reddit":
+        return "reddit", _reddit_fields
+    return p or "unknown", _generic_fields
+
 # ------------------------------ Public API -----------------------------------
 
 def normalize_preview(platform: str, raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -156,30 +191,108 @@ def normalize_preview(platform: str, raw: Dict[str, Any]) -> Dict[str, Any]:
     if isinstance(raw, dict) and "platform" in raw and "url" in raw and "title" in raw:
         return raw
 
-    p = (platform or "").lower()
-    if p in ("youtube", "yt"):
-        return _normalize_youtube(raw)
-    elif p == "reddit":
-        return _normalize_reddit(raw)
-    else:
-        # Generic passthrough with best-effort fields
-        title = raw.get("title") if isinstance(raw, dict) else None
-        body = raw.get("description") or raw.get("body") or raw.get("text") if isinstance(raw, dict) else None
-        url = raw.get("url") if isinstance(raw, dict) else None
-        author = raw.get("author") if isinstance(raw, dict) else None
-        hashtags = _extract_hashtags(title, body)
-        return {
-            "platform": p or "unknown",
-            "url": url,
-            "title": title,
-            "snippet": (body or "")[:400],
-            "author": author,
-            "date": None,
-            "hashtags": hashtags,
-            "engagement": {"views": None, "likes": None, "comments": None},
-            "media": {"has_video": None, "duration_sec": None},
-            "raw": raw,
-        }
+    p, fields = _fields_for(platform)
+    return _as_dict(p, fields(raw), raw)
+
+
+@dataclass
+class PreviewBatch:
+    """
+    Columnar normalized previews (normalize_many): parallel columns, one entry
+    per preview. date_epoch and the engagement columns are float arrays with
+    NaN where unknown; row(i) rebuilds the normalize_preview dict.
+    transcript_snippet and engagement_extra (engagement keys other than
+    views / likes / comments) are only set for already-normalized input that
+    carries them, so scoring sees the same text and engagement as the dict.
+    """
+    platform: List[str]
+    url: List[Optional[str]]
+    title: List[Optional[str]]
+    snippet: List[str]
+    author: List[Optional[str]]
+    date: List[Optional[str]]
+    date_epoch: np.ndarray
+    hashtags: List[List[str]]
+    views: np.ndarray
+    likes: np.ndarray
+    comments: np.ndarray
+    has_video: List[Optional[bool]]
+    duration_sec: List[Optional[int]]
+    raw: List[Dict[str, Any]]
+    transcript_snippet: List[Optional[str]]
+    engagement_extra: List[Optional[Dict[str, Any]]]
+
+    def __len__(self) -> int:
+        return len(self.url)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        def count(col):
+            v = col[i]
+            return None if math.isnan(v) else int(v)
+        f = (self.url[i], self.title[i], self.snippet[i], self.author[i], self.date[i], None, self.hashtags[i],
+             count(self.views), count(self.likes), count(self.comments), self.has_video[i], self.duration_sec[i])
+        out = _as_dict(self.platform[i], f, self.raw[i])
+        if self.engagement_extra[i]:
+            out["engagement"].update(self.engagement_extra[i])
+        if self.transcript_snippet[i] is not None:
+            out["transcript_snippet"] = self.transcript_snippet[i]
+        return out
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in range(len(self))]
+
+
+def normalize_many(platform: Union[str, Sequence[str]], raws: Iterable[Dict[str, Any]]) -> PreviewBatch:
+    """
+    Batch counterpart of normalize_preview: normalizes raw payloads into a
+    PreviewBatch (columns instead of one dict per preview). `platform` names
+    the platform of every payload, or is a sequence with one per payload.
+    Timestamp parsing is memoized across calls; already-normalized dicts are
+    taken as they are. score_many accepts the batch directly.
+    """
+    resolved = {}
+    rows: List[tuple] = []
+    platforms: List[str] = []
+    raw_col: List[Dict[str, Any]] = []
+    transcripts: List[Optional[str]] = []
+    extras: List[Optional[Dict[str, Any]]] = []
+    for plat, raw in zip(repeat(platform) if isinstance(platform, str) else platform, raws):
+        if plat not in resolved:
+            resolved[plat] = _fields_for(plat)
+        default_platform, fields = resolved[plat]
+        if raw is None:
+            raise ValueError("normalize_many received None")
+        if isinstance(raw, dict) and "platform" in raw and "url" in raw and "title" in raw:
+            eng = raw.get("engagement")
+            eng = eng if isinstance(eng, dict) else {}
+            media = raw.get("media") or {}
+            date = raw.get("date")
+            rows.append((raw.get("url"), raw.get("title"), raw.get("snippet"), raw.get("author"), date,
+                         _parse_published(date)[1] if isinstance(date, str) else math.nan, raw.get("hashtags") or [],
+                         *(engagement_count(eng.get(k)) for k in _COUNT_KEYS),
+                         media.get("has_video"), media.get("duration_sec")))
+            platforms.append(raw["platform"])
+            raw_col.append(raw.get("raw"))
+            transcripts.append(raw.get("transcript_snippet"))
+            extras.append({k: v for k, v in eng.items() if k not in _COUNT_KEYS} or None)
+        else:
+            rows.append(fields(raw))
+            platforms.append(default_platform)
+            raw_col.append(raw)
+            transcripts.append(None)
+            extras.append(None)
+    # transpose rows → columns in one pass
+    cols = [list(c) for c in zip(*rows)] if rows else [[] for _ in range(12)]
+
+    return PreviewBatch(
+        platform=platforms, url=cols[0], title=cols[1], snippet=cols[2], author=cols[3], date=cols[4],
+        date_epoch=np.array(cols[5], dtype=float), hashtags=cols[6],
+        # None → NaN
+        views=np.array(cols[7], dtype=float), likes=np.array(cols[8], dtype=float),
+        comments=np.array(cols[9], dtype=float),
+        has_video=cols[10], duration_sec=cols[11], raw=raw_col,
+        transcript_snippet=transcripts, engagement_extra=extras,
+    )
 
 def featurize_preview(seed: Dict[str, Any], normalized_preview: Dict[str, Any]) -> Dict[str, Any]:
     """
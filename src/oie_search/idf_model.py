@@ -0,0 +1,111 @@
+"""
+Corpus-wide IDF model for semantic scoring.
+
+Fitted offline (see cli/fit_idf.py) on a sample of seeds + previews and saved as
+a small directory:
+
+  <path>/vocab.txt   one term per line, line number = column index
+  <path>/idf.npy     float32 IDF weights, loaded with mmap_mode="r"
+  <path>/meta.json   {"version", "n_docs", "n_terms", "created_at", ...}
+
+Scoring loads it once and only calls transform(); the vectors match what a
+TfidfVectorizer (default tokenization, smooth idf, l2 norm) fitted on the same
+corpus would produce.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from .config import get_score
+
+VOCAB_FILE = "vocab.txt"
+IDF_FILE = "idf.npy"
+META_FILE = "meta.json"
+
+
+class IdfModel:
+    def __init__(self, vocabulary: Sequence[str], idf: np.ndarray, version: str, meta: Optional[dict] = None):
+        if len(vocabulary) != len(idf):
+            raise ValueError(f"vocabulary ({len(vocabulary)}) and idf ({len(idf)}) lengths differ")
+        self.vocabulary = list(vocabulary)
+        self.idf = idf
+        self.version = version
+        self.meta = meta or {}
+        self._counter = CountVectorizer(vocabulary=self.vocabulary, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, texts: Iterable[str], max_features: Optional[int] = 50_000, min_df: int = 2) -> "IdfModel":
+        docs = [t or "" for t in texts]
+        vect = TfidfVectorizer(max_features=max_features, min_df=min_df, dtype=np.float32).fit(docs)
+        vocab = vect.get_feature_names_out().tolist()
+        idf = vect.idf_.astype(np.float32)
+        digest = hashlib.sha1("\n".join(vocab).encode("utf-8") + idf.tobytes()).hexdigest()[:12]
+        meta = {
+            "version": digest,
+            "n_docs": len(docs),
+            "n_terms": len(vocab),
+            "max_features": max_features,
+            "min_df": min_df,
+            "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+        return cls(vocab, idf, digest, meta)
+
+    def transform(self, texts: Sequence[str]):
+        """Return an l2-normalized sparse TF-IDF matrix (one row per text)."""
+        X = self._counter.transform([t or "" for t in texts]).tocsr()
+        X.data *= self.idf[X.indices]
+        return normalize(X, norm="l2", copy=False)
+
+    def save(self, path: str) -> None:
+        out = Path(path)
+        out.mkdir(parents=True, exist_ok=True)
+        with open(out / VOCAB_FILE, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.vocabulary))
+        np.save(out / IDF_FILE, np.asarray(self.idf, dtype=np.float32))
+        with open(out / META_FILE, "w", encoding="utf-8") as f:
+            json.dump({**self.meta, "version": self.version}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IdfModel":
+        src = Path(path)
+        with open(src / META_FILE, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(src / VOCAB_FILE, encoding="utf-8") as f:
+            vocab: List[str] = f.read().split("\n")
+        idf = np.load(src / IDF_FILE, mmap_mode="r" if mmap else None)
+        return cls(vocab, idf, meta["version"], meta)
+
+
+def vector_to_json(row) -> Dict[str, Any]:
+    """Serialize a 1×V sparse row (e.g. a seed vector) for JSONB / BSON storage."""
+    row = row.tocsr()
+    return {"dim": int(row.shape[1]), "indices": row.indices.tolist(), "data": row.data.tolist()}
+
+def vector_from_json(obj: Dict[str, Any]):
+    """Inverse of vector_to_json."""
+    indices = np.asarray(obj["indices"], dtype=np.int32)
+    data = np.asarray(obj["data"], dtype=np.float32)
+    return sp.csr_matrix((data, indices, np.array([0, len(indices)])), shape=(1, obj["dim"]))
+
+
+@lru_cache(maxsize=1)
+def load_default_idf_model() -> Optional[IdfModel]:
+    """
+    Load the model configured by $IDF_MODEL_PATH (or [scoring] IDF_MODEL_PATH in the ini)
+    once per process. Returns None when no model is configured.
+    """
+    path = os.getenv("IDF_MODEL_PATH") or get_score("IDF_MODEL_PATH")
+    if not path:
+        return None
+    return IdfModel.load(path)
@@ -0,0 +1,89 @@
+"""
+Multi-pattern substring matcher for lexical scoring.
+
+Built once per seed from its important phrases plus scoring.MEDIA_KEYWORDS and
+cached with the seed features; find() reports every pattern that occurs in a
+(lowercased) text, including overlapping and nested ones.
+
+Large pattern sets are compiled into an Aho-Corasick automaton (one pass over
+the text, cost independent of the number of patterns). Below AC_MIN_PATTERNS
+a per-pattern `in` scan is used instead: each scan runs in C, and on preview-
+sized texts that beats a Python-level automaton walk until a few hundred
+patterns. Both paths return the same ids.
+"""
+
+from __future__ import annotations
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List
+
+AC_MIN_PATTERNS = 256
+
+
+class PhraseMatcher:
+    def __init__(self, patterns: Iterable[str], ac_min_patterns: int = AC_MIN_PATTERNS):
+        self.patterns: List[str] = []
+        index: Dict[str, int] = {}
+        for p in patterns:
+            if p and p not in index:
+                index[p] = len(self.patterns)
+                self.patterns.append(p)
+        self._index = index
+        self.use_automaton = len(self.patterns) >= ac_min_patterns
+        if self.use_automaton:
+            self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        # goto[state] = {char: next_state}; out[state] = pattern ids ending here
+        goto: List[Dict[str, int]] = [{}]
+        out: List[FrozenSet[int]] = [frozenset()]
+        for pid, p in enumerate(self.patterns):
+            state = 0
+            for ch in p:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(frozenset())
+                state = nxt
+            out[state] = out[state] | {pid}
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                if state:
+                    f = fail[state]
+                    while f and ch not in goto[f]:
+                        f = fail[f]
+                    fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] | out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def pattern_id(self, pattern: str) -> int:
+        return self._index[pattern]
+
+    def find(self, text: str) -> FrozenSet[int]:
+        """Ids of all patterns occurring in `text` (case-sensitive; pass lowercased text)."""
+        if not self.patterns or not text:
+            return frozenset()
+        if not self.use_automaton:
+            return frozenset(i for i, p in enumerate(self.patterns) if p in text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return frozenset(found)
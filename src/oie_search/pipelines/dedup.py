@@ -0,0 +1,264 @@
+"""
+Near-duplicate detection between normalize_preview and scoring.
+
+The same content reaches us many times (query variants, YouTube ↔ Reddit
+cross-posts, youtu.be vs youtube.com, Reddit link vs permalink). Each
+normalized preview gets
+  - canonical_url(url): one URL per video / post / page
+  - simhash(title + snippet): 64-bit SimHash over word unigrams + bigrams
+and is looked up per seed_key(seed_id, seed, idf version) in a persistent
+DedupIndex (SQLite): an equal canonical URL, or a fingerprint within
+DEDUP_MAX_DISTANCE bits, makes it a duplicate that inherits the stored score
+instead of being rescored. Scores are relative to the seed text and the IDF
+model, so the key carries both: editing a seed or rebuilding the model starts
+a fresh namespace instead of inheriting stale scores. Fingerprints are split into four 16-bit bands, so
+any match within 3 bits shares at least one band and is found by an indexed
+lookup.
+
+split_batch() applies this to one scoring batch (duplicates inside the batch
+follow the first copy); DedupStats counts the dedup rate per run.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from oie_search.utils.hashing import seed_content_hash
+
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+MIN_TOKENS = 4              # shorter texts only dedupe by URL (too few features for SimHash)
+BANDS = 4
+BAND_BITS = 64 // BANDS
+
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "si", "feature", "ref", "ref_source", "share_id"})
+_YT_ID = re.compile(r"^[\w-]{11}$")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """One URL per piece of content: YouTube video ids and Reddit post ids are normalized, tracking params dropped."""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    segs = [s for s in path.split("/") if s]
+    query = dict(parse_qsl(parts.query))
+
+    if host == "youtu.be" and segs:
+        vid = segs[0]
+    elif host.endswith("youtube.com"):
+        vid = query.get("v") or (segs[1] if len(segs) > 1 and segs[0] in ("shorts", "embed", "live", "v") else None)
+    else:
+        vid = None
+    if vid and _YT_ID.match(vid):
+        return f"https://www.youtube.com/watch?v={vid}"
+
+    if host == "redd.it" and segs:
+        return f"https://www.reddit.com/comments/{segs[0]}"
+    if host.endswith("reddit.com") and "comments" in segs:
+        i = segs.index("comments")
+        if i + 1 < len(segs):
+            return f"https://www.reddit.com/comments/{segs[i + 1]}"
+
+    kept = sorted((k, v) for k, v in query.items()
+                  if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_"))
+    return f"https://{host}{path}" + (f"?{urlencode(kept)}" if kept else "")
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash over word unigrams + bigrams (count-weighted); None for texts under MIN_TOKENS words."""
+    tokens = _TOKEN.findall((text or "").lower())
+    if len(tokens) < MIN_TOKENS:
+        return None
+    features = Counter(tokens)
+    features.update(" ".join(pair) for pair in zip(tokens, tokens[1:]))
+    acc = [0] * 64
+    for feature, weight in features.items():
+        h = _hash64(feature)
+        for bit in range(64):
+            acc[bit] += weight if (h >> bit) & 1 else -weight
+    return sum(1 << bit for bit in range(64) if acc[bit] > 0)
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def fingerprint(preview: Dict[str, Any]) -> Tuple[Optional[str], Optional[int]]:
+    """(canonical url, SimHash of title + snippet) of a normalized preview."""
+    text = f"{preview.get('title') or ''} {preview.get('snippet') or ''}"
+    return canonical_url(preview.get("url")), simhash(text)
+
+def _signed(fp: int) -> int:
+    # SQLite integers are signed 64-bit
+    return fp - (1 << 64) if fp >= 1 << 63 else fp
+
+def _bands(fp: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(fp >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+class DedupStats:
+    """Thread-safe per-run dedup counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.url_dupes = 0
+        self.near_dupes = 0
+
+    def add(self, checked: int = 0, url_dupes: int = 0, near_dupes: int = 0) -> None:
+        with self._lock:
+            self.checked += checked
+            self.url_dupes += url_dupes
+            self.near_dupes += near_dupes
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            dupes = self.url_dupes + self.near_dupes
+            return {
+                "checked": self.checked,
+                "url_dupes": self.url_dupes,
+                "near_dupes": self.near_dupes,
+                "dedup_rate": round(dupes / self.checked, 3) if self.checked else 0.0,
+            }
+
+
+class DedupIndex:
+    """Persistent (SQLite) per-seed index of scored previews by canonical URL and SimHash bands."""
+
+    def __init__(self, path: str, max_distance: int = DEDUP_MAX_DISTANCE):
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be < {BANDS} for banded lookup")
+        self.path = path
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS fingerprints (
+                 seed_key TEXT NOT NULL,
+                 canonical_url TEXT,
+                 simhash INTEGER,
+                 b0 INTEGER, b1 INTEGER, b2 INTEGER, b3 INTEGER,
+                 preview_id TEXT,
+                 score REAL,
+                 decision TEXT,
+                 signals TEXT)"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fp_url ON fingerprints(seed_key, canonical_url)")
+        for i in range(BANDS):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_fp_b{i} ON fingerprints(seed_key, b{i})")
+        self._conn.commit()
+
+    @staticmethod
+    def _entry(row) -> Dict[str, Any]:
+        return {"preview_id": row[0], "score": row[1], "decision": row[2], "signals": json.loads(row[3] or "{}")}
+
+    def find(self, seed_key: str, url: Optional[str], fp: Optional[int]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """("url" | "near", stored entry) for a duplicate already in the index, else (None, None)."""
+        cols = "preview_id, score, decision, signals"
+        with self._lock:
+            if url:
+                row = self._conn.execute(
+                    f"SELECT {cols} FROM fingerprints WHERE seed_key=? AND canonical_url=? LIMIT 1", (seed_key, url)
+                ).fetchone()
+                if row:
+                    return "url", self._entry(row)
+            if fp is not None:
+                where = " OR ".join(f"b{i}=?" for i in range(BANDS))
+                for row in self._conn.execute(
+                    f"SELECT simhash, {cols} FROM fingerprints WHERE seed_key=? AND ({where})",
+                    (seed_key, *_bands(fp)),
+                ):
+                    if hamming(fp, row[0] & ((1 << 64) - 1)) <= self.max_distance:
+                        return "near", self._entry(row[1:])
+        return None, None
+
+    def add_many(self, entries: Sequence[Tuple[str, Optional[str], Optional[int], Any, Dict[str, Any]]]) -> None:
+        """Index scored previews: (seed_key, canonical url, simhash, preview id, score result)."""
+        rows = []
+        for seed_key, url, fp, preview_id, scored in entries:
+            bands = _bands(fp) if fp is not None else [None] * BANDS
+            rows.append((seed_key, url, _signed(fp) if fp is not None else None, *bands, str(preview_id),
+                         float(scored["score"]), scored["decision"], json.dumps(scored.get("signals", {}), default=str)))
+        with self._lock:
+            self._conn.executemany("INSERT INTO fingerprints VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def seed_key(seed_id: Any, seed: Dict[str, Any], idf_version: Optional[str]) -> Optional[str]:
+    """Index namespace for previews of one seed version under one IDF model (None without a seed id)."""
+    if seed_id is None:
+        return None
+    return f"{seed_id}:{seed_content_hash(seed)}:{idf_version or 'pair'}"
+
+
+def split_batch(
+    index: DedupIndex,
+    seed_keys: Sequence[Optional[str]],
+    previews: Sequence[Dict[str, Any]],
+    stats: Optional[DedupStats] = None,
+) -> Tuple[List[int], Dict[int, Dict[str, Any]], Dict[int, int], Dict[int, Tuple[str, Optional[str], Optional[int]]]]:
+    """
+    Plan one batch of normalized previews (seed_keys[i] is the seed_key() of previews[i]).
+    Returns (positions to score, {pos: inherited index entry}, {pos: position of
+    the first copy in this batch}, {pos: (seed key, url, simhash)} to index once
+    scored). Previews without a seed key are always scored and never indexed.
+    """
+    fresh: List[int] = []
+    inherited: Dict[int, Dict[str, Any]] = {}
+    followers: Dict[int, int] = {}
+    to_index: Dict[int, Tuple[str, Optional[str], Optional[int]]] = {}
+    by_url: Dict[Tuple[str, str], int] = {}
+    by_band: Dict[Tuple[str, int, int], List[Tuple[int, int]]] = {}
+    url_dupes = near_dupes = 0
+
+    for pos, (key, pv) in enumerate(zip(seed_keys, previews)):
+        if key is None:
+            fresh.append(pos)
+            continue
+        url, fp = fingerprint(pv)
+        kind, entry = index.find(key, url, fp)
+        if entry is not None:
+            inherited[pos] = entry
+        else:
+            # duplicates of an earlier, not yet indexed copy in this batch
+            first: Optional[int] = by_url.get((key, url)) if url else None
+            kind = "url" if first is not None else None
+            if first is None and fp is not None:
+                for i, band in enumerate(_bands(fp)):
+                    for other_pos, other_fp in by_band.get((key, i, band), ()):
+                        if hamming(fp, other_fp) <= index.max_distance:
+                            first, kind = other_pos, "near"
+                            break
+                    if first is not None:
+                        break
+            if first is not None:
+                followers[pos] = first
+            else:
+                fresh.append(pos)
+                to_index[pos] = (key, url, fp)
+                if url:
+                    by_url[(key, url)] = pos
+                if fp is not None:
+                    for i, band in enumerate(_bands(fp)):
+                        by_band.setdefault((key, i, band), []).append((pos, fp))
+        url_dupes += kind == "url"
+        near_dupes += kind == "near"
+
+    if stats is not None:
+        stats.add(checked=len(previews), url_dupes=url_dupes, near_dupes=near_dupes)
+    return fresh, inherited, followers, to_index
@@ -0,0 +1,184 @@
+"""
+Concurrent fetch engine: search_queries rows → platform APIs → previews.
+
+run_fetch(db) reads pending query rows (backend.list_pending_queries), runs
+each row's precise / broad / hashtag queries against its platform on a thread
+pool, writes the normalized previews (backend.save_previews) and records the
+row's fetch status ('done' or 'error'), so an interrupted run resumes with the
+rows still pending.
+
+Per platform, a TokenBucket bounds the request rate (one token per API page
+request, so a query paging past one page pays for each page) and a semaphore caps in-flight rows, so total wall time is set
+by the API limits rather than by serial request latency. Limits come from
+PLATFORM_LIMITS, overridable via FETCH_<PLATFORM>_RATE / _BURST / _CONCURRENCY.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from oie_search.apis import reddit, youtube
+from oie_search.digestors import normalize_preview
+
+# platform -> (requests/sec, burst, concurrent rows)
+PLATFORM_LIMITS = {
+    "youtube": (5.0, 10, 8),
+    "reddit": (1.0, 5, 4),     # ~60 requests/min
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/sec, at most `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+        self.waited_s = 0.0
+
+    def acquire(self, n: float = 1.0) -> float:
+        """Take `n` tokens, sleeping until they are available. Returns the time waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    self.waited_s += waited
+                    return waited
+                delay = (n - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+def platform_limits(platform: str):
+    rate, burst, concurrency = PLATFORM_LIMITS.get(platform, (1.0, 1, 1))
+    key = platform.upper().replace(" ", "_")
+    return (
+        float(os.getenv(f"FETCH_{key}_RATE", rate)),
+        float(os.getenv(f"FETCH_{key}_BURST", burst)),
+        int(os.getenv(f"FETCH_{key}_CONCURRENCY", concurrency)),
+    )
+
+def query_strings(row: Dict[str, Any]) -> List[str]:
+    """The distinct non-empty query strings of one search_queries row (generated set or hand-written query_text)."""
+    out = []
+    for field in ("precise", "broad", "hashtag_phrase", "query_text"):
+        q = (row.get(field) or "").strip()
+        if q and q not in out:
+            out.append(q)
+    return out
+
+def _fetch_youtube(queries: Sequence[str], max_results: int, acquire: Callable[[], Any]):
+    # one coalesced run: ids shared by the queries are enriched once
+    return list(youtube.iter_videos(queries, max_results=max_results, acquire=acquire))
+
+def _fetch_reddit(queries: Sequence[str], max_results: int, acquire: Callable[[], Any]):
+    raws, seen = [], set()
+    for q in queries:
+        for child in reddit.iter_posts(q, sort="relevance", max_results=max_results, acquire=acquire):
+            key = (child.get("data") or {}).get("id")
+            if key not in seen:
+                seen.add(key)
+                raws.append(child)
+    return raws
+
+FETCHERS: Dict[str, Callable[[Sequence[str], int, Callable[[], Any]], List[Dict[str, Any]]]] = {
+    "youtube": _fetch_youtube,
+    "reddit": _fetch_reddit,
+}
+
+def preview_row(query_row: Dict[str, Any], raw: Dict[str, Any]) -> Dict[str, Any]:
+    pv = normalize_preview(query_row["platform"], raw)
+    return {
+        "seed_id": query_row.get("seed_id"),
+        "platform": pv["platform"],
+        "url": pv["url"],
+        "title": pv.get("title"),
+        "snippet": pv.get("snippet"),
+        "author": pv.get("author"),
+        "published_at": pv.get("date"),
+        "raw": raw,
+    }
+
+def _interleave(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # round-robin across platforms so one platform's capped rows don't occupy every pool thread
+    by_platform: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_platform.setdefault(row["platform"], []).append(row)
+    out = []
+    queues = list(by_platform.values())
+    for i in range(max((len(q) for q in queues), default=0)):
+        out.extend(q[i] for q in queues if i < len(q))
+    return out
+
+def run_fetch(
+    db,
+    platforms: Optional[Iterable[str]] = None,
+    limit: Optional[int] = None,
+    max_results: int = 50,
+    retry_errors: bool = False,
+    fetchers: Optional[Dict[str, Callable]] = None,
+    log=None,
+) -> Dict[str, Any]:
+    """
+    Fetch every pending query row (up to `limit`) for `platforms` (default: all
+    platforms with a fetcher). Returns counts: rows done / error, previews
+    fetched / inserted / skipped (already stored), and per-platform rate-limit
+    wait time.
+    """
+    fetchers = fetchers or FETCHERS
+    platforms = [p for p in (platforms or fetchers) if p in fetchers]
+    rows = db.list_pending_queries(platforms=platforms, limit=limit, retry_errors=retry_errors)
+
+    buckets, slots, workers = {}, {}, 0
+    for p in platforms:
+        rate, burst, concurrency = platform_limits(p)
+        buckets[p] = TokenBucket(rate, burst)
+        slots[p] = threading.BoundedSemaphore(concurrency)
+        workers += concurrency
+
+    counts = {"rows": len(rows), "done": 0, "error": 0, "fetched": 0, "inserted": 0, "skipped": 0}
+    lock = threading.Lock()
+
+    def fetch_row(row):
+        platform = row["platform"]
+        qid = row.get("query_id", row.get("_id"))   # Postgres primary key / Mongo _id
+        with slots[platform]:
+            try:
+                raws = fetchers[platform](query_strings(row), max_results, buckets[platform].acquire)
+                previews = [preview_row(row, raw) for raw in raws]
+                saved = db.save_previews(previews) if previews else {"inserted": 0, "skipped": 0}
+                db.mark_query_status(qid, "done")
+            except Exception as e:
+                if log:
+                    log.warning(f"Fetch failed for query {qid} ({platform}): {e}")
+                try:
+                    db.mark_query_status(qid, "error", str(e)[:500])
+                except Exception as mark_err:
+                    # the row stays pending and is retried on the next run
+                    if log:
+                        log.error(f"Could not record the fetch error of query {qid}: {mark_err}")
+                with lock:
+                    counts["error"] += 1
+                return
+        with lock:
+            counts["done"] += 1
+            counts["fetched"] += len(previews)
+            counts["inserted"] += saved.get("inserted", 0)
+            counts["skipped"] += saved.get("skipped", 0)
+
+    if rows:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+            list(ex.map(fetch_row, _interleave(rows)))
+    counts["rate_wait_s"] = {p: round(b.waited_s, 3) for p, b in buckets.items()}
+    return counts
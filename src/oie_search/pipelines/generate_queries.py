@@ -1,18 +1,77 @@
 import os
+from typing import Any, Dict, List, Optional, Sequence
+
+from oie_search.config import PLATFORMS_PRIORITY
 from oie_search.db.postgres_runner import generate_queries_postgres
 from oie_search.db.mongo_runner import generate_queries_mongo
+from oie_search.pipelines.query_refresh import build_query_rows, generator_version, is_current
+from oie_search.utils.hashing import seed_content_hash
+
+def generate_queries_for_seed(seed: Dict[str, Any], platforms: Sequence[str] = PLATFORMS_PRIORITY,
+                              features: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Query rows for every platform in `platforms`, rendered from one
+    SeedTextFeatures (the seed text is tokenized once, not once per platform)
+    and stamped with the seed's content hash and generator version.
+    """
+    seed_id = seed.get("seed_id", seed.get("_id"))
+    return build_query_rows(seed, seed_id, seed_content_hash(seed), generator_version(),
+                            features=features, platforms=platforms)
+
+def refresh_generated_queries(db, platforms: Sequence[str] = PLATFORMS_PRIORITY, limit: Optional[int] = None,
+                              batch_size: int = 200, force: bool = False, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Incremental generation through a db backend (cli/gen_queries.py): seeds
+    whose stored query sets already match their content hash and generator
+    version for every platform are skipped (force=True regenerates all); the
+    rest are upserted with backend.save_generated_queries (not with dry_run).
+    Returns counts of seeds checked / regenerated / unchanged and queries written.
+    """
+    counts = {"checked": 0, "regenerated": 0, "unchanged": 0, "queries": 0}
+    version = generator_version()
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        ids = [seed.get("seed_id", seed.get("_id")) for seed in batch]
+        existing = {} if force else db.get_query_state(ids)
+        rows = []
+        for seed_id, seed in zip(ids, batch):
+            h = seed_content_hash(seed)
+            counts["checked"] += 1
+            if is_current(existing.get(seed_id, []), h, version, platforms=platforms):
+                counts["unchanged"] += 1
+                continue
+            rows.extend(build_query_rows(seed, seed_id, h, version, platforms=platforms))
+            counts["regenerated"] += 1
+        if rows and not dry_run:
+            db.save_generated_queries(rows)
+        counts["queries"] += len(rows)
+        batch.clear()
+
+    for seed in db.list_seeds(limit=limit):
+        batch.append(seed)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return counts
 
 def main():
     target = os.getenv("QUERY_BACKEND", "postgres")  # "postgres" or "mongo"
+    counts = {}
+    limit = int(os.getenv("QUERY_LIMIT", "100")) or None  # 0 = every seed (incremental, so cheap to re-run)
+    force = os.getenv("QUERY_FORCE", "").lower() in ("1", "true", "yes")
     if target == "postgres":
-        out = generate_queries_postgres(limit=int(os.getenv("QUERY_LIMIT", "100")))
+        out = generate_queries_postgres(limit=limit, force=force, counts=counts)
     else:
         out = generate_queries_mongo(
             seeds_collection=os.getenv("MONGO_SEEDS_COLLECTION", "seeds"),
             out_collection=os.getenv("MONGO_OUT_COLLECTION", "search_queries"),
-            limit=int(os.getenv("QUERY_LIMIT", "100"))
+            limit=limit,
+            force=force,
+            counts=counts,
         )
-    print(f"Generated {len(out)} queries.")
+    print(f"Generated {len(out)} queries. Counts: {counts}")
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,13 @@
 import json
 from typing import Dict, Any, List
 from oie_search.digestors import normalize_preview
-from oie_search.scoring import score_preview
+from oie_search.scoring import score_many
 
 def process_previews(platform: str, seed: Dict[str, Any], raw_previews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # seed should include: title, description, transcript, metadata.hashtags, important_phrases (list)
+    normalized = [normalize_preview(platform, raw) for raw in raw_previews]
     results = []
-    for raw in raw_previews:
-        pv = normalize_preview(platform, raw)
-        scored = score_preview(seed, pv)
+    for pv, scored in zip(normalized, score_many(seed, normalized)):
         results.append({
             "platform": platform,
             "url": pv.get("url"),
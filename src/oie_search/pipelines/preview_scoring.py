@@ -0,0 +1,111 @@
+"""
+Seed-grouped batch scoring for cli/score_previews.py.
+
+A backend batch is split into chunks of records that share a seed; each chunk
+is normalized into one columnar PreviewBatch (digestors.normalize_many) and
+scored with one score_many call. Chunks run either in the
+calling process (with the caller's seed cache and IDF model) or on a process
+pool, where every worker keeps its own SeedFeatureCache and loads the IDF model
+once (init_worker). Results are merged back in batch order.
+"""
+
+from concurrent.futures import Executor
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from oie_search.digestors import PreviewBatch, normalize_many, normalize_preview
+from oie_search.idf_model import IdfModel, load_default_idf_model
+from oie_search.scoring import CascadeStats, get_seed_features, score_many
+from oie_search.seed_cache import SeedFeatureCache
+
+# (seed, stored seed-features row or None, records, cascade, keep_previews, records already normalized)
+Payload = Tuple[Dict[str, Any], Optional[Dict[str, Any]], List[Dict[str, Any]], bool, bool, bool]
+
+_worker_cache: Optional[SeedFeatureCache] = None
+
+
+def normalize_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a single preview record:
+      - use rec["raw"] (Mongo) or rec["raw_meta"] (Postgres) if present, else treat rec as already-flat
+      - platform = rec["platform"] or "unknown"
+    """
+    platform = (rec.get("platform") or "unknown").lower()
+    raw = rec.get("raw") or rec.get("raw_meta") or rec
+    return normalize_preview(platform, raw)
+
+def normalize_records(records: Sequence[Dict[str, Any]]) -> PreviewBatch:
+    """Columnar normalize_record over a chunk (digestors.normalize_many)."""
+    return normalize_many(
+        [(rec.get("platform") or "unknown").lower() for rec in records],
+        [rec.get("raw") or rec.get("raw_meta") or rec for rec in records],
+    )
+
+def score_payload(payload: Payload, cache: Optional[SeedFeatureCache] = None,
+                  model: Optional[IdfModel] = None) -> Tuple[List[Dict[str, Any]], Optional[List[Dict[str, Any]]], Dict[str, int]]:
+    """Normalize + score one seed chunk. Returns (results, normalized previews or None, cascade counts)."""
+    seed, stored, records, cascade, keep_previews, normalized = payload
+    if stored is not None:
+        get_seed_features(seed, model, cache, stored=stored)
+    # normalized dicts pass through normalize_many as they are
+    previews = normalize_many([p["platform"] for p in records], records) if normalized else normalize_records(records)
+    stats = CascadeStats()
+    results = score_many(seed, previews, model=model, cache=cache, cascade=cascade, stats=stats)
+    return results, (previews.to_dicts() if keep_previews else None), stats.as_dict()
+
+def init_worker(cache_bytes: int) -> None:
+    """ProcessPoolExecutor initializer: per-worker seed cache + IDF model."""
+    global _worker_cache
+    _worker_cache = SeedFeatureCache(max_bytes=cache_bytes)
+    load_default_idf_model()
+
+def _score_payload_in_worker(payload: Payload):
+    return score_payload(payload, _worker_cache, load_default_idf_model())
+
+def score_batch(
+    batch: Sequence[Dict[str, Any]],
+    seed_keys: Sequence[Hashable],
+    seeds: Dict[Hashable, Dict[str, Any]],
+    stored: Optional[Dict[Hashable, Dict[str, Any]]] = None,
+    cache: Optional[SeedFeatureCache] = None,
+    model: Optional[IdfModel] = None,
+    cascade: bool = False,
+    stats: Optional[CascadeStats] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 500,
+    keep_previews: bool = True,
+    normalized: Optional[Sequence[Dict[str, Any]]] = None,
+) -> List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """
+    Score a batch of preview records. seed_keys[i] names the seed of batch[i]
+    in `seeds`; `stored` optionally maps seed keys to seed-features rows.
+    `normalized` (normalize_record output aligned with `batch`, e.g. from
+    dedup fingerprinting) is scored instead of normalizing the records again.
+    Returns [(score result, normalized preview or None)] aligned with `batch`.
+    """
+    positions: Dict[Hashable, List[int]] = {}
+    for pos, key in enumerate(seed_keys):
+        positions.setdefault(key, []).append(pos)
+
+    chunks: List[Tuple[Hashable, List[int]]] = []
+    for key, pos_list in positions.items():
+        for i in range(0, len(pos_list), chunk_size):
+            chunks.append((key, pos_list[i:i + chunk_size]))
+    stored = stored or {}
+    source = batch if normalized is None else normalized
+    payloads = [
+        (seeds[key], stored.get(key), [source[p] for p in pos_list], cascade, keep_previews, normalized is not None)
+        for key, pos_list in chunks
+    ]
+
+    if executor is not None:
+        outputs = executor.map(_score_payload_in_worker, payloads)
+    else:
+        outputs = (score_payload(p, cache, model) for p in payloads)
+
+    merged: List[Any] = [None] * len(batch)
+    for (key, pos_list), (results, previews, counts) in zip(chunks, outputs):
+        if stats is not None and cascade:
+            stats.add(**counts)
+        for i, pos in enumerate(pos_list):
+            merged[pos] = (results[i], previews[i] if previews is not None else None)
+    return merged
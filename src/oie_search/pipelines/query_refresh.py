@@ -0,0 +1,53 @@
+"""
+Incremental query generation: only new or changed seeds get new queries.
+
+Every generated query row records the seed's content_hash
+(utils/hashing.seed_content_hash) and the generator_version(). A seed's query
+set is current when each platform has a row with the seed's present hash and
+version; the runners (db/postgres_runner.py, db/mongo_runner.py) skip those
+seeds and upsert rows for the rest, keyed by (seed_id, platform), so re-runs
+are idempotent.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from oie_search.config import DEFAULT_QCFG, PLATFORMS_PRIORITY, QueryGenConfig
+from oie_search.query_generator import GENERATOR_VERSION, MAX_FIELD_CHARS, SeedTextFeatures, render_queries
+
+
+def generator_version(config: QueryGenConfig = DEFAULT_QCFG, max_field_chars: int = MAX_FIELD_CHARS) -> str:
+    """GENERATOR_VERSION plus a short hash of the generation config and the field cap (QUERY_MAX_FIELD_CHARS)."""
+    cfg = json.dumps({**config.model_dump(), "max_field_chars": max_field_chars}, sort_keys=True)
+    return f"{GENERATOR_VERSION}-{hashlib.sha1(cfg.encode('utf-8')).hexdigest()[:8]}"
+
+def is_current(rows: Iterable[Dict[str, Any]], content_hash: str, version: str,
+               platforms: Sequence[str] = PLATFORMS_PRIORITY) -> bool:
+    """True if the stored rows of one seed cover every platform at this hash and version."""
+    have = {
+        r.get("platform") for r in rows
+        if r.get("content_hash") == content_hash and r.get("generator_version") == version
+    }
+    return have.issuperset(platforms)
+
+def build_query_rows(seed: Dict[str, Any], seed_id: Any, content_hash: str, version: str,
+                     features: Optional[Dict[str, Any]] = None,
+                     platforms: Sequence[str] = PLATFORMS_PRIORITY) -> List[Dict[str, Any]]:
+    """One row per platform, stamped with content_hash and generator_version."""
+    # seed text is normalized / tokenized once, then rendered per platform
+    tf = SeedTextFeatures.from_seed(seed, features)
+    config = {"include_author": DEFAULT_QCFG.include_author}
+    rows = []
+    for platform in platforms:
+        qset = render_queries(tf, platform, config)
+        rows.append({
+            "seed_id": seed_id,
+            "platform": platform,
+            "precise": qset["precise"],
+            "broad": qset["broad"],
+            "hashtag_phrase": qset["hashtag_phrase"],
+            "content_hash": content_hash,
+            "generator_version": version,
+        })
+    return rows
@@ -0,0 +1,85 @@
+"""
+Derived seed-features store: compute once, share across scoring hosts.
+
+Each row (Postgres `seed_features` / Mongo `seed_features`) holds, per seed:
+  seed_id, content_hash, idf_version,
+  generator_version  query_refresh.generator_version() the phrases / top terms were built with
+  vector     IDF-weighted seed vector (idf_model.vector_to_json), None without a model
+  phrases    query_generator.SeedTextFeatures phrases (build_phrase_candidates)
+  top_terms  query_generator.SeedTextFeatures top_terms (top_k_terms, k=10)
+  hashtags   metadata.hashtags
+
+refresh_seed_features() only recomputes rows whose content hash, idf version
+or generator version changed; scoring (scoring.build_seed_features) and query generation
+(generate_queries_for_platform(features=...)) reuse fresh rows.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from oie_search.idf_model import IdfModel, vector_to_json
+from oie_search.pipelines.query_refresh import generator_version
+from oie_search.query_generator import SeedTextFeatures
+from oie_search.scoring import build_seed_features
+from oie_search.utils.hashing import seed_content_hash
+
+
+def seed_key(seed: Dict[str, Any]):
+    return seed.get("seed_id", seed.get("_id"))
+
+def is_fresh(row: Optional[Dict[str, Any]], seed: Dict[str, Any], model: Optional[IdfModel] = None,
+             content_hash: Optional[str] = None) -> bool:
+    """True if a stored row still matches the seed text and generator (and the current IDF model, if any)."""
+    if not row:
+        return False
+    if row.get("content_hash") != (content_hash or seed_content_hash(seed)):
+        return False
+    if row.get("generator_version") != generator_version():
+        return False
+    return model is None or row.get("idf_version") == model.version
+
+def compute_seed_feature_row(seed: Dict[str, Any], model: Optional[IdfModel] = None,
+                             content_hash: Optional[str] = None) -> Dict[str, Any]:
+    feats = build_seed_features(seed, model, content_hash)
+    text = SeedTextFeatures.from_seed(seed)
+    return {
+        "seed_id": seed_key(seed),
+        "content_hash": feats.content_hash,
+        "idf_version": feats.idf_version,
+        "generator_version": generator_version(),
+        "vector": vector_to_json(feats.vector) if feats.vector is not None else None,
+        "phrases": text.phrases,
+        "top_terms": text.top_terms,
+        "hashtags": sorted(feats.hashtags),
+    }
+
+def refresh_seed_features(db, model: Optional[IdfModel] = None, limit: Optional[int] = None,
+                          batch_size: int = 200, force: bool = False) -> Dict[str, int]:
+    """
+    Bring the store up to date for up to `limit` seeds. Returns counts of
+    seeds checked / refreshed / unchanged.
+    """
+    counts = {"checked": 0, "refreshed": 0, "unchanged": 0}
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        stored = {} if force else db.get_seed_features([seed_key(s) for s in batch])
+        rows = []
+        for seed in batch:
+            h = seed_content_hash(seed)
+            if is_fresh(stored.get(seed_key(seed)), seed, model, h):
+                counts["unchanged"] += 1
+            else:
+                rows.append(compute_seed_feature_row(seed, model, h))
+        if rows:
+            db.save_seed_features(rows)
+        counts["refreshed"] += len(rows)
+        batch.clear()
+
+    for seed in db.list_seeds(limit=limit):
+        counts["checked"] += 1
+        batch.append(seed)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return counts
@@ -0,0 +1,130 @@
+"""
+Three-stage fetch → score → write pipeline with bounded queues.
+
+  reader thread   pulls batches from an iterator (e.g. backend.list_unscored_previews)
+  caller thread   scores each batch (CPU; may itself fan out to a process pool)
+  writer thread   persists scored batches (e.g. backend.save_preview_scores)
+
+Bounded queues give backpressure in both directions: the reader stops
+prefetching once `queue_size` batches are waiting to be scored, and the scorer
+blocks once `queue_size` scored batches are waiting to be written. On normal
+exit, errors or KeyboardInterrupt the writer drains every batch already scored
+before run_pipelined returns.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+_DONE = object()
+
+
+class QueueStats:
+    """Depth samples (taken at every put) and blocked time for one queue."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.puts = 0
+        self.depth_sum = 0
+        self.max_depth = 0
+        self.put_wait_s = 0.0
+        self.get_wait_s = 0.0
+
+    def put(self, q: "queue.Queue", item: Any) -> None:
+        t0 = time.perf_counter()
+        q.put(item)
+        depth = q.qsize()
+        with self._lock:
+            self.put_wait_s += time.perf_counter() - t0
+            if item is not _DONE:
+                self.puts += 1
+                self.depth_sum += depth
+                self.max_depth = max(self.max_depth, depth)
+
+    def get(self, q: "queue.Queue") -> Any:
+        t0 = time.perf_counter()
+        item = q.get()
+        with self._lock:
+            self.get_wait_s += time.perf_counter() - t0
+        return item
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self.puts,
+                "avg_depth": round(self.depth_sum / self.puts, 2) if self.puts else 0.0,
+                "max_depth": self.max_depth,
+                "producer_blocked_s": round(self.put_wait_s, 3),
+                "consumer_waiting_s": round(self.get_wait_s, 3),
+            }
+
+
+def run_pipelined(
+    batches: Iterable[Any],
+    score: Callable[[Any], Any],
+    write: Callable[[Any], None],
+    queue_size: int = 4,
+    on_write_error: Optional[Callable[[Any, BaseException], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run score(batch) on the calling thread while batches are prefetched and
+    results written on background threads. Returns per-queue metrics
+    {"fetched": ..., "scored": ...}. Exceptions from the reader or scorer are
+    re-raised after pending writes are flushed; write errors go to
+    on_write_error (or are re-raised at the end if no handler is given).
+    """
+    fetched_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    scored_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    fetched_stats, scored_stats = QueueStats("fetched"), QueueStats("scored")
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    break
+                fetched_stats.put(fetched_q, batch)
+        except BaseException as e:  # surfaced in the caller thread
+            errors.append(e)
+        finally:
+            fetched_stats.put(fetched_q, _DONE)
+
+    def writer():
+        while True:
+            item = scored_stats.get(scored_q)
+            if item is _DONE:
+                return
+            try:
+                write(item)
+            except BaseException as e:
+                if on_write_error is None:
+                    errors.append(e)
+                else:
+                    on_write_error(item, e)
+
+    r = threading.Thread(target=reader, name="pipeline-reader", daemon=True)
+    w = threading.Thread(target=writer, name="pipeline-writer", daemon=True)
+    r.start()
+    w.start()
+    try:
+        while True:
+            batch = fetched_stats.get(fetched_q)
+            if batch is _DONE:
+                break
+            scored_stats.put(scored_q, score(batch))
+    finally:
+        stop.set()
+        # unblock the reader if it is waiting on a full queue, then flush writes
+        while r.is_alive():
+            try:
+                fetched_q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        scored_q.put(_DONE)
+        w.join()
+    if errors:
+        raise errors[0]
+    return {"fetched": fetched_stats.as_dict(), "scored": scored_stats.as_dict()}
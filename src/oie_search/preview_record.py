@@ -0,0 +1,105 @@
+"""
+Compact normalized previews.
+
+normalize_preview() returns a dict per preview with nested engagement / media
+dicts and the full platform payload under "raw" (for YouTube: search snippet,
+videos.list snippet, statistics and contentDetails). Holding many of them
+(e.g. the score_previews leaderboard) is dominated by that overhead, so
+PreviewRecord stores the same fields flat in __slots__ and rebuilds the nested
+dicts on access. It is a read-only Mapping: record["title"],
+record.get("engagement", {}).get("views") etc. work as with the dict.
+
+Raw retention (RAW_MODES; compact_preview defaults to "full", score_previews
+--raw-mode to PREVIEW_RAW_MODE, env default "ref"):
+  full  keep the raw payload
+  ref   keep only raw_ref, an id into wherever the raw is stored (for scored
+        previews: the preview row, which holds raw / raw_meta)
+  drop  keep neither
+"""
+
+from __future__ import annotations
+import os
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+RAW_MODES = ("full", "ref", "drop")
+PREVIEW_RAW_MODE = os.getenv("PREVIEW_RAW_MODE", "ref")
+if PREVIEW_RAW_MODE not in RAW_MODES:
+    raise ValueError(f"PREVIEW_RAW_MODE must be one of {RAW_MODES}, got {PREVIEW_RAW_MODE!r}")
+
+KEYS = ("platform", "url", "title", "snippet", "author", "date", "hashtags", "engagement", "media", "raw")
+
+
+class PreviewRecord(Mapping):
+    __slots__ = ("platform", "url", "title", "snippet", "author", "date", "hashtags",
+                 "views", "likes", "comments", "has_video", "duration_sec", "raw_payload", "raw_ref")
+
+    def __init__(self, platform, url=None, title=None, snippet=None, author=None, date=None, hashtags=(),
+                 views=None, likes=None, comments=None, has_video=None, duration_sec=None,
+                 raw_payload=None, raw_ref=None):
+        self.platform = sys.intern(platform) if isinstance(platform, str) else platform
+        self.url = url
+        self.title = title
+        self.snippet = snippet
+        self.author = author
+        self.date = date
+        self.hashtags = tuple(hashtags or ())
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+        self.has_video = has_video
+        self.duration_sec = duration_sec
+        self.raw_payload = raw_payload
+        self.raw_ref = raw_ref
+
+    @property
+    def engagement(self) -> Dict[str, Optional[int]]:
+        return {"views": self.views, "likes": self.likes, "comments": self.comments}
+
+    @property
+    def media(self) -> Dict[str, Any]:
+        return {"has_video": self.has_video, "duration_sec": self.duration_sec}
+
+    @property
+    def raw(self) -> Optional[Dict[str, Any]]:
+        """The raw payload (None unless kept with raw_mode="full"; see raw_ref)."""
+        return self.raw_payload
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        return list(value) if key == "hashtags" else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(KEYS)
+
+    def __len__(self) -> int:
+        return len(KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"PreviewRecord(platform={self.platform!r}, url={self.url!r}, title={self.title!r})"
+
+
+def compact_preview(preview: Dict[str, Any], raw_mode: str = "full", raw_ref: Any = None) -> PreviewRecord:
+    """PreviewRecord from a normalized preview dict. raw_mode="ref" needs raw_ref."""
+    if raw_mode not in RAW_MODES:
+        raise ValueError(f"raw_mode must be one of {RAW_MODES}, got {raw_mode!r}")
+    if raw_mode == "ref" and raw_ref is None:
+        raise ValueError("raw_mode='ref' needs a raw_ref")
+    if isinstance(preview, PreviewRecord):
+        preview = preview.to_dict()
+    engagement = preview.get("engagement") or {}
+    media = preview.get("media") or {}
+    return PreviewRecord(
+        preview.get("platform"), preview.get("url"), preview.get("title"), preview.get("snippet"),
+        preview.get("author"), preview.get("date"), preview.get("hashtags"),
+        engagement.get("views"), engagement.get("likes"), engagement.get("comments"),
+        media.get("has_video"), media.get("duration_sec"),
+        raw_payload=preview.get("raw") if raw_mode == "full" else None,
+        raw_ref=raw_ref if raw_mode == "ref" else None,
+    )
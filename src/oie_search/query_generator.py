@@ -1,38 +1,64 @@
 # query_generator.py
+import heapq
+import os
 import re
-from typing import Dict, List
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+# bump whenever generated queries would change for the same seed text;
+# stored query sets with an older version are regenerated (pipelines/query_refresh.py)
+GENERATOR_VERSION = "1"
+
+TEXT_FIELDS = ("title", "description", "transcript", "ocr", "body")
+STOPWORDS = frozenset(["the","and","a","an","to","in","on","of","for","with","is","this","that","it","by","be","are","as","at"])
+# characters of each seed field scanned for terms / phrases (hour-long ASR transcripts run to ~500k)
+MAX_FIELD_CHARS = int(os.getenv("QUERY_MAX_FIELD_CHARS", "50000"))
+_WS_RE = re.compile(r'\s+')
+_TERM_RE = re.compile(r"[A-Za-z0-9#@']{2,}")
+_SENTENCE_RE = re.compile(r'[\.!\?]\s+')
 
 def normalize_text(s: str) -> str:
     if not s: return ""
     s = s.strip()
-    s = re.sub(r'\s+', ' ', s) # one or more whitespace characters to single space
+    s = _WS_RE.sub(' ', s) # one or more whitespace characters to single space
     return s
 
+def _field(seed: Dict, fld: str, max_chars: int = MAX_FIELD_CHARS) -> str:
+    text = seed.get(fld) or ""
+    return text[:max_chars] if max_chars else text
+
 def top_k_terms(text: str, k=8):
-    # creates a list of terms from text,  sorted by frequency (descending)
-    # lightweight heuristic: split, remove very short tokens and common stopwords
-    stopwords = set(["the","and","a","an","to","in","on","of","for","with","is","this","that","it","by","be","are","as","at"])
-    tokens = [t.lower() for t in re.findall(r"[A-Za-z0-9#@']{2,}", text)]
-    freq = {}
-    for t in tokens:
-        if t in stopwords or t.isdigit(): continue
-        freq[t] = freq.get(t,0) + 1
-    sorted_terms = sorted(freq.items(), key=lambda x: -x[1])
-    return [t for t,_ in sorted_terms[:k]]
-
-def build_phrase_candidates(seed: Dict, num_sentences=3) -> List[str]:
+    # terms from text sorted by frequency (descending; ties in first-seen order)
+    # lightweight heuristic: drop very short tokens, digits and common stopwords
+    # tokens are counted as they stream out of the regex; only the top k are selected
+    freq = Counter(
+        t for t in (m.group().lower() for m in _TERM_RE.finditer(text))
+        if t not in STOPWORDS and not t.isdigit()
+    )
+    return [t for t, _ in heapq.nlargest(k, freq.items(), key=lambda x: x[1])]
+
+def _sentences(text: str) -> Iterator[str]:
+    # lazy equivalent of _SENTENCE_RE.split(text)
+    start = 0
+    for m in _SENTENCE_RE.finditer(text):
+        yield text[start:m.start()]
+        start = m.end()
+    yield text[start:]
+
+def build_phrase_candidates(seed: Dict, num_sentences=3, max_chars: int = MAX_FIELD_CHARS) -> List[str]:
     # choose representative phrases (title first, then long ngrams from transcript/description)
     phrases = []
     if seed.get("title"):
         phrases.append(seed["title"])
     # prefer long descriptive phrases from description/transcript / OCR
     for fld in ("description","transcript","ocr","body"):
-        text = seed.get(fld,"")
+        text = _field(seed, fld, max_chars)
         if not text: continue
-        # extract quoted-like phrases: heuristics
-        sentences = re.split(r'[\.!\?]\s+', text)
-        sentences = [s for s in sentences if len(s.split())>=4]
-        for s in sentences[:num_sentences]:
+        # extract quoted-like phrases: heuristics; stop splitting once enough sentences are found
+        sentences = (s for s in _sentences(text) if len(s.split())>=4)
+        for s in islice(sentences, num_sentences):
             phrases.append(s.strip())
     # dedupe, normalize
     seen = set()
@@ -44,23 +70,59 @@ def build_phrase_candidates(seed: Dict, num_sentences=3) -> List[str]:
         seen.add(np)
     return out[:6]
 
-def generate_queries_for_platform(seed: Dict, platform: str, config: Dict=None) -> Dict[str,str]:
+def combined_seed_text(seed: Dict, max_chars: int = MAX_FIELD_CHARS) -> str:
+    # normalized title/description/transcript/ocr/body (each capped at max_chars), joined for term extraction
+    return " ".join(normalize_text(_field(seed, f, max_chars)) for f in TEXT_FIELDS)
+
+
+@dataclass
+class SeedTextFeatures:
+    """Everything query rendering needs from one seed, extracted once for all platforms."""
+    title: str
+    combined_text: str
+    phrases: List[str]
+    top_terms: List[str]
+    hashtags: List[str]
+    author: str
+
+    @classmethod
+    def from_seed(cls, seed: Dict, features: Optional[Dict] = None) -> "SeedTextFeatures":
+        """
+        `features` may carry precomputed 'phrases' and 'top_terms' for this seed
+        (e.g. a fresh row from the seed_features store) to skip re-extracting them.
+        """
+        meta = seed.get("metadata") or {}
+        combined_text = combined_seed_text(seed)
+        if features and features.get("phrases") is not None and features.get("top_terms") is not None:
+            phrases = list(features["phrases"])
+            top_terms = list(features["top_terms"])
+        else:
+            phrases = build_phrase_candidates(seed)
+            top_terms = top_k_terms(combined_text, k=10)
+        return cls(
+            title=normalize_text(seed.get("title","")),
+            combined_text=combined_text,
+            phrases=phrases,
+            top_terms=top_terms,
+            hashtags=meta.get("hashtags",[]) or [],
+            author=meta.get("author",""),
+        )
+
+def generate_queries_for_platform(seed: Dict, platform: str, config: Dict=None, features: Dict=None) -> Dict[str,str]:
     """
     Returns dict with keys: 'precise','broad','hashtag_phrase'
+
+    `features` may carry precomputed 'phrases' and 'top_terms' for this seed
+    (e.g. a fresh row from the seed_features store) to skip re-extracting them.
+    For several platforms, build SeedTextFeatures once and call render_queries.
     """
+    return render_queries(SeedTextFeatures.from_seed(seed, features), platform, config)
+
+def render_queries(tf: SeedTextFeatures, platform: str, config: Dict=None) -> Dict[str,str]:
+    """Platform query variants ('precise','broad','hashtag_phrase') from precomputed seed text features."""
     config = config or {}
-    title = normalize_text(seed.get("title",""))
-    body = normalize_text(seed.get("body",""))
-    transcript = normalize_text(seed.get("transcript",""))
-    ocr = normalize_text(seed.get("ocr",""))
-    description = normalize_text(seed.get("description",""))
-    hashtags = seed.get("metadata",{}).get("hashtags",[]) or []
-    author = seed.get("metadata",{}).get("author","")
-    lang = seed.get("metadata",{}).get("language","")
-    phrases = build_phrase_candidates(seed)
-    # select top tokens
-    combined_text = " ".join([title, description, transcript, ocr, body])
-    top_terms = top_k_terms(combined_text, k=10)
+    title, combined_text, phrases, top_terms = tf.title, tf.combined_text, tf.phrases, tf.top_terms
+    hashtags, author = tf.hashtags, tf.author
 
     # platform-specific escaping / operator differences
     def q_escape(s):
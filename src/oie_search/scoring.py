@@ -1,9 +1,14 @@
-from typing import Dict, Any, List
-from sklearn.feature_extraction.text import TfidfVectorizer
-from numpy import dot
-from numpy.linalg import norm
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Union
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
 
 from .config import get_score_float, get_score_int
+from .digestors import PreviewBatch, engagement_count
+from .idf_model import IdfModel, load_default_idf_model, vector_from_json
+from .phrase_matcher import PhraseMatcher
+from .seed_cache import SeedFeatures, SeedFeatureCache
+from .utils.hashing import seed_content_hash
 
 W_OVER_TITLE   = get_score_float("WEIGHT_OVERLAP_TITLE", 0.30)
 W_OVER_DESC    = get_score_float("WEIGHT_OVERLAP_DESC", 0.20)
@@ -25,57 +30,290 @@ MAX_COMMENTS   = get_score_int("MAX_COMMENTS", 5_000)
 # return float(min(max(s, 0.0), 1.0))
 
 
-def _quick_text_cosine(a: str, b: str) -> float:
-    a = a or ""
-    b = b or ""
-    vect = TfidfVectorizer(max_features=500).fit([a, b])
-    A = vect.transform([a]).toarray()[0]
-    B = vect.transform([b]).toarray()[0]
-    denom = (norm(A) * norm(B))
-    return float(dot(A, B) / denom) if denom > 0 else 0.0
+# Weights of the six preview signals (see prompts.PREVIEW_ANALYZER_PROMPT).
+SIGNAL_WEIGHTS: Dict[str, float] = {
+    "semantic_similarity": 0.4,
+    "lexical_overlap": 0.2,
+    "hashtag_overlap": 0.1,
+    "media_match": 0.1,
+    "freshness": 0.1,
+    "engagement": 0.1,
+}
+KEEP_SCORE     = 65
+CONSIDER_SCORE = 50
 
-def score_preview(seed: Dict[str, Any], preview: Dict[str, Any]) -> Dict[str, Any]:
-    seed_text = " ".join(filter(None, [seed.get("title",""), seed.get("description",""), seed.get("transcript","")]))
-    preview_text = " ".join(filter(None, [preview.get("title",""), preview.get("snippet",""), preview.get("transcript_snippet","")]))
-    semantic = _quick_text_cosine(seed_text, preview_text)
+MEDIA_KEYWORDS = frozenset({"podcast","interview","tutorial","how-to","review","news","explainer"})
+
+
+def seed_text(seed: Dict[str, Any]) -> str:
+    return " ".join(filter(None, [seed.get("title",""), seed.get("description",""), seed.get("transcript","")]))
+
+def preview_text(preview: Dict[str, Any]) -> str:
+    return " ".join(filter(None, [preview.get("title",""), preview.get("snippet",""), preview.get("transcript_snippet","")]))
+
+def build_seed_features(
+    seed: Dict[str, Any],
+    model: Optional[IdfModel] = None,
+    content_hash: Optional[str] = None,
+    stored: Optional[Dict[str, Any]] = None,
+) -> SeedFeatures:
+    """
+    Compute everything score_many needs from a seed (vector only when a model is given).
+
+    `stored` is a row from the seed-features store (see pipelines.seed_features);
+    its vector is reused when its content hash and idf version still match.
+    """
+    text = seed_text(seed)
+    content_hash = content_hash or seed_content_hash(seed)
+    raw_phrases = [p.strip('"').lower() for p in seed.get("important_phrases", []) or []]
+    phrases = [p for p in raw_phrases if p]
+    matcher = PhraseMatcher(phrases + sorted(MEDIA_KEYWORDS))
+    vector = None
+    if model is not None:
+        if (stored and stored.get("vector") and stored.get("content_hash") == content_hash
+                and stored.get("idf_version") == model.version):
+            vector = vector_from_json(stored["vector"])
+        else:
+            vector = model.transform([text])
+    return SeedFeatures(
+        seed_id=seed.get("seed_id"),
+        content_hash=content_hash,
+        text=text,
+        phrases=phrases,
+        n_phrases=len(raw_phrases),
+        hashtags=frozenset((seed.get("metadata") or {}).get("hashtags", []) or []),
+        vector=vector,
+        idf_version=model.version if model is not None else None,
+        matcher=matcher,
+        phrase_ids=[matcher.pattern_id(p) for p in phrases],
+        media_ids=frozenset(matcher.pattern_id(k) for k in MEDIA_KEYWORDS),
+    )
+
+def get_seed_features(seed: Dict[str, Any], model: Optional[IdfModel] = None,
+                      cache: Optional[SeedFeatureCache] = None,
+                      stored: Optional[Dict[str, Any]] = None) -> SeedFeatures:
+    """build_seed_features, memoized in `cache` by (seed_id, content hash, idf version)."""
+    if cache is None:
+        return build_seed_features(seed, model, stored=stored)
+    content_hash = seed_content_hash(seed)
+    key = (seed.get("seed_id"), content_hash, model.version if model is not None else None)
+    return cache.get_or_build(key, lambda: build_seed_features(seed, model, content_hash, stored))
+
+# smoothed IDF of a term in one of two documents: ln((1 + 2) / (1 + 1)) + 1; terms in both get 1
+_PAIR_IDF_SINGLE = 1.0 + np.log(1.5)
+
+def _pairwise_tfidf_cosine(seed_text: str, preview_texts: Sequence[str]) -> np.ndarray:
+    """
+    Per-pair TF-IDF cosine without a corpus model: for each preview, the value
+    TfidfVectorizer().fit([seed, preview]) would give, so it depends only on
+    the seed and that preview (not on the rest of the batch). Computed for all
+    previews at once from one count matrix: with n=2 documents, shared terms
+    have IDF 1 and all others _PAIR_IDF_SINGLE.
+    """
+    try:
+        X = CountVectorizer().fit_transform([seed_text or ""] + [t or "" for t in preview_texts])
+    except ValueError:
+        # empty vocabulary (all texts blank or stopword-only)
+        return np.zeros(len(preview_texts))
+    X = X.tocsr().astype(float)
+    s = X[0].toarray().ravel()
+    P = X[1:]
+    P_sq = P.multiply(P)
+    in_seed = (s > 0).astype(float)
+    w2 = _PAIR_IDF_SINGLE ** 2
+    dot = P @ s                                                     # shared terms only (IDF 1)
+    shared_p = P_sq @ in_seed                                       # Σ p² over shared terms
+    p_norm2 = w2 * np.asarray(P_sq.sum(axis=1)).ravel() + (1 - w2) * shared_p
+    B = P.copy()
+    B.data[:] = 1.0
+    s_norm2 = w2 * float(s @ s) + (1 - w2) * (B @ (s * s))          # seed norm given each preview's shared terms
+    denom = np.sqrt(p_norm2 * s_norm2)
+    return np.divide(dot, denom, out=np.zeros(len(preview_texts)), where=denom > 0)
+
+def _batch_text_cosine(feats: SeedFeatures, preview_texts: Sequence[str], model: Optional[IdfModel] = None) -> np.ndarray:
+    """
+    TF-IDF cosine of one seed against many preview texts.
+
+    With a corpus IdfModel only the previews are transformed (the seed vector
+    comes from its features) and the cosine is one sparse matrix-vector
+    product. Without one, each pair gets its own two-document IDF
+    (_pairwise_tfidf_cosine). Either way a preview's value does not depend on
+    which other previews share its batch or chunk.
+    """
+    if not preview_texts:
+        return np.zeros(0)
+    if model is not None and feats.vector is not None:
+        P = model.transform(preview_texts)
+        return np.asarray((P @ feats.vector.T).todense()).ravel()
+    return _pairwise_tfidf_cosine(feats.text, preview_texts)
+
+def _engagement_value(preview: Dict[str, Any]) -> float:
+    if not isinstance(preview.get("engagement"), dict):
+        return 0.0
+    vals = []
+    for v in preview["engagement"].values():
+        try:
+            vals.append(float(v))
+        except Exception:
+            pass
+    return min(1.0, sum(vals) / 10000.0) if vals else 0.0
+
+def _batch_engagement(batch: PreviewBatch) -> np.ndarray:
+    # same as _engagement_value per row: sum of the known counts (any engagement key) / 10000, capped at 1
+    total = np.nansum(np.vstack([batch.views, batch.likes, batch.comments]), axis=0)
+    for i, extra in enumerate(batch.engagement_extra):
+        if extra:
+            total[i] += np.nansum([engagement_count(v) for v in extra.values()])
+    return np.minimum(1.0, total / 10000.0)
+
+class CascadeStats:
+    """
+    Thread-safe counters for cascade scoring: previews seen, previews pruned
+    by the cheap-signal bound (semantic step skipped), previews that went
+    through the semantic step, and of those how many still ended up below
+    CONSIDER_SCORE.
+    """
 
-    phrases: List[str] = [p.strip('"') for p in seed.get("important_phrases", [])]
-    lex_over = 0.0
-    if phrases:
-        lex_over = sum(1 for p in phrases if p and p.lower() in (preview_text.lower())) / len(phrases)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seen = 0
+        self.pruned_cheap = 0
+        self.semantic_scored = 0
+        self.pruned_semantic = 0
 
-    seed_tags = set(seed.get("metadata", {}).get("hashtags", []) or [])
-    preview_tags = set(preview.get("hashtags", []) or [])
-    hashtag_overlap = (len(seed_tags & preview_tags) / len(seed_tags)) if seed_tags else 0.0
+    def add(self, seen: int, pruned_cheap: int, semantic_scored: int, pruned_semantic: int) -> None:
+        with self._lock:
+            self.seen += seen
+            self.pruned_cheap += pruned_cheap
+            self.semantic_scored += semantic_scored
+            self.pruned_semantic += pruned_semantic
 
-    media_keywords = {"podcast","interview","tutorial","how-to","review","news","explainer"}
-    media_match = 1.0 if any(k in (preview_text.lower()) for k in media_keywords) else 0.0
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "seen": self.seen,
+                "pruned_cheap": self.pruned_cheap,
+                "semantic_scored": self.semantic_scored,
+                "pruned_semantic": self.pruned_semantic,
+            }
+
+# process-wide default, used when score_many(cascade=True) gets no stats object
+cascade_stats = CascadeStats()
+
+def score_many(
+    seed: Dict[str, Any],
+    previews: Union[Sequence[Dict[str, Any]], PreviewBatch],
+    model: Optional[IdfModel] = None,
+    cache: Optional[SeedFeatureCache] = None,
+    cascade: bool = False,
+    stats: Optional[CascadeStats] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score many normalized previews (dicts, or a columnar PreviewBatch from
+    digestors.normalize_many) against one seed.
+
+    All six signals are computed as arrays (one TF-IDF matrix for the batch,
+    one sparse product for the cosine) and combined with SIGNAL_WEIGHTS.
+    The IDF comes from `model`, else the configured default model
+    (load_default_idf_model), else a per-pair two-document IDF; the version
+    used is recorded as signals["idf_model"] ("pair" for the fallback).
+    Results never depend on batch composition.
+    Seed features are taken from `cache` when given (see seed_cache).
+
+    With cascade=True the five cheap signals are computed first; previews whose
+    score could not reach CONSIDER_SCORE even with perfect semantic similarity
+    skip the TF-IDF step (semantic_similarity=0, signals["semantic_skipped"]=True)
+    and are rejected; survivors score exactly as without the cascade. Counts go
+    to `stats` (default: module-level cascade_stats).
+    Returns one {decision, score, signals} dict per preview, in input order.
+    """
+    n = len(previews)
+    if n == 0:
+        return []
+    model = model or load_default_idf_model()
+    idf_version = model.version if model is not None else "pair"
+    feats = get_seed_features(seed, model, cache)
+    if isinstance(previews, PreviewBatch):
+        # columnar input (digestors.normalize_many): no per-preview dict lookups
+        preview_texts = [" ".join(filter(None, (t, sn, ts)))
+                         for t, sn, ts in zip(previews.title, previews.snippet, previews.transcript_snippet)]
+        tag_lists = previews.hashtags
+        has_date = np.fromiter((bool(d) for d in previews.date), dtype=bool, count=n)
+        engagement = _batch_engagement(previews)
+    else:
+        preview_texts = [preview_text(p) for p in previews]
+        tag_lists = [p.get("hashtags", []) for p in previews]
+        has_date = np.fromiter((bool(p.get("date")) for p in previews), dtype=bool, count=n)
+        engagement = np.fromiter((_engagement_value(p) for p in previews), dtype=float, count=n)
+    # one matcher pass per preview finds both phrase hits and media keywords
+    found = [feats.matcher.find(t.lower()) for t in preview_texts]
+
+    if feats.n_phrases:
+        lex_over = np.fromiter(
+            (sum(1 for pid in feats.phrase_ids if pid in f) for f in found), dtype=float, count=n
+        ) / feats.n_phrases
+    else:
+        lex_over = np.zeros(n)
+
+    seed_tags = feats.hashtags
+    if seed_tags:
+        hashtag_overlap = np.fromiter(
+            (len(seed_tags & set(tags or [])) for tags in tag_lists), dtype=float, count=n
+        ) / len(seed_tags)
+    else:
+        hashtag_overlap = np.zeros(n)
+
+    media_match = np.fromiter((not feats.media_ids.isdisjoint(f) for f in found), dtype=float, count=n)
 
     # Freshness placeholder (tweak per your project)
-    freshness = 1.0 if preview.get("date") else 0.5
-
-    engagement = 0.0
-    if isinstance(preview.get("engagement"), dict):
-        vals = []
-        for v in preview["engagement"].values():
-            try:
-                vals.append(float(v))
-            except Exception:
-                pass
-        if vals:
-            engagement = min(1.0, sum(vals) / 10000.0)
-
-    score = (semantic*0.4 + lex_over*0.2 + hashtag_overlap*0.1 + media_match*0.1 + freshness*0.1 + engagement*0.1)*100
-    decision = "keep" if score >= 65 else ("consider" if score >= 50 else "reject")
-    return {
-        "decision": decision,
-        "score": int(score),
-        "signals": {
-            "semantic_similarity": round(semantic, 3),
-            "lexical_overlap": round(lex_over, 3),
-            "hashtag_overlap": round(hashtag_overlap, 3),
-            "media_match": round(media_match, 3),
-            "freshness": round(freshness, 3),
-            "engagement": round(engagement, 3)
-        }
+    freshness = np.where(has_date, 1.0, 0.5)
+
+    if cascade:
+        # upper bound: cheap signals + perfect semantic similarity
+        bound = np.full(n, SIGNAL_WEIGHTS["semantic_similarity"])
+        for name, arr in (("lexical_overlap", lex_over), ("hashtag_overlap", hashtag_overlap),
+                          ("media_match", media_match), ("freshness", freshness), ("engagement", engagement)):
+            bound = bound + arr * SIGNAL_WEIGHTS[name]
+        skipped = bound * 100 < CONSIDER_SCORE - 1e-9
+        live = np.flatnonzero(~skipped)
+        semantic = np.zeros(n)
+        if live.size:
+            semantic[live] = _batch_text_cosine(feats, [preview_texts[i] for i in live], model)
+    else:
+        skipped = None
+        semantic = _batch_text_cosine(feats, preview_texts, model)
+
+    signals = {
+        "semantic_similarity": semantic,
+        "lexical_overlap": lex_over,
+        "hashtag_overlap": hashtag_overlap,
+        "media_match": media_match,
+        "freshness": freshness,
+        "engagement": engagement,
     }
+    score = np.zeros(n)
+    for name, w in SIGNAL_WEIGHTS.items():
+        score = score + signals[name] * w
+    score = score * 100
+    decision = np.where(score >= KEEP_SCORE, "keep", np.where(score >= CONSIDER_SCORE, "consider", "reject"))
+
+    rounded = {name: [round(v, 3) for v in arr.tolist()] for name, arr in signals.items()}
+    out = [
+        {
+            "decision": str(decision[i]),
+            "score": int(score[i]),
+            "signals": {**{name: rounded[name][i] for name in SIGNAL_WEIGHTS}, "idf_model": idf_version},
+        }
+        for i in range(n)
+    ]
+    if cascade:
+        for i, flag in enumerate(skipped.tolist()):
+            out[i]["signals"]["semantic_skipped"] = flag
+        n_pruned = int(skipped.sum())
+        n_below = int(((score < CONSIDER_SCORE) & ~skipped).sum())
+        (stats or cascade_stats).add(n, n_pruned, n - n_pruned, n_below)
+    return out
+
+def score_preview(seed: Dict[str, Any], preview: Dict[str, Any]) -> Dict[str, Any]:
+    """Score a single preview; thin wrapper around score_many."""
+    return score_many(seed, [preview])[0]
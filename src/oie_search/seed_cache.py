@@ -0,0 +1,121 @@
+"""
+In-process cache of per-seed scoring features.
+
+Scoring a batch needs the same few things from a seed for every preview: the
+joined seed text (and its TF-IDF vector when a corpus IDF model is loaded),
+lowercased important phrases (compiled with the media keywords into one
+PhraseMatcher), the hashtag set and the token set (computed lazily). Seeds with long transcripts are expensive to re-tokenize, so
+SeedFeatureCache keeps them in a bounded, size-aware LRU keyed by
+(seed_id, content hash, idf version).
+
+The cache is thread-safe; with a process pool each worker keeps its own.
+"""
+
+from __future__ import annotations
+import re
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional
+
+# same tokenization as sklearn's default token_pattern (lowercased)
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+@dataclass
+class SeedFeatures:
+    seed_id: Any
+    content_hash: str
+    text: str
+    phrases: List[str]            # lowercased, quotes stripped, empties dropped
+    n_phrases: int                # original phrase count (lexical overlap denominator)
+    hashtags: FrozenSet[str]
+    vector: Any = None            # 1×V csr row when built with an IdfModel
+    idf_version: Optional[str] = None
+    matcher: Any = None           # PhraseMatcher over phrases + media keywords
+    phrase_ids: List[int] = field(default_factory=list)     # matcher id per entry of `phrases`
+    media_ids: FrozenSet[int] = frozenset()                 # matcher ids of media keywords
+    nbytes: int = field(default=0, compare=False)
+    _tokens: Optional[FrozenSet[str]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        if self._tokens is None:
+            self._tokens = frozenset(TOKEN_RE.findall(self.text.lower()))
+        return self._tokens
+
+    def estimate_nbytes(self) -> int:
+        n = sys.getsizeof(self.text)
+        n += sum(sys.getsizeof(p) for p in self.phrases)
+        if self._tokens is not None:
+            n += sum(sys.getsizeof(t) for t in self._tokens) + sys.getsizeof(self._tokens)
+        n += sum(sys.getsizeof(h) for h in self.hashtags)
+        if self.matcher is not None:
+            n += sum(sys.getsizeof(p) for p in self.matcher.patterns) * (4 if self.matcher.use_automaton else 1)
+        if self.vector is not None:
+            n += self.vector.data.nbytes + self.vector.indices.nbytes + self.vector.indptr.nbytes
+        return n
+
+
+class SeedFeatureCache:
+    """
+    Bounded LRU of SeedFeatures. Evicts least-recently-used entries once either
+    max_entries or max_bytes (sum of SeedFeatures.nbytes) is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, SeedFeatures]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[SeedFeatures]:
+        with self._lock:
+            feats = self._data.get(key)
+            if feats is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return feats
+
+    def put(self, key: Hashable, feats: SeedFeatures) -> None:
+        if not feats.nbytes:
+            feats.nbytes = feats.estimate_nbytes()
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._data[key] = feats
+            self._bytes += feats.nbytes
+            # always keep the newest entry, even if it alone exceeds max_bytes
+            while len(self._data) > 1 and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def get_or_build(self, key: Hashable, build: Callable[[], SeedFeatures]) -> SeedFeatures:
+        feats = self.get(key)
+        if feats is None:
+            # build outside the lock; concurrent misses on one key may both build
+            feats = build()
+            self.put(key, feats)
+        return feats
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,14 @@
+import hashlib
+import json
+from typing import Any, Dict
+
+# Seed fields that feed query generation and scoring; a change to any of them
+# changes the content hash.
+SEED_CONTENT_FIELDS = ("title", "description", "transcript", "ocr", "body", "important_phrases")
+
+def seed_content_hash(seed: Dict[str, Any]) -> str:
+    """Stable sha1 over the text-bearing fields of a seed (plus metadata.hashtags)."""
+    payload = {k: seed.get(k) for k in SEED_CONTENT_FIELDS}
+    payload["hashtags"] = (seed.get("metadata") or {}).get("hashtags")
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
@@ -0,0 +1,48 @@
+from oie_search.apis import youtube
+from oie_search.apis.cache import ResponseCache, make_key
+
+
+def test_make_key_ignores_param_order_and_credentials():
+    a = make_key("u", {"q": "x", "order": "date", "key": "secret1"})
+    b = make_key("u", {"order": "date", "q": "x", "key": "secret2"})
+    assert a == b
+    assert a != make_key("u", {"q": "y", "order": "date"})
+
+
+def test_ttl_expiry_and_size_eviction(tmp_path):
+    now = [1000.0]
+    cache = ResponseCache(str(tmp_path / "c.sqlite"), max_bytes=200, clock=lambda: now[0])
+    cache.put("youtube.search", "k1", {"v": "a" * 50}, ttl=10)
+    assert cache.get("youtube.search", "k1", units=100) == {"v": "a" * 50}
+    now[0] += 11
+    assert cache.get("youtube.search", "k1") is None
+    for i in range(5):
+        now[0] += 1
+        cache.put("youtube.video", f"v{i}", {"v": "b" * 50}, ttl=1000)
+    assert cache.get("youtube.video", "v0") is None          # oldest evicted
+    assert cache.get("youtube.video", "v4") is not None
+    s = cache.stats()
+    assert s["youtube.search"]["hits"] == 1 and s["youtube.search"]["saved_units"] == 100
+
+
+def test_iter_videos_reuses_cached_pages_and_video_items(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_get(url, params):
+        calls.append(url)
+        if url == youtube.SEARCH_URL:
+            return {"items": [{"id": {"videoId": v}, "snippet": {"title": v}} for v in ("v1", "v2")]}
+        return {"items": [{"id": v, "statistics": {"viewCount": "1"}} for v in params["id"].split(",")]}
+
+    monkeypatch.setattr(youtube, "_get", fake_get)
+    monkeypatch.setattr(youtube, "YOUTUBE_API_KEY", "k")
+    monkeypatch.setenv("API_CACHE_PATH", str(tmp_path / "api.sqlite"))
+
+    first, second = youtube.QuotaStats(), youtube.QuotaStats()
+    out1 = list(youtube.iter_videos(["q"], max_results=2, stats=first))
+    out2 = list(youtube.iter_videos(["q"], max_results=2, stats=second))
+    assert out1 == out2
+    assert calls == [youtube.SEARCH_URL, youtube.VIDEOS_URL]
+    assert first.as_dict()["quota_units"] == 101 and second.as_dict()["quota_units"] == 0
+    stats = youtube.get_cache().stats()
+    assert stats["youtube.search"]["saved_units"] == 100 and stats["youtube.video"]["saved_units"] == 1
@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+
+from oie_search.db import PostgresBackend
+
+
+class FakeCursor:
+    def __init__(self, rows, log):
+        self.rows, self.log = rows, log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, q, params):
+        self.log.append(params)
+        *after, n = params
+        if "seed_id" in q.split("ORDER BY")[1]:
+            key = lambda r: (r["seed_id"], r["id"])
+        else:
+            key = lambda r: (r["id"],)
+        todo = sorted((r for r in self.rows if r["score"] is None), key=key)
+        self.result = [r for r in todo if not after or key(r) > tuple(after)][:n]
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows, self.log = rows, []
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self.rows, self.log)
+
+
+class FakePool:
+    def __init__(self, rows):
+        self.conn = FakeConn(rows)
+
+    @contextmanager
+    def connection(self, autocommit=True):
+        yield self.conn
+
+
+def _backend(rows):
+    db = PostgresBackend.__new__(PostgresBackend)
+    db.pool = FakePool(rows)
+    db.previews_table = "previews"
+    return db
+
+
+def test_list_unscored_previews_pages_by_id_and_resumes():
+    rows = [{"id": i, "score": 1.0 if i % 4 == 0 else None} for i in range(1, 12)]
+    db = _backend(rows)
+    batches = list(db.list_unscored_previews(batch_size=3, limit=None))
+    assert [[r["id"] for r in b] for b in batches] == [[1, 2, 3], [5, 6, 7], [9, 10, 11]]
+    # one LIMIT query per batch, each starting after the previous batch's last id
+    assert db.pool.conn.log == [(3,), (3, 3), (7, 3), (11, 3)]
+
+    resumed = list(_backend(rows).list_unscored_previews(batch_size=3, limit=4, after_id=6))
+    assert [[r["id"] for r in b] for b in resumed] == [[7, 9, 10], [11]]
+
+
+def test_list_unscored_previews_seed_order_clusters_by_seed():
+    rows = [{"id": i, "seed_id": i % 3, "score": None} for i in range(1, 10)]
+    db = _backend(rows)
+    batches = list(db.list_unscored_previews(batch_size=4, limit=None, order="seed"))
+    assert [[(r["seed_id"], r["id"]) for r in b] for b in batches] == [
+        [(0, 3), (0, 6), (0, 9), (1, 1)],
+        [(1, 4), (1, 7), (2, 2), (2, 5)],
+        [(2, 8)],
+    ]
+    assert db.pool.conn.log[1] == (1, 1, 4)
+
+
+def test_backend_built_through_init_can_query(monkeypatch):
+    import oie_search.db as db_module
+    pool = FakePool([{"id": 1, "score": None}])
+    released = []
+    monkeypatch.setattr(db_module, "get_pg_pool", lambda dsn, acquire=False: pool)
+    monkeypatch.setattr(db_module, "release_pg_pool", released.append)
+    with PostgresBackend() as db:
+        assert db.previews_table == "previews" and db.queries_table == "search_queries"
+        assert [[r["id"] for r in b] for b in db.list_unscored_previews(batch_size=5, limit=None)] == [[1]]
+    assert released == [pool] and db.pool is None
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+from psycopg2.pool import PoolError
+
+from oie_search.db import pool as db_pool
+
+
+class FakeConn:
+    autocommit = True
+    closed = 0
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeThreadedPool:
+    def getconn(self):
+        return FakeConn()
+
+    def putconn(self, conn, close=False):
+        pass
+
+    def closeall(self):
+        pass
+
+
+def _pool(maxconn, timeout=5.0):
+    p = db_pool.PgPool("dbname=unused", minconn=0, maxconn=maxconn, timeout=timeout)
+    p._pool = FakeThreadedPool()
+    return p
+
+
+def test_pg_pool_blocks_when_saturated_and_records_metrics():
+    p = _pool(maxconn=1)
+    got = []
+
+    def worker():
+        with p.connection():
+            got.append(time.perf_counter())
+
+    with p.connection():
+        t = threading.Thread(target=worker)
+        t.start()
+        time.sleep(0.05)
+        assert not got  # waiting for the only connection
+    t.join()
+    stats = p.stats.as_dict()
+    assert stats["acquires"] == 2 and stats["saturated"] == 1
+    assert stats["peak_in_use"] == 1 and stats["in_use"] == 0
+    assert stats["max_wait_ms"] >= 40
+
+
+def test_pg_pool_times_out_instead_of_raising_immediately():
+    p = _pool(maxconn=1, timeout=0.05)
+    with p.connection():
+        with pytest.raises(PoolError):
+            with p.connection():
+                pass
+    assert p.stats.as_dict()["in_use"] == 0
+
+
+def test_mongo_client_is_shared_and_reference_counted():
+    a = db_pool.get_mongo_client("mongodb://localhost:1", acquire=True)
+    b = db_pool.get_mongo_client("mongodb://localhost:1", acquire=True)
+    assert a is b
+    db_pool.release_mongo_client(a)
+    assert db_pool.get_mongo_client("mongodb://localhost:1") is a
+    db_pool.release_mongo_client(b)
+    assert db_pool.get_mongo_client("mongodb://localhost:1") is not a
+    db_pool.close_all()
@@ -0,0 +1,52 @@
+from oie_search.pipelines.dedup import DedupIndex, DedupStats, canonical_url, hamming, seed_key, simhash, split_batch
+
+
+def test_canonical_url_variants():
+    yt = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    assert canonical_url("https://youtu.be/dQw4w9WgXcQ?si=abc") == yt
+    assert canonical_url("https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=42&feature=share") == yt
+    assert canonical_url("https://www.youtube.com/shorts/dQw4w9WgXcQ/") == yt
+    post = "https://www.reddit.com/comments/1abcde"
+    assert canonical_url("https://www.reddit.com/r/science/comments/1abcde/some_title/") == post
+    assert canonical_url("https://redd.it/1abcde") == post
+    assert canonical_url("https://Example.com/a/?utm_source=x&b=2&a=1#top") == "https://example.com/a?a=1&b=2"
+
+
+def test_simhash_is_close_for_near_duplicates():
+    a = simhash("How neurons fire: a visual explainer of action potentials in the brain")
+    b = simhash("How neurons fire - a visual explainer of action potentials in the brain!")
+    c = simhash("Ten easy weeknight pasta recipes for busy families on a budget")
+    assert hamming(a, b) == 0
+    assert hamming(a, c) > 10
+    assert simhash("too short") is None
+
+
+def test_split_batch_inherits_from_persistent_index(tmp_path):
+    path = str(tmp_path / "dedup.sqlite")
+    title = "How neurons fire: a visual explainer of action potentials in the brain"
+    batch = [
+        {"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "title": title, "snippet": ""},
+        {"url": "https://youtu.be/dQw4w9WgXcQ", "title": "repost", "snippet": ""},
+        {"url": "https://www.reddit.com/r/x/comments/abc/neurons/", "title": title + "!", "snippet": ""},
+        {"url": "https://example.com/pasta", "title": "Ten easy weeknight pasta recipes for busy families", "snippet": ""},
+    ]
+    index, stats = DedupIndex(path), DedupStats()
+    fresh, inherited, followers, to_index = split_batch(index, ["1"] * 4, batch, stats)
+    assert fresh == [0, 3] and followers == {1: 0, 2: 0} and not inherited
+    index.add_many([(*to_index[p], p, {"score": 70.0, "decision": "keep", "signals": {"lex": 0.5}}) for p in fresh])
+    index.close()
+
+    # a later run (new index handle) and another seed
+    index = DedupIndex(path)
+    fresh, inherited, followers, _ = split_batch(index, ["1", "2"], [batch[2], batch[0]], stats)
+    assert fresh == [1] and inherited[0]["preview_id"] == "0" and inherited[0]["signals"] == {"lex": 0.5}
+    assert stats.as_dict() == {"checked": 6, "url_dupes": 1, "near_dupes": 2, "dedup_rate": 0.5}
+
+
+def test_seed_key_changes_with_seed_content_and_idf_version():
+    seed = {"seed_id": 1, "title": "ADHD late diagnosis"}
+    key = seed_key(1, seed, "v1")
+    assert key == seed_key(1, dict(seed), "v1") and key.startswith("1:")
+    assert seed_key(1, {**seed, "title": "ADHD in adults"}, "v1") != key
+    assert seed_key(1, seed, "v2") != key != seed_key(1, seed, None)
+    assert seed_key(None, seed, "v1") is None
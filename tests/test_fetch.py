@@ -0,0 +1,89 @@
+import threading
+import time
+
+from oie_search.pipelines.fetch import TokenBucket, query_strings, run_fetch
+
+
+def test_token_bucket_limits_rate_after_burst():
+    now = [0.0]
+
+    def sleep(d):
+        now[0] += d
+
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        assert bucket.acquire() == 0
+    bucket.acquire()
+    bucket.acquire()
+    assert abs(now[0] - 1.0) < 1e-9  # 2 extra tokens at 2/s
+
+
+class FakeDb:
+    def __init__(self, rows):
+        self.rows = rows
+        self.status = {}
+        self.previews = []
+        self.lock = threading.Lock()
+
+    def list_pending_queries(self, platforms=None, limit=None, retry_errors=False):
+        return [r for r in self.rows if r["platform"] in platforms][:limit]
+
+    def mark_query_status(self, qid, status, error=None):
+        self.status[qid] = (status, error)
+
+    def save_previews(self, rows):
+        with self.lock:
+            self.previews.extend(rows)
+        return {"inserted": len(rows), "skipped": 0}
+
+
+def test_run_fetch_records_status_and_caps_concurrency(monkeypatch):
+    monkeypatch.setenv("FETCH_YOUTUBE_RATE", "1000")
+    monkeypatch.setenv("FETCH_YOUTUBE_CONCURRENCY", "2")
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_youtube(queries, max_results, acquire):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        if "boom" in queries:
+            raise RuntimeError("api down")
+        acquire()
+        return [{"id": f"{q}-v", "videoId": f"{q}-v", "title": q, "snippet": {}, "statistics": {}} for q in queries]
+
+    rows = [{"query_id": i, "seed_id": 1, "platform": "youtube", "precise": f"q{i}", "broad": f"q{i}", "hashtag_phrase": ""}
+            for i in range(6)]
+    rows.append({"query_id": 99, "seed_id": 1, "platform": "youtube", "precise": "boom"})
+    db = FakeDb(rows)
+    counts = run_fetch(db, platforms=["youtube"], fetchers={"youtube": fake_youtube})
+
+    assert counts["done"] == 6 and counts["error"] == 1 and counts["inserted"] == 6
+    assert db.status[99] == ("error", "api down")
+    assert all(db.status[i] == ("done", None) for i in range(6))
+    assert peak[0] <= 2
+    assert db.previews[0]["url"].startswith("https://www.youtube.com/watch?v=")
+    assert query_strings(rows[0]) == ["q0"]
+    assert query_strings({"query_text": "adhd trial", "precise": None}) == ["adhd trial"]
+
+
+def test_failed_status_write_does_not_abort_the_run():
+    class FlakyDb(FakeDb):
+        def mark_query_status(self, qid, status, error=None):
+            if status == "error":
+                raise ConnectionError("db gone")
+            super().mark_query_status(qid, status, error)
+
+    def fake_youtube(queries, max_results, acquire):
+        if "boom" in queries:
+            raise RuntimeError("api down")
+        return []
+
+    rows = [{"query_id": 1, "platform": "youtube", "precise": "boom"}, {"_id": 2, "platform": "youtube", "precise": "ok"}]
+    db = FlakyDb(rows)
+    counts = run_fetch(db, platforms=["youtube"], fetchers={"youtube": fake_youtube})
+    assert counts["error"] == 1 and counts["done"] == 1
+    assert db.status == {2: ("done", None)}
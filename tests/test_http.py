@@ -0,0 +1,57 @@
+import pytest
+import requests
+
+from oie_search.apis import http
+from oie_search.apis.youtube import _is_rate_limited
+
+
+def _response(status, json_body=None, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r._content = (b"{}" if json_body is None else __import__("json").dumps(json_body).encode())
+    r.headers.update(headers or {})
+    r.url = "https://example.test"
+    return r
+
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append(timeout)
+        out = self.outcomes.pop(0)
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+
+def test_request_retries_transient_errors_with_backoff():
+    sleeps = []
+    session = FakeSession([requests.ConnectionError(), _response(503), _response(429, headers={"Retry-After": "2"}),
+                           _response(200, {"ok": True})])
+    r = http.request(session, "GET", "https://example.test", retries=4, timeout=(1, 2), sleep=sleeps.append)
+    assert r.json() == {"ok": True}
+    assert session.calls == [(1, 2)] * 4
+    assert len(sleeps) == 3 and sleeps[2] >= 2
+
+
+def test_request_raises_after_retries_and_on_client_errors():
+    session = FakeSession([_response(500), _response(500)])
+    with pytest.raises(requests.HTTPError):
+        http.request(session, "GET", "https://example.test", retries=1, sleep=lambda s: None)
+    session = FakeSession([_response(404)])
+    with pytest.raises(requests.HTTPError):
+        http.request(session, "GET", "https://example.test", sleep=lambda s: None)
+    assert session.outcomes == []
+
+
+def test_youtube_rate_limit_403_is_retryable_but_daily_quota_is_not():
+    limited = _response(403, {"error": {"errors": [{"reason": "userRateLimitExceeded"}]}})
+    quota = _response(403, {"error": {"errors": [{"reason": "quotaExceeded"}]}})
+    assert _is_rate_limited(limited)
+    assert not _is_rate_limited(quota)
+    session = FakeSession([limited, _response(200, {"items": []})])
+    r = http.request(session, "GET", "https://example.test", is_retryable=_is_rate_limited, sleep=lambda s: None)
+    assert r.json() == {"items": []}
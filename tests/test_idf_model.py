@@ -0,0 +1,28 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from oie_search.idf_model import IdfModel
+from oie_search.scoring import score_many
+
+DOCS = [
+    "ketamine therapy for depression",
+    "adhd diagnosis in adults",
+    "ketamine and adhd research news",
+    "gardening tips for spring",
+]
+
+def test_transform_matches_tfidf_vectorizer(tmp_path):
+    model = IdfModel.fit(DOCS, max_features=None, min_df=1)
+    model.save(str(tmp_path))
+    loaded = IdfModel.load(str(tmp_path))
+    assert loaded.version == model.version
+
+    expected = TfidfVectorizer().fit_transform(DOCS).toarray()
+    got = loaded.transform(DOCS).toarray()
+    assert np.allclose(got, expected, atol=1e-6)
+
+def test_score_many_records_model_version():
+    model = IdfModel.fit(DOCS, max_features=None, min_df=1)
+    out = score_many({"title": "ketamine therapy"}, [{"title": "ketamine news"}], model=model)
+    assert out[0]["signals"]["idf_model"] == model.version
+    assert out[0]["signals"]["semantic_similarity"] > 0
@@ -0,0 +1,55 @@
+import pytest
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from oie_search.db import mongo_bulk_write
+
+
+class FakeResult:
+    def __init__(self, details):
+        self.bulk_api_result = details
+
+
+class FakeCollection:
+    """Unique on "k"; updates match existing keys."""
+
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+        self.calls = []
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls.append((len(ops), ordered))
+        details = {"nInserted": 0, "nMatched": 0, "nUpserted": 0, "writeErrors": []}
+        for i, op in enumerate(ops):
+            if isinstance(op, InsertOne):
+                k = op._doc["k"]
+                if k in self.keys:
+                    details["writeErrors"].append({"index": i, "code": 11000})
+                else:
+                    self.keys.add(k)
+                    details["nInserted"] += 1
+            else:
+                details["nMatched"] += op._filter["k"] in self.keys
+        if details["writeErrors"]:
+            raise BulkWriteError(details)
+        return FakeResult(details)
+
+
+def test_mongo_bulk_write_chunks_and_counts_duplicates_as_skipped():
+    coll = FakeCollection(keys={1, 2})
+    ops = [InsertOne({"k": k}) for k in range(5)]
+    counts = mongo_bulk_write(coll, ops, chunk_size=2)
+    assert counts == {"inserted": 3, "updated": 0, "skipped": 2}
+    assert coll.calls == [(2, False), (2, False), (1, False)]
+
+    ops = [UpdateOne({"k": k}, {"$set": {"score": 1}}) for k in (0, 4, 99)]
+    assert mongo_bulk_write(coll, ops) == {"inserted": 0, "updated": 2, "skipped": 1}
+
+
+def test_mongo_bulk_write_raises_on_other_errors():
+    class Failing:
+        def bulk_write(self, ops, ordered=True):
+            raise BulkWriteError({"nInserted": 0, "writeErrors": [{"index": 0, "code": 121}]})
+
+    with pytest.raises(BulkWriteError):
+        mongo_bulk_write(Failing(), [InsertOne({"k": 1})])
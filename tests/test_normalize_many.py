@@ -0,0 +1,58 @@
+import math
+
+from oie_search.digestors import normalize_many, normalize_preview
+from oie_search.scoring import score_many
+
+YT = [
+    {"id": "a1", "durationSec": 90,
+     "snippet": {"title": "Neurons #Neuro", "description": "how they fire #neuro #brain", "channelTitle": "Lab",
+                 "publishedAt": "2025-10-01T12:00:00Z"},
+     "statistics": {"viewCount": "5000", "likeCount": "12"}},
+    {"id": "a2", "snippet": {"title": "no date", "description": ""}, "statistics": {}},
+]
+REDDIT = [{"data": {"title": "Synapses?", "selftext": "", "permalink": "/r/x/comments/1/", "author": "u",
+                    "created_utc": 1759320000, "num_comments": 4, "score": 10}}]
+
+
+def test_normalize_many_matches_per_record_path():
+    batch = normalize_many("youtube", YT)
+    assert batch.to_dicts() == [normalize_preview("youtube", r) for r in YT]
+    assert batch.hashtags[0] == ["neuro", "brain"]
+    assert batch.date_epoch[0] == 1759320000.0 and math.isnan(batch.date_epoch[1])
+    assert batch.views.tolist()[0] == 5000 and math.isnan(batch.likes[1])
+
+    mixed = normalize_many(["youtube", "reddit", "youtube"], [YT[0], REDDIT[0], normalize_preview("youtube", YT[1])])
+    assert mixed.platform == ["youtube", "reddit", "youtube"]
+    assert mixed.row(1) == normalize_preview("reddit", REDDIT[0])
+    assert mixed.date[1] == "2025-10-01T12:00:00Z"
+
+
+def test_score_many_accepts_a_batch():
+    seed = {"seed_id": 1, "title": "neurons fire", "description": "synapses", "important_phrases": ["neurons"],
+            "metadata": {"hashtags": ["neuro"]}}
+    raws = YT + YT
+    assert score_many(seed, normalize_many("youtube", raws)) == score_many(seed, [normalize_preview("youtube", r) for r in raws])
+
+
+def test_normalized_passthrough_skips_non_numeric_counts():
+    pv = {"platform": "youtube", "url": "u", "title": "t", "engagement": {"views": "1.2K", "likes": "30", "comments": None}}
+    batch = normalize_many("youtube", [pv, {**pv, "engagement": "n/a"}])
+    assert math.isnan(batch.views[0]) and batch.likes[0] == 30.0 and math.isnan(batch.comments[0])
+    assert math.isnan(batch.views[1])
+    assert [r["signals"] for r in score_many({"title": "t"}, batch)][0] == score_many({"title": "t"}, [pv])[0]["signals"]
+
+
+def test_batch_scores_match_dicts_with_transcripts_and_extra_engagement():
+    seed = {"title": "neurons fire", "important_phrases": ["action potential"], "metadata": {"hashtags": ["neuro"]}}
+    previews = [
+        {"platform": "youtube", "url": "u1", "title": "Neurons", "snippet": "how they fire",
+         "transcript_snippet": "the action potential travels", "hashtags": ["neuro"],
+         "engagement": {"views": 4000, "likes": 10, "comments": None, "shares": 3000, "saves": "12"}},
+        {"platform": "reddit", "url": "u2", "title": "Synapses", "snippet": "",
+         "engagement": {"views": None, "likes": "7", "comments": 2}},
+        normalize_preview("youtube", YT[0]),
+    ]
+    batch = normalize_many([p["platform"] for p in previews], previews)
+    assert batch.to_dicts()[0]["engagement"]["shares"] == 3000
+    assert batch.to_dicts()[0]["transcript_snippet"] == "the action potential travels"
+    assert score_many(seed, batch) == score_many(seed, previews)
@@ -0,0 +1,51 @@
+"""
+Applies db/schema_postgres.sql to a scratch database and runs the generated-query
+upsert against it. Needs POSTGRES_TEST_DSN; everything runs in one transaction
+that is rolled back, so the database is left as it was.
+"""
+import os
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+from oie_search.db import upsert_generated_queries
+
+DSN = os.getenv("POSTGRES_TEST_DSN")
+SCHEMA = Path(__file__).resolve().parents[1] / "src" / "oie_search" / "db" / "schema_postgres.sql"
+
+pytestmark = pytest.mark.skipif(not DSN, reason="POSTGRES_TEST_DSN not set")
+
+
+@pytest.fixture
+def cur():
+    conn = psycopg2.connect(DSN)
+    try:
+        with conn.cursor() as cur:
+            yield cur
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _row(seed_id, platform, precise, h, version="1-abc"):
+    return {"seed_id": seed_id, "platform": platform, "precise": precise, "broad": precise + " broad",
+            "hashtag_phrase": "", "content_hash": h, "generator_version": version}
+
+
+def test_schema_applies_twice_and_upsert_replaces_generated_sets(cur):
+    cur.execute(SCHEMA.read_text())
+    cur.execute(SCHEMA.read_text())  # idempotent on existing tables
+    cur.execute("INSERT INTO public.seeds_table (title) VALUES ('adhd') RETURNING seed_id;")
+    seed_id = cur.fetchone()[0]
+    # a hand-written query for the same (seed, platform) is left alone
+    cur.execute("INSERT INTO public.search_queries (seed_id, platform, query_text) VALUES (%s, 'youtube', 'adhd');",
+                (seed_id,))
+
+    upsert_generated_queries(cur, "public.search_queries", [_row(seed_id, "youtube", "adhd late", "h1")])
+    cur.execute("UPDATE public.search_queries SET fetch_status='done' WHERE query_text IS NULL;")
+    upsert_generated_queries(cur, "public.search_queries", [_row(seed_id, "youtube", "adhd coping", "h2")])
+
+    cur.execute("SELECT precise, content_hash, fetch_status, query_text FROM public.search_queries "
+                "WHERE seed_id=%s ORDER BY query_id;", (seed_id,))
+    assert cur.fetchall() == [(None, None, None, "adhd"), ("adhd coping", "h2", None, None)]
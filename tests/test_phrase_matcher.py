@@ -0,0 +1,20 @@
+import random
+
+from oie_search.phrase_matcher import PhraseMatcher
+
+def test_automaton_and_scan_agree_on_overlapping_patterns():
+    patterns = ["he", "she", "his", "hers", "ushers", "", "she"]
+    text = "ushers and his shell"
+    scan = PhraseMatcher(patterns, ac_min_patterns=10**6)
+    ac = PhraseMatcher(patterns, ac_min_patterns=0)
+    assert ac.use_automaton and not scan.use_automaton
+    expected = {scan.pattern_id(p) for p in ("he", "she", "his", "hers", "ushers")}
+    assert scan.find(text) == ac.find(text) == expected
+
+def test_automaton_matches_substring_semantics():
+    rng = random.Random(0)
+    for _ in range(500):
+        patterns = ["".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(0, 8))]
+        text = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 30)))
+        m = PhraseMatcher(patterns, ac_min_patterns=0)
+        assert m.find(text) == {m.pattern_id(p) for p in patterns if p in text}
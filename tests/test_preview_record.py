@@ -0,0 +1,49 @@
+import pickle
+
+import pytest
+
+from oie_search.digestors import normalize_preview
+from oie_search.preview_record import PreviewRecord, compact_preview
+
+RAW = {
+    "id": "abc123", "durationSec": 61,
+    "snippet": {"title": "Neurons #neuro", "description": "How neurons fire", "channelTitle": "Lab",
+                "publishedAt": "2025-10-01T12:00:00Z"},
+    "statistics": {"viewCount": "5000", "likeCount": "12"},
+}
+
+
+def test_record_exposes_the_normalized_dict_keys():
+    pv = normalize_preview("youtube", RAW)
+    rec = compact_preview(pv, "full")
+    assert rec.to_dict() == pv
+    assert rec["engagement"] == {"views": 5000, "likes": 12, "comments": None}
+    assert rec.get("media", {}).get("duration_sec") == 61
+    assert rec.get("missing") is None and not hasattr(rec, "__dict__")
+    assert pickle.loads(pickle.dumps(rec)) == rec
+
+
+def test_raw_modes():
+    pv = normalize_preview("youtube", RAW)
+    ref = compact_preview(pv, "ref", raw_ref=42)
+    assert ref.raw is None and ref.raw_ref == 42 and ref["title"] == pv["title"]
+    drop = compact_preview(pv, "drop")
+    assert drop["raw"] is None and drop.raw_ref is None
+    with pytest.raises(ValueError):
+        compact_preview(pv, "ref")
+    with pytest.raises(ValueError):
+        compact_preview(pv, "zip")
+    assert isinstance(compact_preview(drop, "drop"), PreviewRecord)
+
+
+def test_defaults_and_env_validation(monkeypatch):
+    import importlib
+
+    from oie_search import preview_record
+    pv = normalize_preview("youtube", RAW)
+    assert compact_preview(pv).raw == pv["raw"]
+    monkeypatch.setenv("PREVIEW_RAW_MODE", "zip")
+    with pytest.raises(ValueError):
+        importlib.reload(preview_record)
+    monkeypatch.delenv("PREVIEW_RAW_MODE")
+    importlib.reload(preview_record)
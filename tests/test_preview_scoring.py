@@ -0,0 +1,42 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from oie_search.pipelines.preview_scoring import init_worker, normalize_records, score_batch
+from oie_search.scoring import score_many
+from oie_search.seed_cache import SeedFeatureCache
+
+SEEDS = {
+    1: {"seed_id": 1, "title": "ADHD late diagnosis", "important_phrases": ["late diagnosis"]},
+    2: {"seed_id": 2, "title": "DREADDs circuit modulation", "metadata": {"hashtags": ["neuro"]}},
+}
+BATCH = [
+    {"id": 1, "seed_id": 2, "platform": "youtube", "url": "u1", "title": "DREADDs explainer", "hashtags": ["neuro"]},
+    {"id": 2, "seed_id": 1, "platform": "reddit", "url": "u2", "title": "my late diagnosis story", "snippet": "adhd"},
+    {"id": 3, "seed_id": 2, "platform": "youtube", "url": "u3", "title": "cooking pasta"},
+    {"id": 4, "seed_id": 1, "platform": "reddit", "url": "u4", "title": "ADHD podcast interview"},
+]
+
+def test_score_batch_keeps_order_in_process_and_on_pool():
+    keys = [r["seed_id"] for r in BATCH]
+    chunked = score_batch(BATCH, keys, SEEDS, chunk_size=1)
+    assert [pv["url"] for _, pv in chunked] == ["u1", "u2", "u3", "u4"]
+
+    local = score_batch(BATCH, keys, SEEDS, cache=SeedFeatureCache())
+    expected = score_many(SEEDS[1], [BATCH[1], BATCH[3]])
+    assert [local[1][0], local[3][0]] == expected
+
+    with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(1 << 20,)) as ex:
+        pooled = score_batch(BATCH, keys, SEEDS, executor=ex, keep_previews=False)
+    assert [r for r, _ in pooled] == [r for r, _ in score_batch(BATCH, keys, SEEDS)]
+    assert all(pv is None for _, pv in pooled)
+
+def test_chunking_and_workers_do_not_change_scores():
+    keys = [r["seed_id"] for r in BATCH]
+    whole = [r for r, _ in score_batch(BATCH, keys, SEEDS, chunk_size=500)]
+    assert [r for r, _ in score_batch(BATCH, keys, SEEDS, chunk_size=1)] == whole
+    with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(1 << 20,)) as ex:
+        assert [r for r, _ in score_batch(BATCH, keys, SEEDS, executor=ex, chunk_size=1)] == whole
+
+def test_prenormalized_previews_score_like_records():
+    keys = [r["seed_id"] for r in BATCH]
+    normalized = normalize_records(BATCH).to_dicts()
+    assert score_batch(BATCH, keys, SEEDS, normalized=normalized) == score_batch(BATCH, keys, SEEDS)
@@ -16,3 +16,19 @@ def test_build_phrase_candidates_basic():
     assert len(phrases) <= 6
     # all lowercase/alnum/space
     assert all(re.match(r"^[a-z0-9\s\-\+]+$", p) for p in phrases)
+
+
+def test_top_k_terms_orders_by_count_then_first_seen():
+    from oie_search.query_generator import top_k_terms
+    text = "beta alpha the beta gamma alpha delta 2024 beta"
+    assert top_k_terms(text, k=3) == ["beta", "alpha", "gamma"]
+
+
+def test_long_fields_are_capped_and_split_lazily():
+    from oie_search.query_generator import build_phrase_candidates, combined_seed_text
+    sentence = "neurons fire along the axon quickly. "
+    seed = {"title": "T", "transcript": sentence * 100000 + "rare tail words appear only here"}
+    phrases = build_phrase_candidates(seed, max_chars=1000)
+    assert phrases == ["T", "neurons fire along the axon quickly"]
+    assert "rare" not in combined_seed_text(seed, max_chars=1000)
+    assert len(combined_seed_text(seed, max_chars=1000)) < 1100
@@ -0,0 +1,55 @@
+from oie_search.config import QueryGenConfig
+from oie_search.pipelines.query_refresh import build_query_rows, generator_version, is_current
+
+SEED = {"title": "Self-diagnosis of ADHD", "description": "Clinician perspectives on adult ADHD diagnosis."}
+
+
+def test_build_query_rows_stamps_hash_and_version():
+    rows = build_query_rows(SEED, 7, "h1", "v1", platforms=["youtube", "reddit"])
+    assert [r["platform"] for r in rows] == ["youtube", "reddit"]
+    assert all(r["seed_id"] == 7 and r["content_hash"] == "h1" and r["generator_version"] == "v1" for r in rows)
+    assert is_current(rows, "h1", "v1", platforms=["youtube", "reddit"])
+    assert not is_current(rows, "h2", "v1", platforms=["youtube", "reddit"])
+    assert not is_current(rows, "h1", "v2", platforms=["youtube", "reddit"])
+    assert not is_current(rows[:1], "h1", "v1", platforms=["youtube", "reddit"])
+
+
+def test_generator_version_tracks_config():
+    assert generator_version() == generator_version(QueryGenConfig())
+    assert generator_version() != generator_version(QueryGenConfig(include_author=False))
+    assert generator_version() != generator_version(max_field_chars=1000)
+
+
+class FakeBackend:
+    def __init__(self, seeds):
+        self.seeds = seeds
+        self.queries = {}
+        self.writes = 0
+
+    def list_seeds(self, limit=None):
+        return iter(self.seeds[:limit])
+
+    def get_query_state(self, ids):
+        state = {}
+        for (sid, _), row in self.queries.items():
+            if sid in ids:
+                state.setdefault(sid, []).append(row)
+        return state
+
+    def save_generated_queries(self, rows):
+        for r in rows:
+            self.queries[(r["seed_id"], r["platform"])] = r
+            self.writes += 1
+
+
+def test_refresh_generated_queries_is_incremental():
+    from oie_search.pipelines.generate_queries import refresh_generated_queries
+    db = FakeBackend([{**SEED, "seed_id": 1}, {"seed_id": 2, "title": "DREADDs circuit modulation"}])
+    platforms = ["youtube", "reddit"]
+    assert refresh_generated_queries(db, platforms)["regenerated"] == 2
+    assert refresh_generated_queries(db, platforms) == {"checked": 2, "regenerated": 0, "unchanged": 2, "queries": 0}
+    db.seeds[1]["title"] = "Chemogenetics in mice"
+    assert refresh_generated_queries(db, platforms, batch_size=1)["regenerated"] == 1
+    assert len(db.queries) == 4 and db.writes == 6
+    assert db.queries[(2, "youtube")]["content_hash"] and db.queries[(2, "youtube")]["generator_version"] == generator_version()
+    assert refresh_generated_queries(db, platforms, force=True, dry_run=True)["queries"] == 4 and db.writes == 6
@@ -0,0 +1,76 @@
+import threading
+
+from oie_search.apis.reddit import RateLimitState, TokenCache
+
+
+def test_token_cache_reuses_token_until_refresh_margin():
+    now = [0.0]
+    fetched = []
+
+    def fetch():
+        fetched.append(now[0])
+        return f"tok{len(fetched)}", 3600
+
+    cache = TokenCache(fetch, margin=60, clock=lambda: now[0])
+    threads = [threading.Thread(target=cache.get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.get() == "tok1" and cache.fetches == 1
+    now[0] = 3539
+    assert cache.get() == "tok1"
+    now[0] = 3540
+    assert cache.get() == "tok2"
+    cache.invalidate("tok2")
+    assert cache.get() == "tok3"
+
+
+def test_rate_limit_state_reads_headers():
+    state = RateLimitState()
+    assert state.as_dict()["remaining"] is None
+    state.update({"X-Ratelimit-Remaining": "97.0", "X-Ratelimit-Used": "3", "X-Ratelimit-Reset": "120"})
+    info = state.as_dict()
+    assert info["remaining"] == 97.0 and info["used"] == 3
+    assert 119 <= info["reset_in"] <= 120
+
+
+def _fake_search(pages):
+    calls = []
+
+    def search(query, sort, limit, after=None):
+        calls.append((limit, after))
+        return pages[after]
+
+    return calls, search
+
+
+def test_iter_posts_follows_after_cursor(monkeypatch):
+    from oie_search.apis import reddit
+
+    page = lambda prefix, n: [{"data": {"id": f"{prefix}{i}", "score": i}} for i in range(n)]
+    calls, search = _fake_search({None: (page("a", 100), "t3_a"), "t3_a": (page("b", 100), "t3_b"),
+                                  "t3_b": (page("c", 100), None)})
+    monkeypatch.setattr(reddit, "_public_search", search)
+    tokens = []
+    out = list(reddit.iter_posts("adhd", max_results=150, acquire=lambda: tokens.append(1)))
+    assert len(out) == 150 and out[-1]["data"]["id"] == "b49"
+    assert calls == [(150, None), (50, "t3_a")]
+    assert len(tokens) == 2
+
+    calls, search = _fake_search({None: (page("a", 2), "t3_a"), "t3_a": ([], "t3_b")})
+    monkeypatch.setattr(reddit, "_public_search", search)
+    assert len(list(reddit.iter_posts("adhd", max_results=500))) == 2
+
+
+def test_iter_posts_stops_on_predicate(monkeypatch):
+    from oie_search.apis import reddit
+
+    pages = {None: ([{"data": {"keep": True}}], "p1")}
+    for i in range(1, 10):
+        pages[f"p{i}"] = ([{"data": {"keep": False}}], f"p{i + 1}")
+    calls, search = _fake_search(pages)
+    monkeypatch.setattr(reddit, "_public_search", search)
+    stop = reddit.pages_without(lambda ch: ch["data"]["keep"], 2)
+    assert len(list(reddit.iter_posts("adhd", max_results=1000, stop=stop))) == 3
+    assert len(calls) == 3
@@ -0,0 +1,73 @@
+from oie_search.scoring import score_many, score_preview
+
+SEED = {
+    "title": "ketamine therapy overview",
+    "description": "mechanisms and safety",
+    "important_phrases": ["ketamine therapy"],
+    "metadata": {"hashtags": ["ketamine"]},
+}
+
+def test_score_many_matches_score_preview():
+    previews = [
+        {"title": "gardening tips", "snippet": "soil and water", "platform": "youtube"},
+        {"title": "ketamine therapy safety", "snippet": "mechanisms dosing interview",
+         "hashtags": ["ketamine"], "date": "2025-01-01T00:00:00Z", "platform": "youtube"},
+    ]
+    batch = score_many(SEED, previews)
+    assert len(batch) == 2
+    assert batch[1]["score"] > batch[0]["score"]
+    assert set(batch[0]["signals"]) == set(score_preview(SEED, previews[0])["signals"])
+
+def test_score_many_handles_empty_inputs():
+    assert score_many(SEED, []) == []
+    out = score_many({}, [{"title": "", "snippet": ""}])
+    assert out[0]["signals"]["semantic_similarity"] == 0.0
+    assert out[0]["decision"] == "reject"
+
+def test_score_without_model_is_independent_of_batch():
+    target = {"title": "ketamine therapy safety", "snippet": "mechanisms dosing interview", "platform": "youtube"}
+    others = [
+        {"title": "ketamine ketamine news", "snippet": "therapy clinic opening"},
+        {"title": "gardening tips", "snippet": "soil and water"},
+    ]
+    alone = score_many(SEED, [target])[0]
+    mixed = score_many(SEED, others + [target])[-1]
+    assert alone["signals"]["idf_model"] == "pair"
+    assert alone["signals"]["semantic_similarity"] > 0
+    assert mixed["signals"]["semantic_similarity"] == alone["signals"]["semantic_similarity"]
+    assert mixed["score"] == alone["score"]
+
+def test_cascade_prunes_only_hopeless_previews():
+    from oie_search.idf_model import IdfModel
+    from oie_search.scoring import CascadeStats
+    previews = [
+        {"title": "gardening tips", "snippet": "soil and water"},
+        {"title": "ketamine therapy safety interview", "hashtags": ["ketamine"],
+         "date": "2025-01-01T00:00:00Z", "engagement": {"views": 20000}},
+    ]
+    # a fixed IDF model keeps semantic values independent of which previews are vectorized
+    model = IdfModel.fit([SEED["title"], SEED["description"]] + [p["title"] for p in previews], min_df=1)
+    stats = CascadeStats()
+    full = score_many(SEED, previews, model=model)
+    fast = score_many(SEED, previews, model=model, cascade=True, stats=stats)
+    assert [r["decision"] for r in fast] == [r["decision"] for r in full]
+    assert fast[0]["signals"]["semantic_skipped"] is True
+    assert fast[1]["signals"]["semantic_skipped"] is False
+    assert fast[1]["score"] == full[1]["score"]
+    assert stats.as_dict() == {"seen": 2, "pruned_cheap": 1, "semantic_scored": 1, "pruned_semantic": 0}
+
+def test_cascade_without_model_keeps_survivor_scores():
+    previews = [
+        {"title": "gardening tips", "snippet": "soil and water"},
+        {"title": "ketamine therapy safety interview", "hashtags": ["ketamine"],
+         "date": "2025-01-01T00:00:00Z", "engagement": {"views": 20000}},
+        {"title": "ketamine clinic opening", "snippet": "therapy mechanisms",
+         "date": "2025-02-01T00:00:00Z", "engagement": {"views": 5000}},
+    ]
+    full = score_many(SEED, previews)
+    fast = score_many(SEED, previews, cascade=True)
+    survivors = [i for i, r in enumerate(fast) if not r["signals"]["semantic_skipped"]]
+    assert 0 not in survivors and survivors
+    for i in survivors:
+        assert fast[i]["signals"]["semantic_similarity"] == full[i]["signals"]["semantic_similarity"]
+        assert fast[i]["score"] == full[i]["score"]
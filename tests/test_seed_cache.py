@@ -0,0 +1,33 @@
+from oie_search.scoring import get_seed_features, score_many
+from oie_search.seed_cache import SeedFeatureCache
+
+SEED = {"seed_id": 1, "title": "ADHD masking", "description": "late diagnosis in adults",
+        "important_phrases": ['"late diagnosis"'], "metadata": {"hashtags": ["adhd"]}}
+
+def test_cache_hits_and_content_hash_invalidation():
+    cache = SeedFeatureCache()
+    f1 = get_seed_features(SEED, cache=cache)
+    f2 = get_seed_features(dict(SEED), cache=cache)
+    assert f1 is f2
+    assert f1.phrases == ["late diagnosis"] and "masking" in f1.tokens
+
+    changed = dict(SEED, description="something else entirely")
+    assert get_seed_features(changed, cache=cache) is not f1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+def test_cache_evicts_lru_by_entries_and_bytes():
+    cache = SeedFeatureCache(max_entries=2)
+    for i in range(3):
+        get_seed_features(dict(SEED, seed_id=i), cache=cache)
+    assert len(cache) == 2 and cache.evictions == 1
+
+    tiny = SeedFeatureCache(max_bytes=1)
+    for i in range(3):
+        get_seed_features(dict(SEED, seed_id=i), cache=tiny)
+    assert len(tiny) == 1 and tiny.evictions == 2
+
+def test_score_many_same_with_and_without_cache():
+    previews = [{"title": "late diagnosis of ADHD", "hashtags": ["adhd"]}, {"title": "cooking"}]
+    cache = SeedFeatureCache()
+    assert score_many(SEED, previews, cache=cache) == score_many(SEED, previews)
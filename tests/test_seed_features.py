@@ -0,0 +1,75 @@
+from oie_search.idf_model import IdfModel
+from oie_search.pipelines.seed_features import compute_seed_feature_row, refresh_seed_features
+from oie_search.query_generator import generate_queries_for_platform
+from oie_search.scoring import build_seed_features
+
+SEEDS = [
+    {"seed_id": 1, "title": "DREADDs circuit modulation", "description": "Designer receptors for targeted circuit control in mice."},
+    {"seed_id": 2, "title": "ADHD coping strategies", "description": "Planner and automation hacks for executive function support."},
+]
+
+class FakeBackend:
+    def __init__(self, seeds):
+        self.seeds = seeds
+        self.store = {}
+        self.saved = 0
+
+    def list_seeds(self, limit=None):
+        return iter(self.seeds[:limit])
+
+    def get_seed_features(self, ids):
+        return {i: self.store[i] for i in ids if i in self.store}
+
+    def save_seed_features(self, rows):
+        for r in rows:
+            self.store[r["seed_id"]] = r
+            self.saved += 1
+
+def test_refresh_is_incremental():
+    db = FakeBackend([dict(s) for s in SEEDS])
+    assert refresh_seed_features(db)["refreshed"] == 2
+    assert refresh_seed_features(db) == {"checked": 2, "refreshed": 0, "unchanged": 2}
+    db.seeds[1]["description"] = "Changed text about sensory regulation routines."
+    assert refresh_seed_features(db)["refreshed"] == 1
+
+def test_stored_row_is_reused_for_scoring_and_queries():
+    model = IdfModel.fit([s["title"] + " " + s["description"] for s in SEEDS], max_features=None, min_df=1)
+    row = compute_seed_feature_row(SEEDS[0], model)
+    feats = build_seed_features(SEEDS[0], model, stored=row)
+    assert (feats.vector != model.transform([feats.text])).nnz == 0
+
+    assert generate_queries_for_platform(SEEDS[0], "youtube", features=row) == generate_queries_for_platform(SEEDS[0], "youtube")
+
+def test_rows_from_another_generator_version_are_refreshed():
+    db = FakeBackend([dict(s) for s in SEEDS])
+    refresh_seed_features(db)
+    db.store[1]["generator_version"] = "0-old"
+    assert refresh_seed_features(db) == {"checked": 2, "refreshed": 1, "unchanged": 1}
+
+def test_postgres_runner_rows_pass_is_fresh():
+    from oie_search.db.postgres_runner import _stored_features
+    from oie_search.pipelines.seed_features import is_fresh
+
+    row = compute_seed_feature_row(SEEDS[0])
+    cols = ("seed_id", "content_hash", "generator_version", "phrases", "top_terms")
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, q, params):
+            # the runner selects exactly these columns, in this order
+            assert q.split("FROM")[0].split("SELECT")[1].replace(" ", "").split(",") == list(cols)
+
+        def fetchall(self):
+            return [tuple(row[c] for c in cols)]
+
+    class Conn:
+        def cursor(self):
+            return Cursor()
+
+    stored = _stored_features(Conn(), [1])
+    assert is_fresh(stored[1], SEEDS[0])
@@ -0,0 +1,30 @@
+from oie_search import query_generator
+from oie_search.pipelines.generate_queries import generate_queries_for_seed
+from oie_search.query_generator import SeedTextFeatures, generate_queries_for_platform, render_queries
+
+SEED = {
+    "seed_id": 3,
+    "title": "Neurons  fire",
+    "description": "How neurons fire and why. Action potentials travel along the axon quickly.",
+    "transcript": "neurons neurons synapse axon " * 50,
+    "metadata": {"hashtags": ["neuro", "brain"], "author": "lab"},
+}
+PLATFORMS = ["youtube", "reddit", "bluesky", "spotify", "x"]
+
+
+def test_render_matches_per_platform_generation():
+    tf = SeedTextFeatures.from_seed(SEED)
+    assert tf.title == "Neurons fire" and tf.top_terms[0] == "neurons"
+    for p in PLATFORMS:
+        assert render_queries(tf, p) == generate_queries_for_platform(SEED, p)
+
+
+def test_generate_queries_for_seed_tokenizes_once(monkeypatch):
+    calls = []
+    real = query_generator.top_k_terms
+    monkeypatch.setattr(query_generator, "top_k_terms", lambda text, k=8: calls.append(k) or real(text, k))
+    rows = generate_queries_for_seed(SEED, platforms=PLATFORMS)
+    assert calls == [10]
+    assert [r["platform"] for r in rows] == PLATFORMS
+    assert all(r["seed_id"] == 3 and r["content_hash"] and r["generator_version"] for r in rows)
+    assert rows[1]["broad"] == generate_queries_for_platform(SEED, "reddit")["broad"]
@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from oie_search.pipelines.staged import run_pipelined
+
+
+def test_run_pipelined_preserves_order_and_flushes_writes():
+    written = []
+
+    def write(rows):
+        time.sleep(0.01)  # slow writer -> backpressure on the scored queue
+        written.append(rows)
+
+    metrics = run_pipelined(iter(range(20)), lambda b: b * 10, write, queue_size=2)
+    assert written == [b * 10 for b in range(20)]
+    assert metrics["fetched"]["batches"] == 20
+    assert metrics["scored"]["max_depth"] <= 2
+
+
+def test_run_pipelined_flushes_scored_batches_before_reraising():
+    written = []
+    lock = threading.Lock()
+
+    def score(b):
+        if b == 5:
+            raise RuntimeError("boom")
+        return b
+
+    def write(b):
+        with lock:
+            written.append(b)
+
+    with pytest.raises(RuntimeError):
+        run_pipelined(iter(range(100)), score, write, queue_size=3)
+    assert written == [0, 1, 2, 3, 4]
+
+
+def test_run_pipelined_reports_write_errors():
+    failed = []
+
+    def write(b):
+        if b == 1:
+            raise IOError("db down")
+
+    run_pipelined(iter(range(3)), lambda b: b, write,
+                  on_write_error=lambda b, e: failed.append(b))
+    assert failed == [1]
@@ -0,0 +1,56 @@
+from oie_search.apis import youtube
+
+
+def _fake_api(pages):
+    calls = []
+
+    def fake_get(url, params):
+        calls.append((url, dict(params)))
+        if url == youtube.SEARCH_URL:
+            return pages[(params["q"], params.get("pageToken"))]
+        ids = params["id"].split(",")
+        return {"items": [{"id": v, "statistics": {"viewCount": "1"}, "contentDetails": {"duration": "PT1M"}}
+                          for v in ids]}
+
+    return calls, fake_get
+
+
+def _page(ids, token=None):
+    page = {"items": [{"id": {"videoId": v}, "snippet": {"title": v}} for v in ids]}
+    if token:
+        page["nextPageToken"] = token
+    return page
+
+
+def test_iter_videos_pages_dedupes_and_coalesces_enrichment(monkeypatch):
+    a = [f"a{i}" for i in range(50)]
+    b = [f"b{i}" for i in range(30)]
+    pages = {
+        ("precise", None): _page(a, token="p2"),
+        ("precise", "p2"): _page(b),
+        ("broad", None): _page(a[:10] + ["c0", "c1"]),
+    }
+    calls, fake_get = _fake_api(pages)
+    monkeypatch.setattr(youtube, "_get", fake_get)
+    monkeypatch.setattr(youtube, "YOUTUBE_API_KEY", "k")
+
+    stats = youtube.QuotaStats()
+    tokens = []
+    out = list(youtube.iter_videos(["precise", "broad"], max_results=100, stats=stats,
+                                   acquire=lambda: tokens.append(1)))
+    assert [r["id"] for r in out] == a + b + ["c0", "c1"]
+    assert out[-1]["query"] == "broad" and out[-1]["durationSec"] == 60
+    videos_calls = [p for u, p in calls if u == youtube.VIDEOS_URL]
+    assert [len(p["id"].split(",")) for p in videos_calls] == [50, 32]
+    assert stats.as_dict() == {"calls": {"search": 3, "videos": 2}, "quota_units": 302, "duplicate_ids": 10}
+    assert len(tokens) == len(calls) == 5  # one token per page request, not per query
+
+
+def test_search_videos_respects_max_results(monkeypatch):
+    pages = {("q", None): _page([f"v{i}" for i in range(5)], token="next")}
+    calls, fake_get = _fake_api(pages)
+    monkeypatch.setattr(youtube, "_get", fake_get)
+    monkeypatch.setattr(youtube, "YOUTUBE_API_KEY", "k")
+    out = youtube.search_videos("q", max_results=3)
+    assert [r["id"] for r in out] == ["v0", "v1", "v2"] and "query" not in out[0]
+    assert calls[0][1]["maxResults"] == 3